@@ -1,6 +1,11 @@
+import datetime as dt
+
 import streamlit as st
-import pandas as pd
-import plotly.express as px
+
+from bf_data import load_overview, load_pyramid, load_sketches, quantiles
+from bf_data.charts import figure
+from bf_data.pyramid import days
+from bf_data.sections import render_sections
 
 # =========================
 # PAGE CONFIG
@@ -71,76 +76,76 @@ st.markdown(
 # =========================
 # LOAD DATA
 # =========================
-DATA_PATH = "/Users/deekshithsathrasalagangadharaiah/BF-Open-Data/Datasets/Berlin_Missions_2020_2025.csv"
-
-df = pd.read_csv(
-    DATA_PATH,
-    parse_dates=["mission_created_date"],
-    low_memory=False
-)
-
-df = df.drop(columns=["Unnamed: 0"], errors="ignore")
-df["year"] = df["mission_created_date"].dt.year
-
-# =========================
-# TRANSLATE MISSION TYPES
-# =========================
-mission_map = {
-    "Rettungsdienst": "Emergency Medical Service",
-    "Notfallrettung": "Emergency Rescue",
-    "Brand": "Fire Incident",
-    "Technische Hilfeleistung": "Technical Rescue",
-    "Krankentransport": "Patient Transport"
-}
-
-df["mission_type_en"] = df["mission_type"].map(mission_map).fillna("Other")
+# Only the time range of the slider is needed up front. The KPIs, the trend
+# and the mix are computed side by side on the section pool and fill their
+# placeholders as they finish (see RENDER SECTIONS below).
+first, last = days(load_pyramid())
 
 # =========================
 # KPI METRICS (CUSTOM CARDS)
 # =========================
 st.markdown("### 📊 Key Operational Metrics")
 
-k1, k2, k3, k4 = st.columns(4)
-
-with k1:
-    st.markdown(
-        f"""
-        <div class="metric-card">
-            <div class="metric-title">🚑 Total Incidents</div>
-            <div class="metric-value">{len(df):,}</div>
-        </div>
-        """, unsafe_allow_html=True
-    )
-
-with k2:
-    st.markdown(
-        f"""
-        <div class="metric-card">
-            <div class="metric-title">📍 Districts Covered</div>
-            <div class="metric-value">{df['mission_location_district'].nunique()}</div>
-        </div>
-        """, unsafe_allow_html=True
-    )
-
-with k3:
-    st.markdown(
-        f"""
-        <div class="metric-card">
-            <div class="metric-title">📅 Years Covered</div>
-            <div class="metric-value">{df['year'].min()} – {df['year'].max()}</div>
-        </div>
-        """, unsafe_allow_html=True
-    )
-
-with k4:
-    st.markdown(
-        f"""
-        <div class="metric-card">
-            <div class="metric-title">⏱ Avg Response Time (sec)</div>
-            <div class="metric-value">{round(df['response_time'].mean(), 1)}</div>
-        </div>
-        """, unsafe_allow_html=True
-    )
+kpi_slot = st.empty()
+
+
+def load_kpis():
+    # One streaming pass over the store (or raw CSV), cached until new data
+    # arrives, so the page never needs the mission rows in memory.
+    tail = quantiles(load_sketches())
+    return load_overview(), tail.iloc[0] if len(tail) else None
+
+
+def show_kpis(result):
+    kpi, tail = result
+    with kpi_slot.container():
+        k1, k2, k3, k4 = st.columns(4)
+
+        with k1:
+            st.markdown(
+                f"""
+                <div class="metric-card">
+                    <div class="metric-title">🚑 Total Incidents</div>
+                    <div class="metric-value">{kpi['count']:,}</div>
+                </div>
+                """, unsafe_allow_html=True
+            )
+
+        with k2:
+            st.markdown(
+                f"""
+                <div class="metric-card">
+                    <div class="metric-title">📍 Districts Covered</div>
+                    <div class="metric-value">{kpi['districts']}</div>
+                </div>
+                """, unsafe_allow_html=True
+            )
+
+        with k3:
+            st.markdown(
+                f"""
+                <div class="metric-card">
+                    <div class="metric-title">📅 Years Covered</div>
+                    <div class="metric-value">{kpi['year_min']} – {kpi['year_max']}</div>
+                </div>
+                """, unsafe_allow_html=True
+            )
+
+        with k4:
+            mean = "–" if kpi["rt_mean"] is None else round(kpi["rt_mean"], 1)
+            percentiles = "No valid response times" if tail is None else (
+                f"P50 {tail['p50']:.0f} · P90 {tail['p90']:.0f} · P95 {tail['p95']:.0f}"
+            )
+            st.markdown(
+                f"""
+                <div class="metric-card">
+                    <div class="metric-title">⏱ Avg Response Time (sec)</div>
+                    <div class="metric-value">{mean}</div>
+                    <div class="metric-title">{percentiles}</div>
+                </div>
+                """, unsafe_allow_html=True
+            )
+
 
 # =========================
 # INCIDENT TREND
@@ -148,24 +153,13 @@ with k4:
 st.markdown('<div class="section-card">', unsafe_allow_html=True)
 st.subheader("📈 Emergency Incident Trend Over Time")
 
-yearly = df.groupby("year").size().reset_index(name="incident_count")
-
-fig1 = px.line(
-    yearly,
-    x="year",
-    y="incident_count",
-    markers=True,
-    color_discrete_sequence=["#00E5FF"]
-)
-
-fig1.update_layout(
-    template="plotly_dark",
-    height=420,
-    xaxis_title="Year",
-    yaxis_title="Number of Incidents"
-)
+window = st.slider("🕒 Time Window", first, last, (first, last), format="YYYY-MM-DD")
+zoom = {} if window == (first, last) else {
+    "start": window[0].isoformat(),
+    "end": (window[1] + dt.timedelta(days=1)).isoformat()
+}
 
-st.plotly_chart(fig1, use_container_width=True)
+trend_slot = st.empty()
 
 st.markdown(
     """
@@ -182,26 +176,7 @@ st.markdown('</div>', unsafe_allow_html=True)
 st.markdown('<div class="section-card">', unsafe_allow_html=True)
 st.subheader("🚒 Distribution of Emergency Incident Types")
 
-mission_mix = df["mission_type_en"].value_counts().reset_index()
-mission_mix.columns = ["Mission Type", "Incident Count"]
-
-fig2 = px.pie(
-    mission_mix,
-    names="Mission Type",
-    values="Incident Count",
-    hole=0.65,
-    color_discrete_sequence=[
-        "#00E5FF", "#1E90FF", "#2ECC71", "#F39C12", "#9B59B6"
-    ]
-)
-
-fig2.update_traces(textinfo="percent+label")
-fig2.update_layout(
-    template="plotly_dark",
-    height=460
-)
-
-st.plotly_chart(fig2, use_container_width=True)
+mix_slot = st.empty()
 
 st.markdown(
     """
@@ -212,6 +187,21 @@ st.markdown(
 )
 st.markdown('</div>', unsafe_allow_html=True)
 
+# =========================
+# RENDER SECTIONS
+# =========================
+render_sections({
+    "kpis": (load_kpis, show_kpis),
+    "trend": (
+        lambda: figure("overview_trend", **zoom),
+        lambda fig: trend_slot.plotly_chart(fig, use_container_width=True)
+    ),
+    "mix": (
+        lambda: figure("overview_mix"),
+        lambda fig: mix_slot.plotly_chart(fig, use_container_width=True)
+    ),
+})
+
 # =========================
 # REGIONAL CONTEXT
 # =========================
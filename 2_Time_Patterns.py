@@ -1,6 +1,10 @@
+import datetime as dt
+
 import streamlit as st
-import pandas as pd
-import plotly.express as px
+
+from bf_data import load_pyramid
+from bf_data.charts import figure
+from bf_data.pyramid import days, districts
 
 # =========================
 # PAGE CONFIG
@@ -73,12 +77,7 @@ st.markdown("---")
 # =========================
 # LOAD DATA
 # =========================
-df = pd.read_csv(
-    "/Users/deekshithsathrasalagangadharaiah/BF-Open-Data/Datasets/Berlin_Missions_2020_2025.csv",
-    parse_dates=["mission_created_date"]
-)
-
-df["Year"] = df["mission_created_date"].dt.year
+pyramid = load_pyramid()
 
 # =========================
 # DISTRICT CONTROL
@@ -87,50 +86,38 @@ st.markdown("### 📡 District Selector")
 
 district = st.selectbox(
     "",
-    sorted(df["mission_location_district"].dropna().unique())
+    districts(pyramid)
 )
 
-df_d = df[df["mission_location_district"] == district]
+# =========================
+# TIME WINDOW
+# =========================
+# The chart switches from yearly to monthly, weekly, daily and hourly bins
+# as the window narrows.
+first, last = days(pyramid)
+window = st.slider("🕒 Time Window", first, last, (first, last), format="YYYY-MM-DD")
+zoom = {} if window == (first, last) else {
+    "start": window[0].isoformat(),
+    "end": (window[1] + dt.timedelta(days=1)).isoformat()
+}
 
 # =========================
 # TREND DATA
 # =========================
-yearly = (
-    df_d.groupby("Year")
-    .size()
-    .reset_index(name="Incident Load")
-)
+fig = figure("time_patterns", district=district, **zoom)
+st.plotly_chart(fig, use_container_width=True)
 
 # =========================
-# FUTURISTIC AREA CHART
+# LOAD PROJECTION
 # =========================
-fig = px.area(
-    yearly,
-    x="Year",
-    y="Incident Load",
-    markers=True,
-    color_discrete_sequence=["#00E5FF"]
-)
+fig_forecast = figure("load_projection", district=district)
+st.plotly_chart(fig_forecast, use_container_width=True)
 
-fig.update_layout(
-    template="plotly_dark",
-    height=480,
-    title=f"Emergency Load Projection – {district}",
-    title_x=0.5,
-    xaxis_title="Time Axis",
-    yaxis_title="Incident Density",
-    plot_bgcolor="rgba(0,0,0,0)",
-    paper_bgcolor="rgba(0,0,0,0)",
-    font=dict(color="#d6e4ff")
+st.caption(
+    "Seasonal (Holt-Winters) forecast of the monthly incident load with 80 % and 95 % "
+    "prediction intervals, refitted for all districts whenever new missions arrive."
 )
 
-fig.update_traces(
-    line=dict(width=3),
-    marker=dict(size=7)
-)
-
-st.plotly_chart(fig, use_container_width=True)
-
 # =========================
 # INTELLIGENCE NOTE
 # =========================
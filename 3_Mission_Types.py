@@ -1,6 +1,6 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
+
+from bf_data.charts import figure
 
 # ============================
 # PAGE CONFIG
@@ -63,68 +63,9 @@ st.markdown(
 st.markdown("---")
 
 # ============================
-# LOAD DATA
-# ============================
-@st.cache_data
-def load_data():
-    return pd.read_csv(
-        "/Users/deekshithsathrasalagangadharaiah/BF-Open-Data/Datasets/Berlin_Missions_2020_2025.csv",
-        parse_dates=["mission_created_date"],
-        low_memory=False
-    )
-
-df = load_data()
-
-# ============================
-# CLEANING
-# ============================
-df = df.dropna(subset=["response_time", "mission_type"])
-df = df[df["response_time"] > 0]
-
-# ============================
-# AGGREGATION
-# ============================
-mission_rt = (
-    df.groupby("mission_type", as_index=False)
-    .agg(
-        avg_response_time=("response_time", "mean"),
-        total_incidents=("response_time", "count")
-    )
-)
-
-# ============================
-# FUTURISTIC BUBBLE CHART
+# MISSION COMPLEXITY
 # ============================
-fig = px.scatter(
-    mission_rt,
-    x="avg_response_time",
-    y="mission_type",
-    size="total_incidents",
-    color="avg_response_time",
-    color_continuous_scale="Turbo",
-    labels={
-        "avg_response_time": "Average Response Time (seconds)",
-        "mission_type": "Emergency Classification"
-    },
-    title="Mission Complexity vs Response Load"
-)
-
-fig.update_layout(
-    template="plotly_dark",
-    height=620,
-    title_x=0.5,
-    plot_bgcolor="rgba(0,0,0,0)",
-    paper_bgcolor="rgba(0,0,0,0)",
-    font=dict(color="#d6e4ff")
-)
-
-fig.update_traces(
-    marker=dict(
-        line=dict(width=1, color="rgba(255,255,255,0.25)"),
-        opacity=0.85
-    )
-)
-
+fig = figure("mission_bubbles")
 st.plotly_chart(fig, use_container_width=True)
 
 # ============================
@@ -1,6 +1,6 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
+
+from bf_data.charts import figure
 
 # =========================
 # PAGE CONFIG
@@ -65,60 +65,9 @@ st.markdown(
 st.markdown("---")
 
 # =========================
-# LOAD DATA
-# =========================
-@st.cache_data
-def load_data():
-    return pd.read_csv(
-        "/Users/deekshithsathrasalagangadharaiah/BF-Open-Data/Datasets/Berlin_Missions_2020_2025.csv",
-        parse_dates=["mission_created_date"],
-        low_memory=False
-    )
-
-df = load_data()
-
-# =========================
-# FEATURE ENGINEERING
-# =========================
-df["hour"] = df["mission_created_date"].dt.hour
-df["weekday"] = df["mission_created_date"].dt.day_name()
-df["is_weekend"] = df["mission_created_date"].dt.weekday >= 5
-df["day_type"] = df["is_weekend"].map({True: "Weekend", False: "Weekday"})
-
-# =========================
-# HEATMAP DATA
+# HEATMAP
 # =========================
-heatmap = (
-    df.groupby(["day_type", "hour"], as_index=False)
-    .agg(avg_response_time=("response_time", "mean"))
-)
-
-# =========================
-# FUTURISTIC HEATMAP
-# =========================
-fig = px.density_heatmap(
-    heatmap,
-    x="hour",
-    y="day_type",
-    z="avg_response_time",
-    color_continuous_scale="Inferno",
-    labels={
-        "hour": "Chrono-Hour",
-        "day_type": "Operational Mode",
-        "avg_response_time": "Response Latency (sec)"
-    },
-    title="Chrono-Stress Distribution Across Emergency Operations"
-)
-
-fig.update_layout(
-    template="plotly_dark",
-    height=480,
-    title_x=0.5,
-    plot_bgcolor="rgba(0,0,0,0)",
-    paper_bgcolor="rgba(0,0,0,0)",
-    font=dict(color="#d6e4ff")
-)
-
+fig = figure("chrono_heatmap")
 st.plotly_chart(fig, use_container_width=True)
 
 # =========================
@@ -1,6 +1,7 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
+
+from bf_data import load_cube, values
+from bf_data.charts import figure, mission_types
 
 # =========================
 # PAGE CONFIG
@@ -67,28 +68,7 @@ st.markdown("---")
 # =========================
 # LOAD DATA
 # =========================
-MISSION_PATH = "/Users/deekshithsathrasalagangadharaiah/BF-Open-Data/Datasets/Berlin_Missions_2020_2025.csv"
-
-df = pd.read_csv(
-    MISSION_PATH,
-    parse_dates=["mission_created_date"],
-    low_memory=False
-)
-
-df["year"] = df["mission_created_date"].dt.year
-
-# =========================
-# MISSION TYPE TRANSLATION
-# =========================
-mission_map = {
-    "Rettungsdienst": "Emergency Medical Service",
-    "Notfallrettung": "Emergency Rescue",
-    "Brand": "Fire Incident",
-    "Technische Hilfeleistung": "Technical Rescue",
-    "Krankentransport": "Patient Transport"
-}
-
-df["mission_type_en"] = df["mission_type"].map(mission_map).fillna("Other")
+cube = load_cube()
 
 # =========================
 # CONTROLS
@@ -98,55 +78,19 @@ col1, col2 = st.columns(2)
 with col1:
     district = st.selectbox(
         "📡 District",
-        sorted(df["mission_location_district"].dropna().unique())
+        values(cube, "district")
     )
 
 with col2:
     year = st.selectbox(
         "🕒 Year",
-        sorted(df["year"].unique())
+        values(cube, "year")
     )
 
 # =========================
-# AGGREGATION
+# INCIDENT DISTRIBUTION
 # =========================
-counts = (
-    df[
-        (df["mission_location_district"] == district) &
-        (df["year"] == year)
-    ]
-    .groupby("mission_type_en", as_index=False)
-    .size()
-    .rename(columns={"size": "incidents"})
-    .sort_values("incidents", ascending=True)
-)
-
-# =========================
-# FUTURISTIC BAR CHART
-# =========================
-fig = px.bar(
-    counts,
-    x="incidents",
-    y="mission_type_en",
-    orientation="h",
-    color="incidents",
-    color_continuous_scale="Turbo",
-    labels={
-        "incidents": "Number of Incidents",
-        "mission_type_en": "Emergency Classification"
-    },
-    title=f"Incident Distribution — {district} ({year})"
-)
-
-fig.update_layout(
-    template="plotly_dark",
-    height=480,
-    title_x=0.5,
-    plot_bgcolor="rgba(0,0,0,0)",
-    paper_bgcolor="rgba(0,0,0,0)",
-    font=dict(color="#d6e4ff")
-)
-
+fig = figure("incident_distribution", district=district, year=year)
 st.plotly_chart(fig, use_container_width=True)
 
 # =========================
@@ -154,11 +98,7 @@ st.plotly_chart(fig, use_container_width=True)
 # =========================
 st.markdown("### 📘 Mission Type Reference (German → English)")
 
-translation_table = (
-    df[["mission_type", "mission_type_en"]]
-    .drop_duplicates()
-    .sort_values("mission_type")
-)
+translation_table = mission_types(cube)
 
 st.dataframe(
     translation_table,
@@ -1,6 +1,8 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
+
+from bf_data import load_rollup
+from bf_data.charts import figure
+from bf_data.rollup import level_rows
 
 # =========================
 # PAGE CONFIG
@@ -67,57 +69,44 @@ st.markdown("---")
 # =========================
 # LOAD DATA
 # =========================
-REGIONAL_PATH = "/Users/deekshithsathrasalagangadharaiah/BF-Open-Data/Datasets/Berlin_Regional_2020_2025.csv"
-
-df = pd.read_csv(REGIONAL_PATH, low_memory=False)
+rollup = load_rollup()
 
 # =========================
 # CONTROLS
 # =========================
+LEVELS = {
+    "Bezirk": "bezirk",
+    "Prediction Area": "prediction_area",
+    "District Area": "district_area",
+    "Planning Room": "planning_room",
+}
+
+level_label = st.radio("🗺 Level", list(LEVELS), index=2, horizontal=True)
+level = LEVELS[level_label]
+areas = level_rows(rollup, level)
+
 district = st.selectbox(
-    "📡 District Area",
+    f"📡 {level_label}",
     sorted(
-        df["district_area_name"]
+        areas["area_name"]
         .dropna()
         .astype(str)
         .unique()
     )
 )
 
-df_d = df[df["district_area_name"] == district]
-
 # =========================
 # FUTURISTIC CAPACITY TREND
 # =========================
-fig = px.area(
-    df_d,
-    x="source_year",
-    y="mission_count_all",
-    markers=True,
-    color_discrete_sequence=["#00E5FF"],
-    labels={
-        "source_year": "Operational Year",
-        "mission_count_all": "Total Mission Load"
-    },
-    title=f"Regional Emergency Workload — {district}"
-)
-
-fig.update_layout(
-    template="plotly_dark",
-    height=480,
-    title_x=0.5,
-    plot_bgcolor="rgba(0,0,0,0)",
-    paper_bgcolor="rgba(0,0,0,0)",
-    font=dict(color="#d6e4ff")
-)
-
-fig.update_traces(
-    line=dict(width=3),
-    marker=dict(size=7)
-)
-
+fig = figure("capacity_workload", level=level, area=district)
 st.plotly_chart(fig, use_container_width=True)
 
+# =========================
+# RESPONSE TIME SPREAD
+# =========================
+fig_rt = figure("capacity_response", level=level, area=district)
+st.plotly_chart(fig_rt, use_container_width=True)
+
 # =========================
 # SYSTEM STORY
 # =========================
@@ -1,6 +1,10 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
+
+from bf_data import load_compliance, load_rollup
+from bf_data.charts import figure, top_neighborhoods
+from bf_data.compliance import citywide
+from bf_data.sections import render_sections
 
 # =========================
 # PAGE CONFIG
@@ -47,15 +51,8 @@ label {
 # =========================
 # LOAD DATA
 # =========================
-@st.cache_data
-def load_regional():
-    df = pd.read_csv(
-        "/Users/deekshithsathrasalagangadharaiah/BF-Open-Data/Datasets/Berlin_Regional_2020_2025.csv",
-        low_memory=False
-    )
-    return df
-
-df = load_regional()
+rollup = load_rollup()
+compliance = load_compliance()
 
 # =========================
 # HEADER
@@ -82,78 +79,80 @@ st.markdown("---")
 # =========================
 year = st.selectbox(
     "📅 Select Year",
-    sorted(df["source_year"].dropna().astype(int).unique())
+    sorted(rollup["year"].unique())
 )
 
-df_y = df[df["source_year"] == year].copy()
+# =========================
+# SECTION PLACEHOLDERS
+# =========================
+# The bar chart, the metrics and the compliance charts are independent;
+# they are computed side by side on the section pool and each fills its
+# placeholder as soon as it is ready (see RENDER SECTIONS below).
+volume_slot = st.empty()
+share_slot = st.empty()
 
 # =========================
-# PREPARE DATA
+# TIME-GOAL COMPLIANCE
 # =========================
-neighborhood_stats = (
-    df_y
-    .groupby("district_area_name", as_index=False)
-    .agg(
-        total_incidents=("mission_count_all", "sum"),
-        ems_incidents=("mission_count_ems", "sum"),
-        fire_incidents=("mission_count_fire", "sum")
+st.markdown("---")
+st.markdown("### ⏱️ Time-Goal Compliance")
+
+goal_metrics_slot = st.empty()
+goal_slot = st.empty()
+
+areas = compliance[compliance["level"] == "district_area"]
+area = st.selectbox("🏘️ Neighborhood Compliance Trend", sorted(areas["area_name"].dropna().unique()))
+
+goal_trend_slot = st.empty()
+
+
+def show_shares(neighborhood_stats):
+    col1, col2, col3 = share_slot.container().columns(3)
+
+    col1.metric(
+        "Total Incidents (Top 15)",
+        f"{neighborhood_stats['total_incidents'].sum():,}"
     )
-    .sort_values("total_incidents", ascending=False)
-    .head(15)
-)
 
-# =========================
-# NEON BAR CHART
-# =========================
-fig = px.bar(
-    neighborhood_stats,
-    x="total_incidents",
-    y="district_area_name",
-    orientation="h",
-    color="total_incidents",
-    color_continuous_scale="Turbo",
-    labels={
-        "district_area_name": "Neighborhood",
-        "total_incidents": "Total Emergency Incidents"
-    },
-    title=f"Top 15 Neighborhoods by Emergency Volume ({year})"
-)
+    col2.metric(
+        "EMS Share",
+        f"{(neighborhood_stats['ems_incidents'].sum() / neighborhood_stats['total_incidents'].sum())*100:.1f}%"
+    )
 
-fig.update_layout(
-    template="plotly_dark",
-    height=600,
-    title_x=0.5,
-    plot_bgcolor="rgba(0,0,0,0)",
-    paper_bgcolor="rgba(0,0,0,0)",
-    yaxis=dict(categoryorder="total ascending"),
-    font=dict(color="#d6e4ff")
-)
+    col3.metric(
+        "Fire Share",
+        f"{(neighborhood_stats['fire_incidents'].sum() / neighborhood_stats['total_incidents'].sum())*100:.1f}%"
+    )
 
-fig.update_traces(
-    marker=dict(line=dict(width=1, color="rgba(255,255,255,0.25)"), opacity=0.85)
-)
 
-st.plotly_chart(fig, use_container_width=True)
+def show_goal_metrics(city_y):
+    c1, c2 = goal_metrics_slot.container().columns(2)
+    c1.metric(
+        "EMS Critical – Time Goal Reached",
+        f"{city_y['ems_critical_rate'] * 100:.1f}%",
+        None if pd.isna(city_y["ems_critical_rate_delta"]) else f"{city_y['ems_critical_rate_delta'] * 100:+.1f} pts"
+    )
+    c2.metric(
+        "Fire – Time Goal Reached",
+        f"{city_y['fire_rate'] * 100:.1f}%",
+        None if pd.isna(city_y["fire_rate_delta"]) else f"{city_y['fire_rate_delta'] * 100:+.1f} pts"
+    )
 
-# =========================
-# KPI METRICS
-# =========================
-col1, col2, col3 = st.columns(3)
 
-col1.metric(
-    "Total Incidents (Top 15)",
-    f"{neighborhood_stats['total_incidents'].sum():,}"
-)
+def chart_into(slot):
+    return lambda fig: slot.plotly_chart(fig, use_container_width=True)
 
-col2.metric(
-    "EMS Share",
-    f"{(neighborhood_stats['ems_incidents'].sum() / neighborhood_stats['total_incidents'].sum())*100:.1f}%"
-)
 
-col3.metric(
-    "Fire Share",
-    f"{(neighborhood_stats['fire_incidents'].sum() / neighborhood_stats['total_incidents'].sum())*100:.1f}%"
-)
+# =========================
+# RENDER SECTIONS
+# =========================
+render_sections({
+    "volume": (lambda: figure("neighborhood_volume", year=year), chart_into(volume_slot)),
+    "shares": (lambda: top_neighborhoods(rollup, year), show_shares),
+    "goal_metrics": (lambda: citywide(compliance).set_index("year").loc[year], show_goal_metrics),
+    "goal_lowest": (lambda: figure("compliance_lowest", year=year), chart_into(goal_slot)),
+    "goal_trend": (lambda: figure("compliance_trend", area=area), chart_into(goal_trend_slot)),
+})
 
 # =========================
 # SYSTEM INTERPRETATION
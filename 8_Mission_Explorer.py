@@ -0,0 +1,159 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from bf_data import load_sketches, quantiles, select_missions, shared_missions, values
+from bf_data.charts import mission_scatter
+from bf_data.figures import cached_figure, data_version
+from bf_data.quality import response_times
+
+# =========================
+# PAGE CONFIG
+# =========================
+st.set_page_config(
+    layout="wide",
+    page_title="Berlin Emergency Grid | Mission Explorer"
+)
+
+# =========================
+# FUTURISTIC UI STYLE (2035)
+# =========================
+st.markdown("""
+<style>
+.stApp {
+    background:
+        radial-gradient(circle at top left, #0a1a2f, #020617 70%);
+    color: #e5f0ff;
+    font-family: 'Inter', sans-serif;
+}
+
+h1 {
+    font-size: 2.8rem;
+    font-weight: 700;
+    letter-spacing: 1px;
+}
+
+p {
+    font-size: 17px;
+    line-height: 1.65;
+    color: #cfdcff;
+}
+
+label {
+    font-size: 15px !important;
+    color: #9fb4ff !important;
+}
+
+div[data-baseweb="select"] {
+    background-color: rgba(15, 30, 60, 0.85);
+    border-radius: 14px;
+}
+
+.glow {
+    text-shadow: 0 0 12px rgba(0, 180, 255, 0.4);
+}
+</style>
+""", unsafe_allow_html=True)
+
+# =========================
+# HEADER
+# =========================
+st.markdown(
+    """
+    # 🔭 Mission Explorer
+    <span class="glow">Berlin Emergency Grid • Every Mission, Every Second</span>
+    """,
+    unsafe_allow_html=True
+)
+
+st.markdown(
+    """
+    Individual missions by **creation time and response time**.
+    Drag a box on the chart to zoom in; dense regions are binned on the server
+    and sharpen as you zoom.
+    """
+)
+
+st.markdown("---")
+
+# =========================
+# LOAD DATA
+# =========================
+ALL = "All Districts"
+
+missions = shared_missions()
+
+col1, col2 = st.columns([3, 1])
+
+with col1:
+    district = st.selectbox(
+        "📡 District",
+        [ALL] + list(values(missions, "mission_location_district"))
+    )
+
+with col2:
+    show_tail = st.checkbox("Include slowest 1 %", value=False)
+
+selected = select_missions(district=None if district == ALL else district)
+
+# =========================
+# VIEW (ZOOM) STATE
+# =========================
+created = selected["mission_created_date"].to_numpy(dtype="datetime64[ms]").view("int64")
+tail = quantiles(load_sketches(), q=(0.99,), **({} if district == ALL else {"district": district}))
+if show_tail or tail.empty:
+    # No p99 without valid response times; a unit axis if there are none at all.
+    rt = response_times(selected)
+    y_max = float(np.nanmax(rt)) if (~np.isnan(rt)).any() else 1.0
+else:
+    y_max = float(tail["p99"].iloc[0])
+home = (float(created.min()), float(created.max()), 0.0, y_max)
+
+if st.session_state.get("explorer_home") != (district, home):
+    st.session_state["explorer_home"] = (district, home)
+    st.session_state["explorer_view"] = home
+
+view = st.session_state["explorer_view"]
+
+if st.button("↺ Reset zoom", disabled=view == home):
+    view = st.session_state["explorer_view"] = home
+
+# =========================
+# SCATTER
+# =========================
+fig = cached_figure(
+    "8_Mission_Explorer",
+    {"district": district, "view": view},
+    data_version(missions),
+    lambda: mission_scatter(selected, view)
+)
+
+# A new key per view gives every zoom level a fresh, empty selection.
+event = st.plotly_chart(
+    fig,
+    use_container_width=True,
+    on_select="rerun",
+    selection_mode="box",
+    key=f"explorer-{hash((district, view))}"
+)
+
+boxes = event.selection.get("box", []) if event else []
+if boxes:
+    box_x = pd.to_datetime(boxes[0]["x"], format="ISO8601").astype("datetime64[ms]").astype("int64")
+    st.session_state["explorer_view"] = (
+        float(min(box_x)), float(max(box_x)), float(min(boxes[0]["y"])), float(max(boxes[0]["y"]))
+    )
+    st.rerun()
+
+# =========================
+# SYSTEM NOTE
+# =========================
+st.markdown(
+    """
+    **How to read this**
+    Where missions are sparse every point is one mission. In dense regions each
+    point stands for the missions of one small cell, placed at their centre and
+    sized by their count, so the chart never carries more than a fixed number
+    of points however many missions the view holds.
+    """
+)
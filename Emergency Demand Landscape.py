@@ -1,6 +1,9 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
+
+from bf_data import load_rollup
+from bf_data.charts import MAP_LEVELS, figure
+from bf_data.geometry import map_levels
+from bf_data.rollup import level_rows
 
 # =========================
 # PAGE CONFIG
@@ -47,15 +50,11 @@ label {
 # =========================
 # LOAD DATA
 # =========================
-@st.cache_data
-def load_data():
-    df = pd.read_csv(
-        "/Users/deekshithsathrasalagangadharaiah/BF-Open-Data/Datasets/Berlin_Regional_2020_2025.csv",
-        low_memory=False
-    )
-    return df
+rollup = load_rollup()
 
-df = load_data()
+# The map needs LOR outlines (see bf_data.geometry); without any the page is
+# the treemap alone.
+levels = {level: MAP_LEVELS[level] for level in map_levels()}
 
 # =========================
 # HEADER
@@ -71,6 +70,9 @@ st.markdown(
 st.markdown(
     """
 Zoom into **structural emergency pressure by district**.  
+The map shows **where operational load is concentrated**, the treemap how it rolls up.
+""" if levels else """
+Zoom into **structural emergency pressure by district**.  
 Treemap visualization highlights **where operational load is concentrated**.
 """
 )
@@ -78,38 +80,43 @@ Treemap visualization highlights **where operational load is concentrated**.
 st.markdown("---")
 
 # =========================
-# YEAR SELECTION
+# YEAR & FOCUS SELECTION
 # =========================
-year = st.selectbox(
-    "📅 Select Year",
-    sorted(df["source_year"].dropna().astype(int).unique())
-)
+col1, col2, col3 = st.columns(3)
 
-df_y = (
-    df[df["source_year"] == year]
-    .groupby("district_area_name", as_index=False)
-    .agg(total_incidents=("mission_count_all", "sum"))
-)
+with col1:
+    year = st.selectbox(
+        "📅 Select Year",
+        sorted(rollup["year"].unique())
+    )
 
-# =========================
-# FUTURISTIC TREEMAP
-# =========================
-fig = px.treemap(
-    df_y,
-    path=["district_area_name"],
-    values="total_incidents",
-    color="total_incidents",
-    color_continuous_scale="Plasma",
-    title=f"Relative Emergency Load by District ({year})"
-)
+if levels:
+    bezirke = level_rows(rollup, "bezirk", year).set_index("area_id")["area_name"].sort_index()
 
-fig.update_layout(
-    template="plotly_dark",
-    height=600,
-    margin=dict(t=60, l=10, r=10, b=10),
-    font=dict(color="#d6e4ff")
-)
+    with col2:
+        bezirk = st.selectbox(
+            "🔎 Focus",
+            [None] + [int(b) for b in bezirke.index],
+            format_func=lambda b: "All Berlin" if b is None else bezirke[b]
+        )
+
+    with col3:
+        level = st.selectbox(
+            "🧩 Detail",
+            list(levels),
+            format_func=lambda l: f"{levels[l]}s"
+        )
 
+    # Demand map
+    fig = figure("demand_map", year=int(year), bezirk=bezirk, level=level)
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.markdown("### 🧱 Hierarchy View")
+
+# =========================
+# DEMAND TREEMAP
+# =========================
+fig = figure("demand_treemap", year=year)
 st.plotly_chart(fig, use_container_width=True)
 
 # =========================
@@ -118,8 +125,21 @@ st.plotly_chart(fig, use_container_width=True)
 st.markdown(
     """
 ### 🧭 How to read this
+- Brighter areas on the map = more incidents  
+- Focus a Bezirk, or switch to planning rooms, for finer outlines  
+- Treemap: larger blocks = higher pressure, brighter = slower critical EMS response (pooled mean)  
+- Click a Bezirk or prediction area in the treemap to drill down  
+- Quickly identifies **hotspot districts**
+
+### 🎯 Operational Value
+- Enables **district-level resource allocation**  
+- Supports **strategic station placement**  
+- Keeps **spatial intuition** with outlines simplified per zoom level
+""" if levels else """
+### 🧭 How to read this
 - Larger blocks = higher emergency pressure  
-- Darker colors = heavier operational load  
+- Brighter colors = slower critical EMS response (pooled mean)  
+- Click a Bezirk or prediction area to drill down  
 - Quickly identifies **hotspot districts**
 
 ### 🎯 Operational Value
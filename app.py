@@ -1,10 +1,16 @@
 import streamlit as st
 
+from bf_data.warmup import start_warmup
+
 st.set_page_config(
     page_title="Berlin Emergency Services",
     layout="wide"
 )
 
+# Load the shared datasets in the background (once per server process), so
+# the first visitor of each page does not pay for them.
+start_warmup()
+
 st.title("🚨 Berlin Emergency Services Analysis (2020–2025)")
 
 st.markdown("""
@@ -0,0 +1,37 @@
+"""Shared data layer for the Berlin Emergency Services dashboards."""
+
+from .compliance import load_compliance
+from .cube import load_cube, query, values
+from .forecast import load_forecast
+from .paths import MISSIONS_CSV, REGIONAL_CSV, STORE_DIR
+from .pyramid import load_pyramid
+from .quality import load_quality
+from .regional import load_regional
+from .rollup import load_rollup
+from .shared import ReadOnlyDataError
+from .sketch import load_sketches, quantiles
+from .store import build_store, load_missions, select_missions, shared_missions
+from .streaming import load_overview
+
+__all__ = [
+    "MISSIONS_CSV",
+    "REGIONAL_CSV",
+    "STORE_DIR",
+    "ReadOnlyDataError",
+    "build_store",
+    "load_compliance",
+    "load_cube",
+    "load_forecast",
+    "load_missions",
+    "load_overview",
+    "load_pyramid",
+    "load_quality",
+    "load_regional",
+    "load_rollup",
+    "load_sketches",
+    "quantiles",
+    "query",
+    "select_missions",
+    "shared_missions",
+    "values",
+]
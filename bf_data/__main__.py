@@ -0,0 +1,40 @@
+"""Command line entry point: ``python -m bf_data <command> [args]``."""
+
+import sys
+from importlib import import_module
+
+COMMANDS = {
+    "store": "bf_data.store",
+    "cube": "bf_data.cube",
+    "schema": "bf_data.schema",
+    "ingest": "bf_data.ingest",
+    "bench": "bf_data.bench",
+    "quality": "bf_data.quality",
+    "csvbench": "bf_data.csvbench",
+    "synth": "bf_data.synth",
+    "overview": "bf_data.streaming",
+    "sketch": "bf_data.sketch",
+    "compliance": "bf_data.compliance",
+    "rollup": "bf_data.rollup",
+    "pyramid": "bf_data.pyramid",
+    "forecast": "bf_data.forecast",
+    "prerender": "bf_data.prerender",
+    "profile": "bf_data.profile",
+    "geometry": "bf_data.geometry",
+    "serve": "bf_data.service",
+}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+
+    if not argv or argv[0] not in COMMANDS:
+        print("usage: python -m bf_data {" + ",".join(COMMANDS) + "} [args]")
+        return 2
+
+    module = import_module(COMMANDS[argv[0]])
+    return module.main(argv[1:])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
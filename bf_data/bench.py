@@ -0,0 +1,310 @@
+"""Headless page benchmark.
+
+Runs every page script through Streamlit's ``AppTest`` at several data scale
+factors and records, per page:
+
+* ``load`` - time inside the ``bf_data`` loaders
+* ``figure`` - time inside ``plotly.express`` and ``Figure.update_*``
+* ``serialize`` - time inside ``plotly_chart`` (figure JSON + protobuf), on
+  ``st`` and on placeholders / containers
+* ``transform`` - the rest of the script run (aggregation, widgets, markdown)
+* ``peak_rss_mb`` - peak resident memory of the worker process
+
+Each page runs in its own subprocess so peak RSS is per page; the first run
+is reported as ``cold`` and the second as ``warm``. Scale factor N tiles the
+mission store N times into a scratch store, or with ``--synthetic ROWS``
+generates N x ROWS calibrated synthetic missions (see :mod:`bf_data.synth`)
+so the suite runs without the real data. The regional file is not scaled.
+
+    python -m bf_data bench --scales 1 10 100 --out benchmarks/results.json
+    python -m bf_data bench --synthetic 2.6M --scales 1 10
+"""
+
+import argparse
+import functools
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pyarrow.parquet as pq
+
+from .paths import MISSIONS_DIR, REPO_DIR, STORE_DIR
+from .synth import parse_count, write_store
+
+PAGES = [
+    "app.py",
+    "1_Overview.py",
+    "2_Time_Patterns.py",
+    "3_Mission_Types.py",
+    "4_Location_Trends.py",
+    "5_Location_Incidents.py",
+    "6_Regional_Capacity.py",
+    "7_Regional_TimeGoals.py",
+    "8_Mission_Explorer.py",
+    "Emergency Demand Landscape.py",
+]
+
+LOADERS = [
+    "load_compliance",
+    "load_cube",
+    "load_forecast",
+    "load_missions",
+    "load_overview",
+    "load_pyramid",
+    "load_regional",
+    "load_rollup",
+    "load_sketches",
+    "shared_missions",
+]
+
+
+# =========================
+# INSTRUMENTATION
+# =========================
+class StageTimer:
+    """Accumulates wall time per stage, counting only the outermost call.
+
+    Nesting is tracked per thread, so loaders running on the section pool
+    (see :mod:`bf_data.sections`) are timed too; their time adds up across
+    threads and can overlap the script thread's.
+    """
+
+    def __init__(self):
+        self.totals = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def wrap(self, owner, name, stage):
+        setattr(owner, name, self.timed(getattr(owner, name), stage))
+
+    def timed(self, original, stage):
+        """``original`` wrapped so its time counts towards ``stage``."""
+
+        @functools.wraps(original)
+        def timed(*args, **kwargs):
+            if getattr(self._local, "active", False):
+                return original(*args, **kwargs)
+            self._local.active = True
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                with self._lock:
+                    self.totals[stage] = self.totals.get(stage, 0.0) + elapsed
+                self._local.active = False
+
+        return timed
+
+    def reset(self):
+        self.totals = {}
+
+
+def instrument():
+    import plotly.express as px
+    import plotly.graph_objects as go
+    import streamlit as st
+    from streamlit.delta_generator import DeltaGenerator
+
+    import bf_data
+
+    from . import charts
+
+    timer = StageTimer()
+
+    for name in LOADERS:
+        if hasattr(bf_data, name):
+            timer.wrap(bf_data, name, "load")
+    # figure() calls the loaders it holds in SOURCES, not the bf_data names.
+    for source, load in charts.SOURCES.items():
+        charts.SOURCES[source] = timer.timed(load, "load")
+
+    for name in dir(px):
+        func = getattr(px, name)
+        if not name.startswith("_") and callable(func) and getattr(func, "__module__", "").startswith("plotly.express"):
+            timer.wrap(px, name, "figure")
+    for name in ("update_layout", "update_traces", "update_xaxes", "update_yaxes"):
+        timer.wrap(go.Figure, name, "figure")
+
+    # st.plotly_chart is bound to the main container at import; placeholders
+    # (st.empty(), columns) go through the class.
+    timer.wrap(st, "plotly_chart", "serialize")
+    timer.wrap(DeltaGenerator, "plotly_chart", "serialize")
+    return timer
+
+
+def _rss_mb():
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def run_page(page, runs=2, timeout=600):
+    """Run ``page`` ``runs`` times in this process and time each run."""
+    from streamlit.testing.v1 import AppTest
+
+    timer = instrument()
+    baseline_rss = _rss_mb()
+    results = []
+
+    for _ in range(runs):
+        timer.reset()
+        app = AppTest.from_file(str(REPO_DIR / page), default_timeout=timeout)
+
+        start = time.perf_counter()
+        app.run()
+        total = time.perf_counter() - start
+
+        stages = {stage: timer.totals.get(stage, 0.0) for stage in ("load", "figure", "serialize")}
+        stages["transform"] = max(total - sum(stages.values()), 0.0)
+        results.append({
+            "total_s": total,
+            **{f"{stage}_s": value for stage, value in stages.items()},
+            "errors": [str(e.value) for e in app.exception],
+        })
+
+    return {
+        "page": page,
+        "cold": results[0],
+        "warm": results[-1],
+        "baseline_rss_mb": baseline_rss,
+        "peak_rss_mb": _rss_mb(),
+    }
+
+
+# =========================
+# SCALED STORES
+# =========================
+def scaled_store(scale, root, missions_dir=MISSIONS_DIR, synthetic_rows=None):
+    """Build a scratch store under ``root`` at ``scale`` times the base size.
+
+    The base is the mission store (every partition tiled ``scale`` times) or,
+    with ``synthetic_rows``, that many generated rows.
+    """
+    from .cube import build_cube
+    from .store import max_created_date, write_watermark
+
+    store_dir = Path(root) / f"x{scale}"
+    out_dir = store_dir / "missions"
+
+    if synthetic_rows:
+        write_store(out_dir, scale * synthetic_rows, seed=scale)
+    else:
+        for part in sorted(Path(missions_dir).glob("year=*/*.parquet")):
+            table = pq.read_table(part)
+            target = out_dir / part.parent.name / part.name
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with pq.ParquetWriter(target, table.schema) as writer:
+                for _ in range(scale):
+                    writer.write_table(table)
+        write_watermark(out_dir, max_created_date(out_dir))
+
+    start = time.perf_counter()
+    cube = build_cube(out_dir, store_dir / "cube.parquet")
+    return store_dir, {"cube_build_s": time.perf_counter() - start, "cube_cells": len(cube)}
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=REPO_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(scales=(1, 10, 100), pages=PAGES, runs=2, missions_dir=MISSIONS_DIR, synthetic_rows=None):
+    from .store import missions_dataset
+
+    if not synthetic_rows:
+        missions_dataset(missions_dir)
+    report = {
+        "commit": _git_commit(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "synthetic_rows": synthetic_rows,
+        "scales": [],
+    }
+
+    root = Path(tempfile.mkdtemp(prefix="bf-bench-"))
+    try:
+        for scale in scales:
+            store_dir, build = scaled_store(scale, root, missions_dir, synthetic_rows)
+            env = {**os.environ, "BF_STORE_DIR": str(store_dir)}
+            rows = int(sum(pq.ParquetFile(p).metadata.num_rows for p in store_dir.glob("missions/*/*.parquet")))
+
+            entry = {"scale": scale, "rows": rows, **build, "pages": []}
+            for page in pages:
+                proc = subprocess.run(
+                    [sys.executable, "-m", "bf_data", "bench", "--worker", page, "--runs", str(runs)],
+                    cwd=REPO_DIR, env=env, capture_output=True, text=True
+                )
+                if proc.returncode:
+                    entry["pages"].append({"page": page, "error": proc.stderr[-2000:]})
+                else:
+                    entry["pages"].append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+            report["scales"].append(entry)
+            shutil.rmtree(store_dir, ignore_errors=True)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    return report
+
+
+def _print_summary(report):
+    for entry in report["scales"]:
+        print(f"\nscale x{entry['scale']}: {entry['rows']:,} rows, cube build {entry['cube_build_s']:.2f}s")
+        for page in entry["pages"]:
+            if "error" in page:
+                print(f"  {page['page']:32s} FAILED")
+                continue
+            cold, warm = page["cold"], page["warm"]
+            print(f"  {page['page']:32s} cold {cold['total_s']:7.3f}s  warm {warm['total_s']:7.3f}s  "
+                  f"(load {cold['load_s']:.3f} / transform {cold['transform_s']:.3f} / "
+                  f"figure {cold['figure_s']:.3f} / serialize {cold['serialize_s']:.3f})  "
+                  f"peak {page['peak_rss_mb']:.0f} MB")
+
+
+# =========================
+# CLI
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m bf_data bench",
+        description="Benchmark every page headlessly at several data scales."
+    )
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--pages", nargs="+", default=PAGES)
+    parser.add_argument("--runs", type=int, default=2)
+    parser.add_argument("--missions", default=MISSIONS_DIR)
+    parser.add_argument("--synthetic", type=parse_count, metavar="ROWS",
+                        help="benchmark on scale x ROWS synthetic missions instead of the store")
+    parser.add_argument("--out", default=None, help="JSON file (default: <store>/bench/<commit>.json)")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(run_page(args.worker, args.runs)))
+        return 0
+
+    report = run_suite(args.scales, args.pages, args.runs, args.missions, args.synthetic)
+
+    out = Path(args.out) if args.out else STORE_DIR / "bench" / f"{(report['commit'] or 'local')[:12]}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2))
+
+    _print_summary(report)
+    print(f"\nWrote {out}")
+    return 0
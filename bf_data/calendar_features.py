@@ -0,0 +1,82 @@
+"""Integer calendar features derived once at ingest.
+
+Every mission row is stored with ``month``, ``iso_week``, ``weekday``
+(Monday = 0), ``hour``, ``is_weekend`` and ``is_holiday`` next to its
+timestamp (``year`` is the partition key), so aggregations group small
+integer columns instead of calling ``.dt`` accessors or ``day_name()`` on
+every rerun.
+
+``is_holiday`` uses the public holidays of the state of Berlin, including
+International Women's Day (since 2019) and the one-off 8 May holidays of
+2020 and 2025.
+"""
+
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+
+from .schema import DATE_COLUMN
+
+CALENDAR_COLUMNS = ["month", "iso_week", "weekday", "hour", "is_weekend", "is_holiday"]
+
+ONE_OFF_HOLIDAYS = [dt.date(2020, 5, 8), dt.date(2025, 5, 8)]
+
+
+def easter_sunday(year):
+    """Gregorian Easter Sunday (anonymous Gregorian algorithm)."""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return dt.date(year, month, day + 1)
+
+
+def berlin_holidays(years):
+    """Public holidays in Berlin for ``years`` as ``datetime64[D]``."""
+    days = []
+    for year in sorted({int(y) for y in years}):
+        easter = easter_sunday(year)
+        days += [
+            dt.date(year, 1, 1),
+            easter - dt.timedelta(days=2),
+            easter + dt.timedelta(days=1),
+            dt.date(year, 5, 1),
+            easter + dt.timedelta(days=39),
+            easter + dt.timedelta(days=50),
+            dt.date(year, 10, 3),
+            dt.date(year, 12, 25),
+            dt.date(year, 12, 26),
+        ]
+        if year >= 2019:
+            days.append(dt.date(year, 3, 8))
+        days += [d for d in ONE_OFF_HOLIDAYS if d.year == year]
+    return np.array(days, dtype="datetime64[D]")
+
+
+def calendar_columns(created):
+    """Calendar features for a datetime Series, as a dict of compact arrays."""
+    created = pd.Series(created)
+    weekday = created.dt.weekday.astype("int8")
+    days = created.to_numpy("datetime64[D]")
+    years = created.dt.year.dropna().unique()
+
+    return {
+        "month": created.dt.month.astype("int8"),
+        "iso_week": created.dt.isocalendar().week.astype("int8"),
+        "weekday": weekday,
+        "hour": created.dt.hour.astype("int8"),
+        "is_weekend": weekday >= 5,
+        "is_holiday": pd.Series(np.isin(days, berlin_holidays(years)), index=created.index),
+    }
+
+
+def add_calendar(df, column=DATE_COLUMN):
+    """Return ``df`` with the calendar columns added from ``column``."""
+    return df.assign(**calendar_columns(df[column]))
@@ -0,0 +1,747 @@
+"""Figure builders of the dashboard pages.
+
+Every chart is a plain function of the shared data it reads and of the page
+selection (district, year, area, ...), registered in :data:`CHARTS` with its
+data sources and the finite set of selections a page can make. Pages call
+:func:`figure` with the chart name and the current selection; the figure
+comes from the in-process LRU, from the prerendered figure store (see
+:mod:`bf_data.prerender`) or, failing both, is built and cached.
+
+    fig = figure("location_incidents", district=district, year=year)
+"""
+
+from collections import namedtuple
+from itertools import product
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from .compliance import load_compliance, ranking
+from .cube import MEASURES, add_stats, load_cube, query, values
+from .decimate import DEFAULT_BUDGET, rasterize
+from .figures import cached_figure, data_version
+from .forecast import load_forecast
+from .geometry import bezirk_of, map_geometry
+from .labels import dictionary_labels, label_table, translate
+from .pyramid import districts, load_pyramid, series
+from .quality import response_times
+from .rollup import HIERARCHY, level_rows, load_rollup
+from .sketch import load_sketches, quantiles
+from .streaming import load_overview
+
+SOURCES = {
+    "compliance": load_compliance,
+    "cube": load_cube,
+    "forecast": load_forecast,
+    "geometry": map_geometry,
+    "overview": load_overview,
+    "pyramid": load_pyramid,
+    "rollup": load_rollup,
+    "sketches": load_sketches,
+}
+
+Chart = namedtuple("Chart", ["build", "sources", "selections"])
+
+
+def mission_types(cube, lang="en"):
+    """German mission types of the cube with their ``lang`` label."""
+    return label_table(cube["mission_type"], "mission_type", lang)
+
+
+def top_neighborhoods(rollup, year, n=15):
+    """District areas of ``year`` with the most missions."""
+    return (
+        level_rows(rollup, "district_area", year)
+        .rename(columns={
+            "area_name": "district_area_name",
+            "mission_count_all": "total_incidents",
+            "mission_count_ems": "ems_incidents",
+            "mission_count_fire": "fire_incidents"
+        })
+        .sort_values("total_incidents", ascending=False)
+        .head(n)
+    )
+
+
+# =========================
+# 1 OVERVIEW
+# =========================
+def overview_trend(pyramid, start=None, end=None):
+    level, load = series(pyramid, start=start, end=end)
+    trend = load.rename(columns={"bin": "period", "count": "incident_count"})
+
+    fig1 = px.line(
+        trend,
+        x="period",
+        y="incident_count",
+        markers=level in ("month", "year"),
+        color_discrete_sequence=["#00E5FF"]
+    )
+
+    fig1.update_layout(
+        template="plotly_dark",
+        height=420,
+        xaxis_title="Year" if level == "year" else "Time",
+        yaxis_title=f"Number of Incidents per {level.title()}"
+    )
+    return fig1
+
+
+def overview_mix(kpi):
+    by_type = pd.DataFrame(list(kpi["mission_mix"].items()), columns=["mission_type", "count"])
+    by_type["mission_type_en"] = translate(by_type["mission_type"], "mission_type")
+
+    mission_mix = (
+        by_type.groupby("mission_type_en", as_index=False, observed=True)["count"].sum()
+        .sort_values("count", ascending=False)
+    )
+    mission_mix.columns = ["Mission Type", "Incident Count"]
+
+    fig2 = px.pie(
+        mission_mix,
+        names="Mission Type",
+        values="Incident Count",
+        hole=0.65,
+        color_discrete_sequence=[
+            "#00E5FF", "#1E90FF", "#2ECC71", "#F39C12", "#9B59B6"
+        ]
+    )
+
+    fig2.update_traces(textinfo="percent+label")
+    fig2.update_layout(
+        template="plotly_dark",
+        height=460
+    )
+    return fig2
+
+
+# =========================
+# 2 TIME PATTERNS
+# =========================
+def time_patterns(pyramid, district, start=None, end=None):
+    level, load = series(pyramid, district, start, end)
+    trend = load.rename(columns={"bin": "Period", "count": "Incident Load"})
+
+    fig = px.area(
+        trend,
+        x="Period",
+        y="Incident Load",
+        markers=level in ("month", "year"),
+        color_discrete_sequence=["#00E5FF"]
+    )
+
+    fig.update_layout(
+        template="plotly_dark",
+        height=480,
+        title=f"Emergency Load History – {district}",
+        title_x=0.5,
+        xaxis_title="Time Axis",
+        yaxis_title=f"Incident Density per {level.title()}",
+        plot_bgcolor="rgba(0,0,0,0)",
+        paper_bgcolor="rgba(0,0,0,0)",
+        font=dict(color="#d6e4ff")
+    )
+
+    fig.update_traces(
+        line=dict(width=3 if level in ("month", "year") else 1.5),
+        marker=dict(size=7)
+    )
+    return fig
+
+
+def load_projection(pyramid, forecast, district, history=36):
+    ahead = forecast[forecast["district"] == district]
+    _, monthly = series(pyramid, district, level="month")
+    observed = monthly[monthly["bin"] < ahead["month"].min()].tail(history)
+
+    trend = pd.concat([
+        pd.DataFrame({"Month": observed["bin"], "Incident Load": observed["count"], "Series": "Observed"}),
+        # Start the forecast line at the last observed month so the lines join.
+        pd.DataFrame({"Month": observed["bin"].tail(1), "Incident Load": observed["count"].tail(1), "Series": "Forecast"}),
+        pd.DataFrame({"Month": ahead["month"], "Incident Load": ahead["forecast"], "Series": "Forecast"}),
+    ], ignore_index=True)
+
+    fig = px.line(
+        trend,
+        x="Month",
+        y="Incident Load",
+        color="Series",
+        markers=True,
+        color_discrete_sequence=["#00E5FF", "#FFB347"]
+    )
+
+    for level, alpha in (("95", 0.12), ("80", 0.22)):
+        fig.add_trace(go.Scatter(
+            x=pd.concat([ahead["month"], ahead["month"][::-1]]),
+            y=pd.concat([ahead[f"hi{level}"], ahead[f"lo{level}"][::-1]]),
+            fill="toself",
+            fillcolor=f"rgba(255,179,71,{alpha})",
+            line=dict(width=0),
+            hoverinfo="skip",
+            name=f"{level}% interval"
+        ))
+
+    fig.update_layout(
+        template="plotly_dark",
+        height=480,
+        title=f"Emergency Load Projection – {district}",
+        title_x=0.5,
+        xaxis_title="Month",
+        yaxis_title="Incidents per Month",
+        plot_bgcolor="rgba(0,0,0,0)",
+        paper_bgcolor="rgba(0,0,0,0)",
+        font=dict(color="#d6e4ff")
+    )
+    return fig
+
+
+# =========================
+# 3 MISSION TYPES
+# =========================
+def mission_bubbles(cube, sketches):
+    # rt_* only count response times the ingest quality flags leave usable;
+    # mission types without any are left out.
+    mission_rt = (
+        query(cube, ["mission_type"])
+        .query("rt_count > 0")
+        .rename(columns={"rt_mean": "avg_response_time", "rt_count": "total_incidents"})
+        [["mission_type", "avg_response_time", "total_incidents"]]
+        .merge(quantiles(sketches, ["mission_type"]), on="mission_type", how="left")
+    )
+
+    fig = px.scatter(
+        mission_rt,
+        x="avg_response_time",
+        y="mission_type",
+        size="total_incidents",
+        color="avg_response_time",
+        color_continuous_scale="Turbo",
+        hover_data={"p50": ":.0f", "p90": ":.0f", "p95": ":.0f"},
+        labels={
+            "avg_response_time": "Average Response Time (seconds)",
+            "p50": "Median (sec)",
+            "p90": "P90 (sec)",
+            "p95": "P95 (sec)",
+            "mission_type": "Emergency Classification"
+        },
+        title="Mission Complexity vs Response Load"
+    )
+
+    fig.update_layout(
+        template="plotly_dark",
+        height=620,
+        title_x=0.5,
+        plot_bgcolor="rgba(0,0,0,0)",
+        paper_bgcolor="rgba(0,0,0,0)",
+        font=dict(color="#d6e4ff")
+    )
+
+    fig.update_traces(
+        marker=dict(
+            line=dict(width=1, color="rgba(255,255,255,0.25)"),
+            opacity=0.85
+        )
+    )
+    return fig
+
+
+# =========================
+# 4 LOCATION TRENDS
+# =========================
+def chrono_heatmap(cube):
+    hourly = query(cube, ["weekday", "hour"])
+    hourly["day_type"] = (hourly["weekday"] >= 5).map({True: "Weekend", False: "Weekday"})
+
+    heatmap = (
+        add_stats(hourly.groupby(["day_type", "hour"], as_index=False)[MEASURES].sum())
+        .rename(columns={"rt_mean": "avg_response_time"})
+    )
+
+    fig = px.density_heatmap(
+        heatmap,
+        x="hour",
+        y="day_type",
+        z="avg_response_time",
+        color_continuous_scale="Inferno",
+        labels={
+            "hour": "Chrono-Hour",
+            "day_type": "Operational Mode",
+            "avg_response_time": "Response Latency (sec)"
+        },
+        title="Chrono-Stress Distribution Across Emergency Operations"
+    )
+
+    fig.update_layout(
+        template="plotly_dark",
+        height=480,
+        title_x=0.5,
+        plot_bgcolor="rgba(0,0,0,0)",
+        paper_bgcolor="rgba(0,0,0,0)",
+        font=dict(color="#d6e4ff")
+    )
+    return fig
+
+
+# =========================
+# 5 LOCATION INCIDENTS
+# =========================
+def incident_distribution(cube, district, year):
+    counts = (
+        query(cube, ["mission_type"], district=district, year=year)
+        .assign(mission_type_en=lambda df: translate(df["mission_type"], "mission_type"))
+        .groupby("mission_type_en", as_index=False, observed=True)["count"].sum()
+        .rename(columns={"count": "incidents"})
+        .sort_values("incidents", ascending=True)
+    )
+
+    fig = px.bar(
+        counts,
+        x="incidents",
+        y="mission_type_en",
+        orientation="h",
+        color="incidents",
+        color_continuous_scale="Turbo",
+        labels={
+            "incidents": "Number of Incidents",
+            "mission_type_en": "Emergency Classification"
+        },
+        title=f"Incident Distribution — {district} ({year})"
+    )
+
+    fig.update_layout(
+        template="plotly_dark",
+        height=480,
+        title_x=0.5,
+        plot_bgcolor="rgba(0,0,0,0)",
+        paper_bgcolor="rgba(0,0,0,0)",
+        font=dict(color="#d6e4ff")
+    )
+    return fig
+
+
+# =========================
+# 6 REGIONAL CAPACITY
+# =========================
+def _area_rows(rollup, level, area):
+    rows = level_rows(rollup, level)
+    return rows[rows["area_name"] == area]
+
+
+def capacity_workload(rollup, level, area):
+    fig = px.area(
+        _area_rows(rollup, level, area),
+        x="year",
+        y="mission_count_all",
+        markers=True,
+        color_discrete_sequence=["#00E5FF"],
+        labels={
+            "year": "Operational Year",
+            "mission_count_all": "Total Mission Load"
+        },
+        title=f"Regional Emergency Workload — {area}"
+    )
+
+    fig.update_layout(
+        template="plotly_dark",
+        height=480,
+        title_x=0.5,
+        plot_bgcolor="rgba(0,0,0,0)",
+        paper_bgcolor="rgba(0,0,0,0)",
+        font=dict(color="#d6e4ff")
+    )
+
+    fig.update_traces(
+        line=dict(width=3),
+        marker=dict(size=7)
+    )
+    return fig
+
+
+def capacity_response(rollup, level, area):
+    fig_rt = px.line(
+        _area_rows(rollup, level, area),
+        x="year",
+        y="response_time_ems_critical_mean",
+        error_y="response_time_ems_critical_std",
+        markers=True,
+        color_discrete_sequence=["#FF6B6B"],
+        hover_data={"response_time_ems_critical_n": ":,"},
+        labels={
+            "year": "Operational Year",
+            "response_time_ems_critical_mean": "EMS Critical Response Time (sec)",
+            "response_time_ems_critical_std": "Std Dev (sec)",
+            "response_time_ems_critical_n": "Missions Timed"
+        },
+        title=f"EMS Critical Response Time (mean ± std) — {area}"
+    )
+
+    fig_rt.update_layout(
+        template="plotly_dark",
+        height=420,
+        title_x=0.5,
+        plot_bgcolor="rgba(0,0,0,0)",
+        paper_bgcolor="rgba(0,0,0,0)",
+        font=dict(color="#d6e4ff")
+    )
+    return fig_rt
+
+
+# =========================
+# 7 REGIONAL TIME GOALS
+# =========================
+def neighborhood_volume(rollup, year):
+    fig = px.bar(
+        top_neighborhoods(rollup, year),
+        x="total_incidents",
+        y="district_area_name",
+        orientation="h",
+        color="total_incidents",
+        color_continuous_scale="Turbo",
+        hover_data={"response_time_ems_critical_mean": ":.0f", "response_time_ems_critical_std": ":.0f"},
+        labels={
+            "district_area_name": "Neighborhood",
+            "total_incidents": "Total Emergency Incidents",
+            "response_time_ems_critical_mean": "EMS Critical Response (mean, sec)",
+            "response_time_ems_critical_std": "EMS Critical Response (std, sec)"
+        },
+        title=f"Top 15 Neighborhoods by Emergency Volume ({year})"
+    )
+
+    fig.update_layout(
+        template="plotly_dark",
+        height=600,
+        title_x=0.5,
+        plot_bgcolor="rgba(0,0,0,0)",
+        paper_bgcolor="rgba(0,0,0,0)",
+        yaxis=dict(categoryorder="total ascending"),
+        font=dict(color="#d6e4ff")
+    )
+
+    fig.update_traces(
+        marker=dict(line=dict(width=1, color="rgba(255,255,255,0.25)"), opacity=0.85)
+    )
+    return fig
+
+
+def compliance_lowest(compliance, year):
+    lowest = (
+        ranking(compliance, year)
+        .dropna(subset=["ems_critical_rate"])
+        .tail(15)
+        .assign(
+            rate_pct=lambda d: d["ems_critical_rate"] * 100,
+            delta_pts=lambda d: d["ems_critical_rate_delta"] * 100
+        )
+    )
+
+    fig_goal = px.bar(
+        lowest,
+        x="rate_pct",
+        y="area_name",
+        orientation="h",
+        color="delta_pts",
+        color_continuous_scale="RdYlGn",
+        color_continuous_midpoint=0,
+        hover_data={"ems_critical_rank": True, "ems_critical_computed": ":,.0f"},
+        labels={
+            "area_name": "Neighborhood",
+            "rate_pct": "EMS Critical Time Goal Reached (%)",
+            "delta_pts": "Δ vs Previous Year (pts)",
+            "ems_critical_rank": "Rank",
+            "ems_critical_computed": "Missions Assessed"
+        },
+        title=f"15 Neighborhoods With the Lowest EMS Time-Goal Compliance ({year})"
+    )
+
+    fig_goal.update_layout(
+        template="plotly_dark",
+        height=600,
+        title_x=0.5,
+        plot_bgcolor="rgba(0,0,0,0)",
+        paper_bgcolor="rgba(0,0,0,0)",
+        yaxis=dict(categoryorder="total descending"),
+        font=dict(color="#d6e4ff")
+    )
+    return fig_goal
+
+
+def compliance_trend(compliance, area):
+    areas = compliance[compliance["level"] == "district_area"]
+    trend = (
+        areas[areas["area_name"] == area]
+        .melt(id_vars="year", value_vars=["ems_critical_rate", "fire_rate"], var_name="service", value_name="rate")
+        .assign(
+            rate=lambda d: d["rate"] * 100,
+            service=lambda d: d["service"].map({"ems_critical_rate": "EMS Critical", "fire_rate": "Fire"})
+        )
+    )
+
+    fig_trend = px.line(
+        trend,
+        x="year",
+        y="rate",
+        color="service",
+        markers=True,
+        color_discrete_sequence=["#00E5FF", "#FF6B6B"],
+        labels={"year": "Year", "rate": "Time Goal Reached (%)", "service": "Service"},
+        title=f"Time-Goal Compliance – {area}"
+    )
+
+    fig_trend.update_layout(
+        template="plotly_dark",
+        height=420,
+        title_x=0.5,
+        plot_bgcolor="rgba(0,0,0,0)",
+        paper_bgcolor="rgba(0,0,0,0)",
+        font=dict(color="#d6e4ff")
+    )
+    return fig_trend
+
+
+# =========================
+# EMERGENCY DEMAND LANDSCAPE
+# =========================
+def demand_treemap(rollup, year):
+    # Bezirk -> prediction area -> district area, each node carrying its own
+    # rolled-up totals and pooled response time.
+    df_y = pd.concat(
+        [level_rows(rollup, level, year) for level in ("bezirk", "prediction_area", "district_area")],
+        ignore_index=True
+    )
+    df_y = df_y.assign(
+        node=df_y["level"].astype(str) + ":" + df_y["area_id"].astype(str),
+        parent=(
+            df_y["level"].map({"prediction_area": "bezirk:", "district_area": "prediction_area:"}).astype(object)
+            + df_y["parent_id"].astype(str)
+        ).fillna(""),
+        total_incidents=df_y["mission_count_all"]
+    )
+
+    fig = px.treemap(
+        df_y,
+        ids="node",
+        names="area_name",
+        parents="parent",
+        values="total_incidents",
+        branchvalues="total",
+        color="response_time_ems_critical_mean",
+        color_continuous_scale="Plasma",
+        hover_data={"response_time_ems_critical_std": ":.0f"},
+        labels={
+            "total_incidents": "Total Incidents",
+            "response_time_ems_critical_mean": "EMS Critical Response (sec)",
+            "response_time_ems_critical_std": "Std Dev (sec)"
+        },
+        title=f"Relative Emergency Load by District ({year})"
+    )
+
+    fig.update_layout(
+        template="plotly_dark",
+        height=600,
+        margin=dict(t=60, l=10, r=10, b=10),
+        font=dict(color="#d6e4ff")
+    )
+    return fig
+
+
+MAP_LEVELS = {"district_area": "District Area", "planning_room": "Planning Room"}
+
+
+def demand_map(rollup, geometry, year, bezirk=None, level="district_area"):
+    # Berlin uses the coarsest outlines; a single Bezirk fills the map, so it
+    # gets the finer ones.
+    outlines = geometry["levels"][level]["city" if bezirk is None else "bezirk"]
+    areas = level_rows(rollup, level, year)
+    if bezirk is not None:
+        areas = areas[bezirk_of(areas["area_id"], level) == bezirk]
+        name = level_rows(rollup, "bezirk", year).set_index("area_id")["area_name"].get(bezirk, bezirk)
+    ids = set(areas["area_id"].tolist())
+    shapes = {"type": "FeatureCollection", "features": [f for f in outlines["features"] if f["id"] in ids]}
+
+    fig = px.choropleth(
+        areas,
+        geojson=shapes,
+        locations="area_id",
+        featureidkey="id",
+        color="mission_count_all",
+        color_continuous_scale="Plasma",
+        hover_name="area_name",
+        hover_data={
+            "area_id": False,
+            "response_time_ems_critical_mean": ":.0f",
+            "response_time_ems_critical_std": ":.0f"
+        },
+        labels={
+            "mission_count_all": "Total Incidents",
+            "response_time_ems_critical_mean": "EMS Critical Response (sec)",
+            "response_time_ems_critical_std": "Std Dev (sec)"
+        },
+        title=f"Emergency Load by {MAP_LEVELS[level]} – {'Berlin' if bezirk is None else name} ({year})"
+    )
+
+    fig.update_geos(fitbounds="locations", visible=False, bgcolor="rgba(0,0,0,0)")
+    fig.update_traces(marker_line_width=0.6, marker_line_color="#0a1a2f")
+    fig.update_layout(
+        template="plotly_dark",
+        height=640,
+        title_x=0.5,
+        margin=dict(t=60, l=10, r=10, b=10),
+        paper_bgcolor="rgba(0,0,0,0)",
+        font=dict(color="#d6e4ff")
+    )
+    return fig
+
+
+# =========================
+# MISSION EXPLORER
+# =========================
+def mission_scatter(missions, view, budget=DEFAULT_BUDGET):
+    """Response time against creation time of the missions inside ``view``.
+
+    ``view`` is ``(x0, x1, y0, y1)`` with x in epoch milliseconds and y in
+    seconds; missions whose response time is flagged unusable are left
+    out. The points are decimated to at most ``budget`` (see
+    :mod:`bf_data.decimate`). Not registered in :data:`CHARTS`: its
+    selection space (any zoom window) cannot be prerendered.
+    """
+    x0, x1, y0, y1 = view
+    types = missions["mission_type"]
+    raster = rasterize(
+        missions["mission_created_date"].to_numpy(dtype="datetime64[ms]").view("int64"),
+        response_times(missions),
+        types.cat.codes.to_numpy(),
+        (x0, x1),
+        (y0, y1),
+        budget,
+    )
+    labels = dictionary_labels(types.cat.categories, "mission_type")
+    points = raster.points.assign(
+        mission_created_date=pd.to_datetime(raster.points["x"], unit="ms"),
+        response_time=raster.points["y"],
+        mission_type_en=labels[raster.points["code"]]
+    )
+
+    detail = "every mission" if raster.grid is None else f"binned {raster.grid[0]}×{raster.grid[1]}"
+    fig = px.scatter(
+        points,
+        x="mission_created_date",
+        y="response_time",
+        color="mission_type_en",
+        size="count" if raster.grid else None,
+        size_max=12,
+        opacity=0.6,
+        render_mode="webgl",
+        hover_data={"count": ":,"},
+        labels={
+            "mission_created_date": "Mission Created",
+            "response_time": "Response Time (sec)",
+            "mission_type_en": "Emergency Classification",
+            "count": "Missions"
+        },
+        title=f"{raster.in_view:,} missions in view · {len(points):,} points ({detail})"
+    )
+
+    fig.update_layout(
+        template="plotly_dark",
+        height=620,
+        title_x=0.5,
+        dragmode="select",
+        xaxis=dict(range=list(pd.to_datetime([x0, x1], unit="ms"))),
+        yaxis=dict(range=[y0, y1]),
+        plot_bgcolor="rgba(0,0,0,0)",
+        paper_bgcolor="rgba(0,0,0,0)",
+        font=dict(color="#d6e4ff")
+    )
+    return fig
+
+
+# =========================
+# SELECTION SPACES
+# =========================
+def _single(*data):
+    return [{}]
+
+
+def _pyramid_districts(pyramid):
+    return [{"district": d} for d in districts(pyramid)]
+
+
+def _forecast_districts(pyramid, forecast):
+    return _pyramid_districts(pyramid)
+
+
+def _district_years(cube):
+    return [
+        {"district": d, "year": int(y)}
+        for d, y in product(values(cube, "district"), values(cube, "year"))
+    ]
+
+
+def _areas_by_level(rollup):
+    return [
+        {"level": level, "area": area}
+        for level in HIERARCHY
+        for area in sorted(level_rows(rollup, level)["area_name"].dropna().astype(str).unique())
+    ]
+
+
+def _rollup_years(rollup):
+    return [{"year": int(y)} for y in sorted(rollup["year"].unique())]
+
+
+def _map_views(rollup, geometry):
+    bezirke = [None] + sorted(int(b) for b in level_rows(rollup, "bezirk")["area_id"].unique())
+    return [
+        {"year": year["year"], "bezirk": b, "level": level}
+        for level in geometry["levels"]
+        for year in _rollup_years(rollup)
+        for b in bezirke
+    ]
+
+
+def _compliance_years(compliance):
+    return [{"year": int(y)} for y in sorted(compliance["year"].unique())]
+
+
+def _compliance_areas(compliance):
+    areas = compliance[compliance["level"] == "district_area"]["area_name"]
+    return [{"area": area} for area in sorted(areas.dropna().unique())]
+
+
+CHARTS = {
+    "overview_trend": Chart(overview_trend, ("pyramid",), _single),
+    "overview_mix": Chart(overview_mix, ("overview",), _single),
+    "time_patterns": Chart(time_patterns, ("pyramid",), _pyramid_districts),
+    "load_projection": Chart(load_projection, ("pyramid", "forecast"), _forecast_districts),
+    "mission_bubbles": Chart(mission_bubbles, ("cube", "sketches"), _single),
+    "chrono_heatmap": Chart(chrono_heatmap, ("cube",), _single),
+    "incident_distribution": Chart(incident_distribution, ("cube",), _district_years),
+    "capacity_workload": Chart(capacity_workload, ("rollup",), _areas_by_level),
+    "capacity_response": Chart(capacity_response, ("rollup",), _areas_by_level),
+    "neighborhood_volume": Chart(neighborhood_volume, ("rollup",), _rollup_years),
+    "compliance_lowest": Chart(compliance_lowest, ("compliance",), _compliance_years),
+    "compliance_trend": Chart(compliance_trend, ("compliance",), _compliance_areas),
+    "demand_treemap": Chart(demand_treemap, ("rollup",), _rollup_years),
+    "demand_map": Chart(demand_map, ("rollup", "geometry"), _map_views),
+}
+
+
+# =========================
+# ENTRY POINT
+# =========================
+def load_sources(chart):
+    return [SOURCES[name]() for name in chart.sources]
+
+
+def selections(name):
+    """Every selection a page can make for chart ``name``."""
+    chart = CHARTS[name]
+    return chart.selections(*load_sources(chart))
+
+
+def figure(name, **selection):
+    """The figure of chart ``name`` for ``selection``, cached by data version."""
+    chart = CHARTS[name]
+    data = load_sources(chart)
+    return cached_figure(name, selection, data_version(*data), lambda: chart.build(*data, **selection))
@@ -0,0 +1,131 @@
+"""Time-goal compliance of every regional area and year.
+
+The regional file reports, per area and year, how many critical EMS and fire
+missions had a computable time goal (``*_timegoal_computed``) and how many
+reached it (``*_timegoal_reached``). This module turns them into reached /
+computed rates, year-over-year deltas and per-year rankings for every area of
+every level (district area, planning room, prediction area) in one set of
+column operations, and keeps the result as a shared snapshot next to the
+regional one so pages only slice it.
+
+    python -m bf_data compliance [--year 2024]
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from .paths import COMPLIANCE_SNAPSHOT, REGIONAL_CSV
+from .regional import load_regional
+from .shared import build_lock, is_stale, open_shared, write_snapshot
+
+# level -> (id column, name column); every regional row belongs to one level.
+LEVELS = {
+    "district_area": ("district_area_id", "district_area_name"),
+    "planning_room": ("planning_room_id", "planning_room_name"),
+    "prediction_area": ("prediction_area_id", "prediction_area_name"),
+}
+
+SERVICES = ["ems_critical", "fire"]
+
+
+# =========================
+# BUILD
+# =========================
+def compute_compliance(regional):
+    """One row per (level, area, year) with rates, deltas and ranks.
+
+    For each service in :data:`SERVICES` the columns are ``<s>_computed``,
+    ``<s>_reached``, ``<s>_rate`` (reached / computed, NaN without computed
+    missions), ``<s>_rate_delta`` (change against the area's previous year,
+    in rate points) and ``<s>_rank`` (1 = best rate of its level and year).
+    """
+    id_cols = [id_col for id_col, _ in LEVELS.values()]
+    has_id = [regional[id_col].notna().to_numpy() for id_col in id_cols]
+
+    out = pd.DataFrame({
+        "level": pd.Categorical(np.select(has_id, list(LEVELS), default=None), categories=list(LEVELS)),
+        "area_id": np.select(has_id, [regional[c].to_numpy(dtype="float64") for c in id_cols], default=np.nan),
+        "area_name": np.select(
+            has_id, [regional[name].to_numpy(dtype=object) for _, name in LEVELS.values()], default=None
+        ),
+        "year": regional["source_year"].astype("int16").to_numpy(),
+        "missions": regional["mission_count_all"].to_numpy(),
+    })
+    out = out[out["level"].notna()].astype({"area_id": "int64"})
+
+    for service in SERVICES:
+        computed = regional.loc[out.index, f"mission_count_{service}_timegoal_computed"].astype("float64")
+        reached = regional.loc[out.index, f"mission_count_{service}_timegoal_reached"].astype("float64")
+        out[f"{service}_computed"] = computed.to_numpy()
+        out[f"{service}_reached"] = reached.to_numpy()
+        out[f"{service}_rate"] = (reached / computed.where(computed > 0)).to_numpy()
+
+    out = out.sort_values(["level", "area_id", "year"], ignore_index=True)
+    areas = out.groupby(["level", "area_id"], observed=True, sort=False)
+    years = out.groupby(["level", "year"], observed=True, sort=False)
+
+    # Only a directly preceding year counts as "previous".
+    consecutive = areas["year"].diff() == 1
+    for service in SERVICES:
+        rate = f"{service}_rate"
+        out[f"{service}_rate_delta"] = areas[rate].diff().where(consecutive)
+        out[f"{service}_rank"] = years[rate].rank(ascending=False, method="min").astype("Int16")
+
+    return out
+
+
+def load_compliance(csv_path=REGIONAL_CSV, snapshot=COMPLIANCE_SNAPSHOT):
+    """Compliance table as a read-only frame shared across sessions.
+
+    Recomputed only when the regional CSV is newer than the snapshot.
+    """
+    with build_lock(snapshot):
+        if is_stale(snapshot, csv_path):
+            table = compute_compliance(load_regional(csv_path))
+            write_snapshot(pa.Table.from_pandas(table, preserve_index=False), snapshot)
+
+    return open_shared(snapshot).frame
+
+
+# =========================
+# QUERY
+# =========================
+def citywide(compliance, level="district_area"):
+    """Berlin-wide rates per year, pooled over the areas of one ``level``."""
+    counts = [f"{service}_{kind}" for service in SERVICES for kind in ("computed", "reached")]
+    rows = compliance[compliance["level"] == level]
+    sums = rows.groupby("year", as_index=False)[counts].sum()
+    consecutive = sums["year"].diff() == 1
+    for service in SERVICES:
+        computed = sums[f"{service}_computed"]
+        sums[f"{service}_rate"] = sums[f"{service}_reached"] / computed.where(computed > 0)
+        sums[f"{service}_rate_delta"] = sums[f"{service}_rate"].diff().where(consecutive)
+    return sums
+
+
+def ranking(compliance, year, service="ems_critical", level="district_area"):
+    """Areas of ``level`` in ``year`` ordered from best to worst ``service`` rate."""
+    rows = compliance[(compliance["level"] == level) & (compliance["year"] == year)]
+    return rows.sort_values([f"{service}_rank", "area_name"], na_position="last")
+
+
+# =========================
+# CLI
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m bf_data compliance",
+        description="Compute time-goal compliance for every regional area and year."
+    )
+    parser.add_argument("--csv", default=REGIONAL_CSV)
+    parser.add_argument("--year", type=int, help="print the district-area ranking of this year")
+    args = parser.parse_args(argv)
+
+    compliance = compute_compliance(pd.read_csv(args.csv, low_memory=False))
+    print(citywide(compliance).to_string(index=False))
+    if args.year:
+        columns = ["area_name", "ems_critical_rate", "ems_critical_rate_delta", "ems_critical_rank"]
+        print(ranking(compliance, args.year)[columns].to_string(index=False))
@@ -0,0 +1,127 @@
+"""CSV reader benchmark.
+
+Times every way the mission CSV can be parsed into cleaned frames, on the
+real file and on synthetic files of growing size (see :mod:`bf_data.synth`):
+
+* ``pandas`` - ``pd.read_csv(parse_dates=[...])`` in one go, the original
+  page loader
+* ``pandas_chunks`` - :func:`~bf_data.store.read_csv_chunks`, the previous
+  store / ingest path
+* ``arrow`` - :func:`~bf_data.store.read_csv_arrow` on Arrow's thread pool
+* ``arrow_1`` - the same reader pinned to one thread, to show how much of
+  its lead is parallelism and how much is vectorized parsing
+
+and reports rows/s and MB/s per reader and file.
+
+    python -m bf_data csvbench --synthetic 2.6M 26M
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+
+from .bench import _git_commit
+from .paths import MISSIONS_CSV, STORE_DIR
+from .schema import DATE_COLUMN
+from .store import read_csv_arrow, read_csv_chunks
+from .synth import parse_count, write_csv
+
+
+def _consume(chunks):
+    return sum(len(chunk) for chunk in chunks)
+
+
+READERS = {
+    "pandas": lambda path: len(pd.read_csv(path, parse_dates=[DATE_COLUMN], low_memory=False)),
+    "pandas_chunks": lambda path: _consume(read_csv_chunks(path)),
+    "arrow": lambda path: _consume(read_csv_arrow(path)),
+    "arrow_1": lambda path: _consume(read_csv_arrow(path, use_threads=False)),
+}
+
+
+def time_readers(path, readers=READERS):
+    """Rows, seconds, rows/s and MB/s of each reader on the CSV at ``path``."""
+    mb = Path(path).stat().st_size / (1 << 20)
+    results = {}
+    for name, read in readers.items():
+        start = time.perf_counter()
+        rows = read(path)
+        seconds = time.perf_counter() - start
+        results[name] = {
+            "rows": rows,
+            "seconds": seconds,
+            "rows_per_s": rows / seconds,
+            "mb_per_s": mb / seconds,
+        }
+    return {"path": str(path), "mb": mb, "readers": results}
+
+
+def run_suite(csv_path=MISSIONS_CSV, synthetic=(), readers=READERS):
+    report = {
+        "commit": _git_commit(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pyarrow": pa.__version__,
+        "cpus": os.cpu_count(),
+        "arrow_threads": pa.cpu_count(),
+        "files": [],
+    }
+    if csv_path and Path(csv_path).exists():
+        report["files"].append(time_readers(csv_path, readers))
+
+    root = Path(tempfile.mkdtemp(prefix="bf-csvbench-"))
+    try:
+        for rows in synthetic:
+            path = root / f"missions_{rows}.csv"
+            write_csv(path, rows)
+            report["files"].append({"synthetic_rows": rows, **time_readers(path, readers)})
+            path.unlink()
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    return report
+
+
+def _print_summary(report):
+    print(f"{report['cpus']} cpus, {report['arrow_threads']} Arrow threads")
+    for entry in report["files"]:
+        baseline = entry["readers"].get("pandas_chunks")
+        print(f"\n{entry['path']} ({entry['mb']:.0f} MB)")
+        for name, result in entry["readers"].items():
+            speedup = f"  x{baseline['seconds'] / result['seconds']:.1f}" if baseline else ""
+            print(f"  {name:14s} {result['seconds']:7.2f}s  {result['rows_per_s']:>12,.0f} rows/s  "
+                  f"{result['mb_per_s']:7.1f} MB/s{speedup}")
+
+
+# =========================
+# CLI
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m bf_data csvbench",
+        description="Compare CSV reader throughput on the mission file and synthetic files."
+    )
+    parser.add_argument("--csv", default=MISSIONS_CSV)
+    parser.add_argument("--synthetic", type=parse_count, nargs="*", default=[], metavar="ROWS",
+                        help="also benchmark generated files of these sizes")
+    parser.add_argument("--readers", nargs="+", choices=list(READERS), default=list(READERS))
+    parser.add_argument("--out", default=None, help="JSON file (default: <store>/bench/csv-<commit>.json)")
+    args = parser.parse_args(argv)
+
+    readers = {name: READERS[name] for name in args.readers}
+    report = run_suite(args.csv, args.synthetic, readers)
+
+    out = Path(args.out) if args.out else STORE_DIR / "bench" / f"csv-{(report['commit'] or 'local')[:12]}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2))
+
+    _print_summary(report)
+    print(f"\nWrote {out}")
+    return 0
@@ -0,0 +1,287 @@
+"""Pre-aggregated mission cube.
+
+One row per (year, month, district, mission_type, weekday, hour) cell with
+additive measures: the number of missions plus count, sum and sum of squares
+of the usable response times (see :mod:`bf_data.quality`). Every chart on the mission pages is a
+roll-up of these cells, so pages never group the raw rows themselves.
+
+Cells are stored sorted by (district, year), so the district and
+district/year selections of the pages are contiguous runs found through an
+offset table (:func:`cube_index`) instead of a mask over the whole cube.
+
+    python -m bf_data cube
+"""
+
+import argparse
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from .calendar_features import add_calendar
+from .labels import observed
+from .paths import CUBE_PATH, MISSIONS_DIR
+from .quality import response_times
+from .shared import build_lock, dataset_of, is_stale, open_shared, temp_path, write_snapshot
+from .store import missions_dataset, watermark_path
+from .streaming import store_batches
+
+DIMENSIONS = ["year", "month", "district", "mission_type", "weekday", "hour"]
+MEASURES = ["count", "rt_count", "rt_sum", "rt_sumsq"]
+INDEX_KEYS = ["district", "year"]
+SORT_ORDER = INDEX_KEYS + [d for d in DIMENSIONS if d not in INDEX_KEYS]
+
+SOURCE_COLUMNS = [
+    "year",
+    "month",
+    "weekday",
+    "hour",
+    "mission_type",
+    "mission_location_district",
+    "response_time",
+    "quality",
+]
+
+
+# =========================
+# BUILD
+# =========================
+def aggregate(df):
+    """Aggregate raw mission rows into cube cells.
+
+    Uses the stored integer calendar columns; rows that only carry
+    ``mission_created_date`` (e.g. a fresh CSV drop) get them derived first.
+    """
+    if "hour" not in df.columns:
+        df = add_calendar(df)
+    if "year" not in df.columns:
+        df = df.assign(year=df["mission_created_date"].dt.year)
+
+    rt = response_times(df)
+
+    cells = pd.DataFrame({
+        "year": df["year"].astype("int16"),
+        "month": df["month"].astype("int8"),
+        "district": df["mission_location_district"],
+        "mission_type": df["mission_type"],
+        "weekday": df["weekday"].astype("int8"),
+        "hour": df["hour"].astype("int8"),
+        "rt": rt,
+        "rt_sq": rt * rt,
+    })
+
+    return (
+        cells.groupby(DIMENSIONS, dropna=False, observed=True)
+        .agg(
+            count=("rt", "size"),
+            rt_count=("rt", "count"),
+            rt_sum=("rt", "sum"),
+            rt_sumsq=("rt_sq", "sum")
+        )
+        .reset_index()
+    )
+
+
+def _fold(parts):
+    """Sum partial cell frames into one frame with unique cells."""
+    return (
+        pd.concat(parts, ignore_index=True)
+        .astype({"district": object, "mission_type": object})
+        .groupby(DIMENSIONS, dropna=False, observed=True)[MEASURES].sum()
+        .reset_index()
+    )
+
+
+def build_cube(missions_dir=MISSIONS_DIR, cube_path=CUBE_PATH, batch_size=1_000_000):
+    """Rebuild the cube from the mission store in one streaming pass.
+
+    Each record batch is aggregated on its own and the partial cells are
+    folded together whenever they pile up, so memory is bounded by the
+    number of cells, not by the number of mission rows.
+    """
+    # Stores written before the calendar columns existed only have the timestamp.
+    names = missions_dataset(missions_dir).schema.names
+    columns = [c for c in SOURCE_COLUMNS if c in names]
+    if "hour" not in names:
+        columns.append("mission_created_date")
+
+    parts = []
+    pending = 0
+    for batch in store_batches(columns, missions_dir, batch_size):
+        cells = aggregate(batch.to_pandas())
+        parts.append(cells)
+        pending += len(cells)
+        if pending > 4 * batch_size:
+            parts = [_fold(parts)]
+            pending = len(parts[0])
+
+    cube = _fold(parts).astype({"district": "category", "mission_type": "category"})
+    save_cube(cube, cube_path)
+    return cube
+
+
+def merge(cube, cells):
+    """Add freshly aggregated ``cells`` into ``cube``.
+
+    Only the (year, month) slices that ``cells`` touch are re-grouped; every
+    other cell is carried over untouched.
+    """
+    touched = cells[["year", "month"]].drop_duplicates()
+    hit = (
+        cube[["year", "month"]]
+        .merge(touched.assign(_hit=True), on=["year", "month"], how="left")["_hit"]
+        .fillna(False)
+        .to_numpy(dtype=bool)
+    )
+
+    updated = _fold([cube[hit], cells])
+
+    merged = pd.concat(
+        [cube[~hit].astype({"district": object, "mission_type": object}), updated],
+        ignore_index=True
+    )
+    return merged.astype({"district": "category", "mission_type": "category"})
+
+
+def save_cube(cube, cube_path=CUBE_PATH):
+    """Write ``cube`` sorted by :data:`SORT_ORDER`, atomically."""
+    cube_path = Path(cube_path)
+    tmp_path = temp_path(cube_path)
+    cube = cube.sort_values(SORT_ORDER, kind="stable", na_position="last", ignore_index=True)
+    cube.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, cube_path)
+
+
+# =========================
+# LOAD
+# =========================
+def load_cube(cube_path=CUBE_PATH, missions_dir=MISSIONS_DIR):
+    """Return the cube, rebuilding it if the mission store is newer.
+
+    The cube is served from a memory-mapped Arrow snapshot shared by every
+    page and session in the process (see :mod:`bf_data.shared`); the frame
+    is read-only, use :func:`query` to derive chart data.
+    """
+    cube_path = Path(cube_path)
+    source = watermark_path(missions_dir)
+    if not source.exists():
+        source = Path(missions_dir)
+
+    snapshot = cube_path.with_suffix(".arrow")
+    with build_lock(cube_path):
+        if is_stale(cube_path, source):
+            build_cube(missions_dir, cube_path)
+
+        if is_stale(snapshot, cube_path):
+            # Cubes saved before the (district, year) ordering get sorted here.
+            write_snapshot(pq.read_table(cube_path), snapshot, sort_by=SORT_ORDER)
+
+    return open_shared(snapshot).frame
+
+
+# =========================
+# QUERY
+# =========================
+def add_stats(df):
+    """Add ``rt_mean`` and ``rt_std`` derived from the additive measures."""
+    df = df.copy()
+    n = df["rt_count"].where(df["rt_count"] > 0)
+
+    df["rt_mean"] = df["rt_sum"] / n
+    var = (df["rt_sumsq"] - df["rt_sum"] ** 2 / n) / (n - 1)
+    df["rt_std"] = np.sqrt(var.clip(lower=0))
+    return df
+
+
+def cube_index(cube):
+    """The (district, year) :class:`~bf_data.index.SliceIndex` of a shared cube.
+
+    Works for any shared frame stored sorted by :data:`INDEX_KEYS` (the cube,
+    the response-time sketches). Returns ``None`` for other frames (e.g. a
+    filtered copy), which callers treat as "mask instead".
+    """
+    dataset = dataset_of(cube)
+    if dataset is None or not set(INDEX_KEYS) <= set(cube.columns):
+        return None
+    index = dataset.index(INDEX_KEYS)
+    return index if index.sorted else None
+
+
+def values(cube, column):
+    """Sorted distinct non-null values of an index column, for selectboxes."""
+    index = cube_index(cube)
+    if index is not None and column in INDEX_KEYS:
+        return sorted(index.labels(column))
+    if isinstance(cube[column].dtype, pd.CategoricalDtype):
+        return sorted(observed(cube[column]))
+    return sorted(cube[column].dropna().unique())
+
+
+def select(cube, **filters):
+    """Rows of ``cube`` matching equality / membership ``filters``.
+
+    Scalar ``district`` / ``year`` filters on a shared frame are answered
+    from the offset table, so their cost is the size of the selection.
+    """
+    sub = cube
+    index = cube_index(cube)
+    sliced = {
+        key: filters.pop(key) for key in INDEX_KEYS
+        if index is not None and key in filters
+        and not isinstance(filters[key], (list, tuple, set))
+    }
+    if sliced:
+        sub = index.take(cube, **sliced)
+
+    if filters:
+        mask = np.ones(len(sub), dtype=bool)
+        for col, value in filters.items():
+            if isinstance(value, (list, tuple, set)):
+                mask &= sub[col].isin(list(value)).to_numpy()
+            else:
+                mask &= (sub[col] == value).to_numpy()
+        sub = sub[mask]
+    return sub
+
+
+def query(cube, by, **filters):
+    """Roll the cube up to ``by`` after equality / membership ``filters``.
+
+    >>> query(cube, ["year"], district="MITTE")
+    """
+    out = select(cube, **filters).groupby(by, as_index=False, observed=True)[MEASURES].sum()
+    return add_stats(out)
+
+
+def totals(cube):
+    """Grand totals over the whole cube as a dict."""
+    sums = cube[MEASURES].sum()
+    n = sums["rt_count"]
+    return {
+        "count": int(sums["count"]),
+        "rt_count": int(n),
+        "rt_mean": sums["rt_sum"] / n if n else float("nan"),
+    }
+
+
+# =========================
+# CLI
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m bf_data cube",
+        description="Rebuild the pre-aggregated mission cube."
+    )
+    parser.add_argument("--missions", default=MISSIONS_DIR)
+    parser.add_argument("--out", default=CUBE_PATH)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    cube = build_cube(args.missions, args.out)
+    elapsed = time.perf_counter() - start
+
+    print(f"Wrote {len(cube):,} cells ({int(cube['count'].sum()):,} missions) "
+          f"to {args.out} in {elapsed:.1f}s")
@@ -0,0 +1,80 @@
+"""Server-side decimation of large scatter plots.
+
+Sending every mission to the browser does not scale: a few hundred thousand
+markers already make Plotly sluggish, millions hang the tab. Instead the
+points inside the current view are rasterized, datashader-style: every
+(group, x-bin, y-bin) cell of a pixel-sized grid becomes a single point at
+the centroid of its missions, carrying their count. Neighbouring cells are
+merged pairwise until at most ``budget`` of them are non-empty, so the
+payload is bounded whatever the row count, and zooming in re-bins only the
+rows of the new view at a finer effective resolution. Views with fewer rows than the
+budget are returned as they are.
+
+One pass of three ``np.bincount`` calls builds the finest grid; the coarser
+levels are pairwise sums of it.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_BUDGET = 20_000
+
+# Finest grid, roughly the pixel size of a wide chart.
+GRID = (1024, 512)
+
+Raster = namedtuple("Raster", ["points", "in_view", "grid"])
+
+
+def _halve(cells, axis):
+    """Merge neighbouring pairs of ``(groups, ny, nx)`` cells along ``axis``."""
+    shape = list(cells.shape)
+    shape[axis:axis + 1] = [shape[axis] // 2, 2]
+    return cells.reshape(shape).sum(axis=axis + 1)
+
+
+def rasterize(x, y, codes, x_range, y_range, budget=DEFAULT_BUDGET, grid=GRID):
+    """Decimate the points of ``x_range`` x ``y_range`` to at most ``budget``.
+
+    ``codes`` are non-negative group codes (e.g. ``Categorical.codes``);
+    rows with a negative code or a non-finite coordinate are dropped.
+
+    Returns a :class:`Raster`: ``points`` (a frame of ``code``, ``x``, ``y``,
+    ``count``), ``in_view`` (rows inside the view) and ``grid`` (the
+    ``(nx, ny)`` the points were binned at, ``None`` for raw points).
+    """
+    x = np.asarray(x, dtype="float64")
+    y = np.asarray(y, dtype="float64")
+    codes = np.asarray(codes)
+    (x0, x1), (y0, y1) = x_range, y_range
+
+    inside = (codes >= 0) & (x >= x0) & (x <= x1) & (y >= y0) & (y <= y1)
+    x, y, codes = x[inside], y[inside], codes[inside].astype("int64")
+    in_view = len(x)
+
+    if in_view <= budget:
+        points = pd.DataFrame({"code": codes, "x": x, "y": y, "count": np.ones(in_view, dtype="int64")})
+        return Raster(points, in_view, None)
+
+    nx, ny = grid
+    groups = int(codes.max()) + 1
+    ix = np.minimum(((x - x0) / max(x1 - x0, 1e-12) * nx).astype("int64"), nx - 1)
+    iy = np.minimum(((y - y0) / max(y1 - y0, 1e-12) * ny).astype("int64"), ny - 1)
+    cell = (codes * ny + iy) * nx + ix
+
+    size = groups * ny * nx
+    count = np.bincount(cell, minlength=size).reshape(groups, ny, nx)
+    sum_x = np.bincount(cell, weights=x, minlength=size).reshape(groups, ny, nx)
+    sum_y = np.bincount(cell, weights=y, minlength=size).reshape(groups, ny, nx)
+
+    # Halve the wider side until the non-empty cells fit the budget.
+    while np.count_nonzero(count) > budget and count.shape[2] > 1:
+        axis = 2 if count.shape[2] >= count.shape[1] else 1
+        count, sum_x, sum_y = (_halve(a, axis) for a in (count, sum_x, sum_y))
+
+    code, _, _ = np.nonzero(count)
+    filled = count > 0
+    n = count[filled]
+    points = pd.DataFrame({"code": code, "x": sum_x[filled] / n, "y": sum_y[filled] / n, "count": n})
+    return Raster(points, in_view, (count.shape[2], count.shape[1]))
@@ -0,0 +1,169 @@
+"""Process-wide LRU cache of serialized Plotly figures.
+
+Every rerun of a page rebuilds its ``plotly.express`` figures and Streamlit
+re-validates and re-serializes them, even when the selection has not
+changed. Pages wrap figure construction in a builder and call
+:func:`cached_figure` with the page, the selection and the version of the
+data it was built from; the first call stores the figure JSON and later
+calls rebuild a lightweight, unvalidated figure from it instead of running
+the builder.
+
+The cache is bounded by the total size of the stored JSON
+(``BF_FIGURE_CACHE_MB``, default 64) and evicts the least recently used
+figures first. A new data version (an ingest, a rebuilt cube) changes the
+key, so stale figures age out instead of being served.
+
+Behind the LRU sits the prerendered figure store (``FIGURE_DIR``): one
+memory-mapped Arrow file per chart and data version, holding the JSON of
+every selection, written by ``python -m bf_data prerender``. A miss in the
+LRU that the store can answer costs a dictionary lookup instead of a build.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from .paths import FIGURE_DIR
+from .shared import dataset_of, open_shared
+
+DEFAULT_MAX_BYTES = int(float(os.environ.get("BF_FIGURE_CACHE_MB", 64)) * (1 << 20))
+
+
+class FigureCache:
+    """Thread-safe LRU of serialized figures, bounded by bytes."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._specs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._specs)
+
+    def get(self, key):
+        with self._lock:
+            spec = self._specs.get(key)
+            if spec is None:
+                self.misses += 1
+                return None
+            self._specs.move_to_end(key)
+            self.hits += 1
+            return spec
+
+    def put(self, key, spec):
+        size = len(spec)
+        with self._lock:
+            old = self._specs.pop(key, None)
+            if old is not None:
+                self.nbytes -= len(old)
+            if size > self.max_bytes:
+                return
+            self._specs[key] = spec
+            self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                _, evicted = self._specs.popitem(last=False)
+                self.nbytes -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._specs.clear()
+            self.nbytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "figures": len(self._specs),
+                "nbytes": self.nbytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+figure_cache = FigureCache()
+
+
+def data_version(*sources):
+    """Version key of the data behind a figure.
+
+    Shared frames contribute their file version, result dicts (e.g.
+    :func:`~bf_data.load_overview`) their ``"version"`` entry.
+    """
+    version = []
+    for source in sources:
+        dataset = dataset_of(source) if hasattr(source, "columns") else None
+        if dataset is not None:
+            version.append((dataset.path.name, dataset.version))
+        elif isinstance(source, dict):
+            version.append(source.get("version"))
+        else:
+            raise TypeError(f"cannot derive a data version from {type(source).__name__}")
+    return tuple(version)
+
+
+def _selection_key(selection):
+    if isinstance(selection, dict):
+        return tuple(sorted((k, _selection_key(v)) for k, v in selection.items()))
+    if isinstance(selection, (list, tuple, set)):
+        return tuple(_selection_key(v) for v in selection)
+    return selection.item() if hasattr(selection, "item") else selection
+
+
+def figure_key(page, selection, version):
+    return (page, _selection_key(selection), version)
+
+
+# =========================
+# PRERENDERED STORE
+# =========================
+def selection_id(selection):
+    """Stable text form of a selection, as stored in the figure store."""
+    return json.dumps(_selection_key(selection))
+
+
+def store_path(page, version, figure_dir=FIGURE_DIR):
+    """Figure store file of ``page`` for one data version."""
+    digest = hashlib.sha1(repr(version).encode()).hexdigest()[:12]
+    return Path(figure_dir) / f"{page}-{digest}.arrow"
+
+
+def prerendered(page, selection, version, figure_dir=FIGURE_DIR):
+    """Stored JSON of this figure, or ``None`` if it was not prerendered."""
+    path = store_path(page, version, figure_dir)
+    if not path.exists():
+        return None
+
+    store = open_shared(path)
+    rows = store.derived(
+        "selections",
+        lambda: {sel: row for row, sel in enumerate(store.table["selection"].to_pylist())},
+    )
+    row = rows.get(selection_id(selection))
+    return None if row is None else store.table["spec"][row].as_py()
+
+
+def cached_figure(page, selection, version, build, cache=figure_cache, figure_dir=FIGURE_DIR):
+    """The figure ``build()`` returns for this page / selection / data version.
+
+    Looked up in ``cache``, then in the prerendered store, and only built
+    when neither has it. The stored JSON is turned back into a figure
+    without validation, which skips both the ``plotly.express`` call and
+    plotly's validators; :func:`st.plotly_chart` accepts it as is.
+    """
+    key = figure_key(page, selection, version)
+    spec = cache.get(key)
+    if spec is None:
+        spec = prerendered(page, selection, version, figure_dir)
+        if spec is None:
+            spec = pio.to_json(build(), validate=False).encode()
+        cache.put(key, spec)
+    return go.Figure(json.loads(spec), _validate=False)
@@ -0,0 +1,461 @@
+"""LOR area geometry for the choropleth maps.
+
+The area outlines come from a local GeoJSON export of the LOR (WGS84, one
+feature per area; see :data:`~bf_data.paths.GEOMETRY_FILES`), which
+``--fetch`` downloads from Berlin's geodata service into ``geo/``. At full
+resolution the ~140 district areas or ~540 planning rooms are several MB of
+coordinates, far more than a map of Berlin can show, so they are simplified
+per zoom level before they are sent to the browser.
+
+Simplifying every polygon on its own would open slivers between
+neighbours, because each side of a shared border would be thinned
+differently. Instead the rings are first cut into arcs, TopoJSON style: a
+ring is cut wherever the set of rings sharing its edges changes and where
+three or more rings meet, so every border between two areas becomes one
+arc used by both of them. Each arc is simplified once (Douglas-Peucker)
+and the rings are reassembled from the simplified arcs, which keeps
+neighbours seamless at every zoom.
+
+The simplified FeatureCollection of each (level, zoom) is written,
+already serialized and rounded to :data:`PRECISION` decimals, to
+``<store>/geometry/`` and kept per process, so a map costs a dictionary
+lookup after the first build.
+
+    python -m bf_data geometry [--level district_area] [--fetch]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.parse
+import urllib.request
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import numpy as np
+
+from .paths import GEOMETRY_FILES, STORE_DIR
+from .rollup import HIERARCHY
+from .shared import build_lock, temp_path
+
+# zoom -> Douglas-Peucker tolerance in degrees of latitude (1e-4 is ~11 m),
+# about a pixel of a map of all of Berlin / of one Bezirk, whatever level.
+ZOOMS = {
+    "city": 4e-4,
+    "bezirk": 1e-4,
+}
+
+# Decimals kept in the serialized coordinates (1e-5 deg is about a metre).
+PRECISION = 5
+
+# Grid that decides whether two vertices are the same point.
+QUANTUM = 1e-7
+
+# Property that holds the area id, per level; the first one present wins.
+ID_PROPERTIES = {
+    "district_area": ["district_area_id", "BZR_ID", "bzr_id"],
+    "planning_room": ["planning_room_id", "PLR_ID", "plr_id"],
+}
+
+GEOMETRY_DIR = STORE_DIR / "geometry"
+
+# WFS of the LOR 2021 layers, and the token of each level's feature type.
+WFS_URL = "https://gdi.berlin.de/services/wfs/lor_2021"
+WFS_LAYERS = {"district_area": "bzr", "planning_room": "plr"}
+
+_cache = {}
+_lock = threading.Lock()
+
+
+# =========================
+# READ
+# =========================
+def _area_id(properties, level):
+    for name in ID_PROPERTIES[level]:
+        if properties.get(name) not in (None, ""):
+            return int(properties[name])
+    raise ValueError(f"feature without any of {ID_PROPERTIES[level]}: {sorted(properties)}")
+
+
+def _ring(coords):
+    ring = np.asarray(coords, dtype="float64")[:, :2]
+    if len(ring) > 1 and np.array_equal(ring[0], ring[-1]):
+        ring = ring[:-1]
+    return ring
+
+
+def read_areas(path, level="district_area"):
+    """``[(area_id, [[outer, *holes], ...])]`` of the polygons in a GeoJSON file.
+
+    Rings are ``(n, 2)`` lon / lat arrays without the closing vertex.
+    """
+    collection = json.loads(Path(path).read_text(encoding="utf-8"))
+    areas = []
+    for feature in collection["features"]:
+        geometry = feature.get("geometry")
+        if geometry is None:
+            continue
+        if geometry["type"] == "Polygon":
+            parts = [geometry["coordinates"]]
+        elif geometry["type"] == "MultiPolygon":
+            parts = geometry["coordinates"]
+        else:
+            raise ValueError(f"unsupported geometry type {geometry['type']!r}")
+
+        polygons = [[_ring(ring) for ring in polygon] for polygon in parts]
+        lon, lat = np.concatenate([ring for polygon in polygons for ring in polygon]).T
+        if np.abs(lon).max() > 180 or np.abs(lat).max() > 90:
+            raise ValueError(
+                f"{path} is not in WGS84 longitude / latitude; "
+                "reproject it first, e.g. `ogr2ogr -t_srs EPSG:4326 out.geojson in.shp`"
+            )
+        areas.append((_area_id(feature.get("properties") or {}, level), polygons))
+    return areas
+
+
+# =========================
+# TOPOLOGY
+# =========================
+def _keys(ring):
+    q = np.round(ring / QUANTUM).astype("int64")
+    return q[:, 0] * 4_000_000_000 + q[:, 1]
+
+
+def build_topology(areas):
+    """Cut every ring into arcs shared between neighbouring rings.
+
+    Returns ``(arcs, shapes)``: ``arcs`` is a list of ``(n, 2)`` arrays,
+    ``shapes`` mirrors ``areas`` with every ring as a list of
+    ``(arc, reversed)`` references.
+    """
+    rings = []
+    coords = {}
+    for _, polygons in areas:
+        for polygon in polygons:
+            for ring in polygon:
+                keys = _keys(ring)
+                keep = np.r_[True, keys[1:] != keys[:-1]]
+                keys, ring = keys[keep], ring[keep]
+                rings.append(keys)
+                for key, point in zip(keys.tolist(), ring):
+                    coords.setdefault(key, point)
+
+    # Rings on each vertex and on each (undirected) edge.
+    owners = {}
+    edge_owners = {}
+    for r, keys in enumerate(rings):
+        keys = keys.tolist()
+        for key, after in zip(keys, keys[1:] + keys[:1]):
+            owners.setdefault(key, set()).add(r)
+            edge_owners.setdefault((min(key, after), max(key, after)), set()).add(r)
+
+    arcs = []
+    arc_index = {}
+
+    def add_arc(keys):
+        keys = tuple(keys)
+        backward = keys[::-1]
+        canonical = min(keys, backward)
+        if canonical not in arc_index:
+            arc_index[canonical] = len(arcs)
+            arcs.append(np.array([coords[key] for key in canonical]))
+        return arc_index[canonical], keys != canonical
+
+    ring_arcs = []
+    for keys in rings:
+        keys = keys.tolist()
+        n = len(keys)
+        # The rings along each edge; a new set of neighbours, or a vertex
+        # where three or more rings meet, starts a new arc.
+        sides = [edge_owners[min(key, after), max(key, after)] for key, after in zip(keys, keys[1:] + keys[:1])]
+        cuts = [i for i in range(n) if sides[i] != sides[i - 1] or len(owners[keys[i]]) > 2]
+        if not cuts:
+            # An island or an enclave: one closed arc from its smallest vertex.
+            start = keys.index(min(keys))
+            keys = keys[start:] + keys[:start]
+            ring_arcs.append([add_arc(keys + keys[:1])])
+            continue
+        keys = keys[cuts[0]:] + keys[:cuts[0]]
+        cuts = [c - cuts[0] for c in cuts] + [n]
+        ring_arcs.append([add_arc(keys[a:b + 1] + (keys[:1] if b == n else [])) for a, b in zip(cuts, cuts[1:])])
+
+    shapes = []
+    position = 0
+    for _, polygons in areas:
+        shape = []
+        for polygon in polygons:
+            shape.append(ring_arcs[position:position + len(polygon)])
+            position += len(polygon)
+        shapes.append(shape)
+    return arcs, shapes
+
+
+# =========================
+# SIMPLIFY
+# =========================
+def douglas_peucker(points, tolerance, min_points=2):
+    """Douglas-Peucker simplification of an open polyline; keeps both ends.
+
+    At least ``min_points`` points are kept, so short closed rings cannot
+    collapse. ``points`` should be in a roughly isotropic projection.
+    """
+    n = len(points)
+    keep = np.zeros(n, dtype=bool)
+    keep[[0, -1]] = True
+    kept = 2 if n > 1 else 1
+    stack = [(0, n - 1)]
+    while stack:
+        i, j = stack.pop()
+        if j <= i + 1:
+            continue
+        a, b = points[i], points[j]
+        inner = points[i + 1:j]
+        ab = b - a
+        length = np.hypot(*ab)
+        if length == 0:
+            dist = np.hypot(*(inner - a).T)
+        else:
+            dist = np.abs(ab[0] * (inner[:, 1] - a[1]) - ab[1] * (inner[:, 0] - a[0])) / length
+        k = int(dist.argmax())
+        if dist[k] > tolerance or kept < min_points:
+            keep[i + 1 + k] = True
+            kept += 1
+            stack.extend([(i, i + 1 + k), (i + 1 + k, j)])
+    return points[keep]
+
+
+def simplify(arcs, shapes, tolerance):
+    """Rings of every shape rebuilt from arcs simplified with ``tolerance``."""
+    # Rings made of one or two arcs need interior points to stay polygons.
+    min_points = np.full(len(arcs), 2)
+    for shape in shapes:
+        for polygon in shape:
+            for ring in polygon:
+                for arc, _ in ring:
+                    min_points[arc] = max(min_points[arc], {1: 4, 2: 3}.get(len(ring), 2))
+
+    lat0 = np.radians(np.mean([arc[:, 1].mean() for arc in arcs])) if arcs else 0.0
+    scale = np.array([np.cos(lat0), 1.0])
+    thin = [douglas_peucker(arc * scale, tolerance, min_points[i]) / scale for i, arc in enumerate(arcs)]
+
+    out = []
+    for shape in shapes:
+        polygons = []
+        for polygon in shape:
+            rings = []
+            for ring in polygon:
+                parts = [thin[arc][::-1] if backward else thin[arc] for arc, backward in ring]
+                coords = np.concatenate([parts[0]] + [part[1:] for part in parts[1:]])
+                if not np.array_equal(coords[0], coords[-1]):
+                    coords = np.vstack([coords, coords[:1]])
+                if len(coords) >= 4:
+                    rings.append(coords)
+            if rings:
+                polygons.append(rings)
+        out.append(polygons)
+    return out
+
+
+def _signed_area(ring):
+    x, y = ring[:, 0], ring[:, 1]
+    return 0.5 * np.sum(x[:-1] * y[1:] - x[1:] * y[:-1])
+
+
+def to_geojson(area_ids, shapes):
+    """FeatureCollection with the area id as feature ``id``.
+
+    Outer rings are wound clockwise and holes counter-clockwise, the order
+    d3-geo (and so Plotly's ``choropleth``) expects.
+    """
+    features = []
+    for area_id, polygons in zip(area_ids, shapes):
+        coordinates = []
+        for polygon in polygons:
+            rings = []
+            for depth, ring in enumerate(polygon):
+                clockwise = _signed_area(ring) < 0
+                if clockwise != (depth == 0):
+                    ring = ring[::-1]
+                rings.append(np.round(ring, PRECISION).tolist())
+            coordinates.append(rings)
+        if not coordinates:
+            continue
+        geometry = (
+            {"type": "Polygon", "coordinates": coordinates[0]} if len(coordinates) == 1
+            else {"type": "MultiPolygon", "coordinates": coordinates}
+        )
+        features.append({"type": "Feature", "id": int(area_id), "properties": {}, "geometry": geometry})
+    return {"type": "FeatureCollection", "features": features}
+
+
+# =========================
+# CACHED ENTRY POINT
+# =========================
+def geometry_path(level="district_area"):
+    if level not in GEOMETRY_FILES:
+        raise ValueError(f"no geometry for level {level!r}; expected one of {list(GEOMETRY_FILES)}")
+    for path in GEOMETRY_FILES[level]:
+        if Path(path).exists():
+            return Path(path)
+    raise FileNotFoundError(
+        f"No {level} geometry at {' or '.join(map(str, GEOMETRY_FILES[level]))}. "
+        f"Run `python -m bf_data geometry --level {level} --fetch`, or export the "
+        "LOR areas as WGS84 GeoJSON to one of these paths."
+    )
+
+
+def _version(path, zoom):
+    stat = path.stat()
+    key = repr((path.name, stat.st_size, stat.st_mtime_ns, ZOOMS[zoom], PRECISION))
+    return hashlib.sha1(key.encode()).hexdigest()[:12]
+
+
+def serialized_geometry(level="district_area", zoom="city", geometry_dir=GEOMETRY_DIR):
+    """The simplified FeatureCollection of ``level`` at ``zoom``, as JSON text."""
+    if zoom not in ZOOMS:
+        raise ValueError(f"unknown zoom {zoom!r}; expected one of {list(ZOOMS)}")
+    path = geometry_path(level)
+    cached = Path(geometry_dir) / f"{level}-{zoom}-{_version(path, zoom)}.json"
+    with build_lock(cached):
+        if cached.exists():
+            return cached.read_text()
+
+        areas = read_areas(path, level)
+        arcs, shapes = build_topology(areas)
+        text = json.dumps(
+            to_geojson([area_id for area_id, _ in areas], simplify(arcs, shapes, ZOOMS[zoom])),
+            separators=(",", ":"),
+        )
+
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = temp_path(cached)
+        tmp_path.write_text(text)
+        os.replace(tmp_path, cached)
+        for old in cached.parent.glob(f"{level}-{zoom}-*.json"):
+            if old != cached:
+                old.unlink(missing_ok=True)
+        return text
+
+
+def load_geometry(level="district_area", zoom="city"):
+    """The simplified FeatureCollection of ``level`` at ``zoom``, shared per process.
+
+    Carries a ``version`` member (source file and simplification settings)
+    for figure caching.
+    """
+    path = geometry_path(level)
+    key = (level, zoom, _version(path, zoom))
+    with _lock:
+        if key not in _cache:
+            geojson = json.loads(serialized_geometry(level, zoom))
+            geojson["version"] = key
+            _cache[key] = geojson
+        return _cache[key]
+
+
+def map_levels():
+    """Levels that have a geometry file, in :data:`GEOMETRY_FILES` order."""
+    return [level for level in GEOMETRY_FILES if any(Path(p).exists() for p in GEOMETRY_FILES[level])]
+
+
+def map_geometry():
+    """The outlines of every level with a geometry file, at every zoom.
+
+    ``{"levels": {level: {zoom: FeatureCollection}}, "version": ...}``, the
+    chart source of the maps; the version combines the outlines' versions.
+    Raises ``FileNotFoundError`` when no level has a file.
+    """
+    levels = map_levels()
+    if not levels:
+        geometry_path("district_area")
+    outlines = {level: {zoom: load_geometry(level, zoom) for zoom in ZOOMS} for level in levels}
+    version = tuple(geojson["version"] for zooms in outlines.values() for geojson in zooms.values())
+    return {"levels": outlines, "version": version}
+
+
+def bezirk_of(area_ids, level="district_area"):
+    """Bezirk number of each area id (every level up divides the id by 100)."""
+    steps = HIERARCHY.index("bezirk") - HIERARCHY.index(level)
+    return np.asarray(area_ids) // 100 ** steps
+
+
+# =========================
+# FETCH
+# =========================
+def _feature_type(token, url=WFS_URL):
+    query = urllib.parse.urlencode({"service": "WFS", "version": "2.0.0", "request": "GetCapabilities"})
+    with urllib.request.urlopen(f"{url}?{query}", timeout=60) as response:
+        capabilities = ET.parse(response)
+    names = [el.text for el in capabilities.iter() if el.tag.endswith("}Name") and el.text and token in el.text.lower()]
+    if not names:
+        raise LookupError(f"no feature type with {token!r} in its name at {url}")
+    return names[0]
+
+
+def _lon_lat(collection):
+    # WFS 2.0 may answer EPSG:4326 in latitude / longitude order; in Berlin
+    # the latitude (~52.5) is always the larger of the two.
+    def swap(coords):
+        if isinstance(coords[0], (int, float)):
+            return [coords[1], coords[0], *coords[2:]]
+        return [swap(c) for c in coords]
+
+    first = collection["features"][0]["geometry"]["coordinates"]
+    while not isinstance(first[0], (int, float)):
+        first = first[0]
+    if first[0] > first[1]:
+        for feature in collection["features"]:
+            feature["geometry"]["coordinates"] = swap(feature["geometry"]["coordinates"])
+    return collection
+
+
+def fetch_geometry(level="district_area", url=WFS_URL):
+    """Download the LOR areas of ``level`` as WGS84 GeoJSON to its ``geo/`` path."""
+    query = urllib.parse.urlencode({
+        "service": "WFS",
+        "version": "2.0.0",
+        "request": "GetFeature",
+        "typeNames": _feature_type(WFS_LAYERS[level], url),
+        "outputFormat": "application/json",
+        "srsName": "EPSG:4326",
+    })
+    with urllib.request.urlopen(f"{url}?{query}", timeout=300) as response:
+        collection = _lon_lat(json.loads(response.read()))
+
+    out = Path(GEOMETRY_FILES[level][-1])
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = temp_path(out)
+    tmp_path.write_text(json.dumps(collection, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp_path, out)
+    return out
+
+
+# =========================
+# CLI
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m bf_data geometry",
+        description="Simplify the LOR geometry for every zoom level and report payload sizes."
+    )
+    parser.add_argument("--level", choices=list(GEOMETRY_FILES), default="district_area")
+    parser.add_argument("--fetch", action="store_true", help=f"download the level from {WFS_URL} first")
+    args = parser.parse_args(argv)
+
+    if args.fetch:
+        print(f"Wrote {fetch_geometry(args.level)}")
+    path = geometry_path(args.level)
+    areas = read_areas(path, args.level)
+    arcs, shapes = build_topology(areas)
+    vertices = sum(len(arc) for arc in arcs)
+    print(f"{path}: {len(areas)} areas, {len(arcs):,} arcs, {vertices:,} vertices, "
+          f"{path.stat().st_size / 1e6:.2f} MB")
+
+    for zoom in ZOOMS:
+        start = time.perf_counter()
+        text = serialized_geometry(args.level, zoom)
+        elapsed = time.perf_counter() - start
+        print(f"  {zoom:8s} {len(text) / 1e3:9.1f} kB  {elapsed:6.2f}s")
@@ -0,0 +1,96 @@
+"""Offset tables over frames that are physically sorted by their keys.
+
+When rows are sorted by (district, year), every district - and every
+(district, year) pair inside it - is one contiguous run of rows. A
+:class:`SliceIndex` records where each run starts and stops, so selecting a
+district or a district/year turns into a positional slice that costs O(k) in
+the size of the selection instead of a boolean mask over every row.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _label(value):
+    return None if pd.isna(value) else value
+
+
+def _runs(frame, keys):
+    """Start/stop offsets and key tuples of each run of equal ``keys``."""
+    n = len(frame)
+    change = np.zeros(n, dtype=bool)
+    if n:
+        change[0] = True
+    for col in keys:
+        values = frame[col]
+        missing = values.isna().to_numpy()
+        values = values.to_numpy(dtype=object)
+        differs = values[1:] != values[:-1]
+        differs &= ~(missing[1:] & missing[:-1])
+        change[1:] |= differs
+
+    starts = np.flatnonzero(change)
+    stops = np.append(starts[1:], n)
+    labels = frame[keys].iloc[starts].itertuples(index=False, name=None)
+    return [tuple(_label(v) for v in label) for label in labels], starts, stops
+
+
+class SliceIndex:
+    """Offsets of every key prefix in a frame sorted by ``keys``."""
+
+    def __init__(self, frame, keys):
+        self.keys = list(keys)
+        self.rows = len(frame)
+        self.ranges = {}
+        self.sorted = True
+
+        for depth in range(1, len(self.keys) + 1):
+            labels, starts, stops = _runs(frame, self.keys[:depth])
+            for label, start, stop in zip(labels, starts, stops):
+                if label in self.ranges:
+                    # A key showed up in two separate runs: the frame is not
+                    # sorted by these keys and offsets would be wrong.
+                    self.sorted = False
+                    self.ranges = {}
+                    return
+                self.ranges[label] = (int(start), int(stop))
+
+    def positions(self, **values):
+        """Row positions matching ``values`` (a subset of the index keys).
+
+        Returns a ``slice`` when the selection is one contiguous run (any
+        prefix of the keys) and an integer array otherwise.
+        """
+        unknown = set(values) - set(self.keys)
+        if unknown or not self.sorted:
+            raise KeyError(f"cannot slice on {sorted(unknown) or sorted(values)}")
+
+        depth = 0
+        while depth < len(self.keys) and self.keys[depth] in values:
+            depth += 1
+
+        if depth == len(values):
+            label = tuple(_label(values[k]) for k in self.keys[:depth])
+            start, stop = self.ranges.get(label, (0, 0))
+            return slice(start, stop)
+
+        # Not a key prefix (e.g. year without district): gather the matching
+        # runs at the deepest level that covers every requested key.
+        depth = max(self.keys.index(k) for k in values) + 1
+        wanted = {self.keys.index(k): _label(v) for k, v in values.items()}
+        parts = [
+            np.arange(start, stop)
+            for label, (start, stop) in self.ranges.items()
+            if len(label) == depth and all(label[i] == v for i, v in wanted.items())
+        ]
+        return np.concatenate(parts) if parts else np.arange(0)
+
+    def take(self, frame, **values):
+        """Rows of ``frame`` matching ``values``; a view for contiguous runs."""
+        return frame.iloc[self.positions(**values)]
+
+    def labels(self, key):
+        """Distinct values of ``key`` in index order (for selectboxes)."""
+        depth = self.keys.index(key) + 1
+        seen = dict.fromkeys(label[depth - 1] for label in self.ranges if len(label) == depth)
+        return [v for v in seen if v is not None]
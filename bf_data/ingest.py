@@ -0,0 +1,174 @@
+"""Append-only ingestion of new open-data mission drops.
+
+Only rows newer than the store watermark (the latest ``mission_created_date``
+already ingested) are taken from the drop. They are written as new part files
+next to the existing year partitions, and their aggregates are added into the
+cube for the affected months only, so a monthly refresh does not rebuild
+anything that is already there.
+
+    python -m bf_data ingest path/to/new_missions.csv
+
+Re-running the same drop after an interrupted ingest overwrites the same part
+files instead of duplicating them, because the part name is derived from the
+drop's date range.
+"""
+
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from . import cube as cube_mod
+from . import pyramid as pyramid_mod
+from . import quality as quality_mod
+from . import sketch as sketch_mod
+from .calendar_features import add_calendar
+from .paths import CUBE_PATH, MISSIONS_DIR, PYRAMID_PATH, QUALITY_PATH, SKETCH_PATH
+from .schema import DATE_COLUMN
+from .shared import is_stale
+from .store import (
+    csv_chunks,
+    missions_dataset,
+    read_watermark,
+    watermark_path,
+    write_partitions,
+    write_watermark,
+)
+
+
+def _part_name(first, last):
+    return f"part-{first:%Y%m%d%H%M%S}-{last:%Y%m%d%H%M%S}.parquet"
+
+
+def ingest(csv_path, missions_dir=MISSIONS_DIR, cube_path=CUBE_PATH, chunksize=500_000,
+           sketch_path=SKETCH_PATH, pyramid_path=PYRAMID_PATH, engine="arrow", quality_path=QUALITY_PATH):
+    """Append the rows of ``csv_path`` newer than the watermark.
+
+    Returns a summary dict with the rows added / skipped and the years and
+    cube cells touched.
+    """
+    missions_dir = Path(missions_dir)
+    columns = [c for c in missions_dataset(missions_dir).schema.names if c != "year"]
+    watermark = read_watermark(missions_dir)
+    if not watermark_path(missions_dir).exists():
+        # Without the file the derived tables fall back to the directory
+        # mtime, which moving the new parts in below would bump.
+        write_watermark(missions_dir, watermark)
+
+    stats = {}
+    fresh = []
+    skipped = 0
+    for chunk in csv_chunks(csv_path, engine, chunksize, stats):
+        if watermark is not None:
+            old = chunk[DATE_COLUMN] <= watermark
+            skipped += int(old.sum())
+            chunk = chunk[~old]
+        if len(chunk):
+            fresh.append(quality_mod.add_quality(add_calendar(chunk)).reindex(columns=columns))
+
+    summary = {
+        "watermark": watermark,
+        "rows_added": 0,
+        "rows_skipped": skipped,
+        "rows_invalid": stats.get("dropped", 0),
+        "years": [],
+        "cells_updated": 0,
+    }
+    if not fresh:
+        return summary
+
+    new_rows = pd.concat(fresh, ignore_index=True)
+    first = new_rows[DATE_COLUMN].min()
+    last = new_rows[DATE_COLUMN].max()
+
+    # Load (or lazily rebuild) the derived tables while the store still holds
+    # only the old rows, so nothing the new rows are added into has them yet.
+    cells = cube_mod.aggregate(new_rows)
+    current = cube_mod.load_cube(cube_path, missions_dir) if Path(cube_path).exists() else None
+    sketches = (
+        sketch_mod.load_sketches(sketch_path, missions_dir) if Path(sketch_path).exists() else None
+    )
+    # A pyramid base older than the watermark misses rows; leave it to the
+    # lazy rebuild instead of adding into it.
+    fresh_base = Path(pyramid_path).exists() and not is_stale(pyramid_path, watermark_path(missions_dir))
+    base = pd.read_parquet(pyramid_path) if fresh_base else None
+    quality = None
+    if Path(quality_path).exists() and not is_stale(quality_path, watermark_path(missions_dir)):
+        quality = quality_mod.load_quality(quality_path, missions_dir)
+
+    # Write the parts aside first, then move each into its year partition.
+    tmp_dir = Path(tempfile.mkdtemp(prefix=".ingest-", dir=missions_dir.parent))
+    try:
+        rows = write_partitions([new_rows], tmp_dir, part_name=_part_name(first, last))
+        for part in sorted(tmp_dir.glob("year=*/*.parquet")):
+            target = missions_dir / part.parent.name / part.name
+            target.parent.mkdir(exist_ok=True)
+            part.replace(target)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    # The watermark goes next: if we stop before the cube is saved, the cube
+    # is older than the watermark and load_cube rebuilds it from the store.
+    write_watermark(missions_dir, last)
+
+    if current is not None:
+        cube_mod.save_cube(cube_mod.merge(current, cells), cube_path)
+    else:
+        cube_mod.build_cube(missions_dir, cube_path)
+
+    # Sketches, the hourly pyramid base and the quality counts are plain
+    # counts and sums, so new rows just add into them. A store without them
+    # yet builds them lazily on first load.
+    if sketches is not None:
+        sketch_mod.save_sketches(sketch_mod.fold([sketches, sketch_mod.sketch_cells(new_rows)]), sketch_path)
+    if base is not None:
+        pyramid_mod.save_pyramid(pyramid_mod.fold([base, pyramid_mod.pyramid_cells(new_rows)]), pyramid_path)
+    if quality is not None:
+        quality = quality_mod.merge_counts(
+            quality,
+            quality_mod.quality_counts(new_rows),
+            {"unparseable_dates": stats.get("dropped", 0)},
+        )
+        quality_mod.save_quality(quality, quality_path)
+
+    summary.update(
+        watermark=last,
+        rows_added=len(new_rows),
+        years=sorted(rows),
+        cells_updated=len(cells),
+    )
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m bf_data ingest",
+        description="Append a new mission drop to the store and cube."
+    )
+    parser.add_argument("csv")
+    parser.add_argument("--missions", default=MISSIONS_DIR)
+    parser.add_argument("--cube", default=CUBE_PATH)
+    parser.add_argument("--sketches", default=SKETCH_PATH)
+    parser.add_argument("--pyramid", default=PYRAMID_PATH)
+    parser.add_argument("--quality", default=QUALITY_PATH)
+    parser.add_argument("--chunksize", type=int, default=500_000)
+    parser.add_argument("--engine", choices=["arrow", "pandas"], default="arrow")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    summary = ingest(
+        args.csv, args.missions, args.cube, args.chunksize,
+        sketch_path=args.sketches, pyramid_path=args.pyramid, engine=args.engine, quality_path=args.quality,
+    )
+    elapsed = time.perf_counter() - start
+
+    print(f"Added {summary['rows_added']:,} rows "
+          f"({summary['rows_skipped']:,} at or before the old watermark, "
+          f"{summary['rows_invalid']:,} without a date) in {elapsed:.1f}s")
+    if summary["rows_added"]:
+        print(f"Years touched: {', '.join(map(str, summary['years']))}; "
+              f"{summary['cells_updated']:,} cube cells updated; "
+              f"watermark now {summary['watermark']}")
@@ -0,0 +1,93 @@
+"""Display labels of the dictionary-encoded text columns.
+
+``mission_type`` and ``mission_location_district`` are stored dictionary
+encoded (see :mod:`bf_data.schema`) and arrive in pandas as ``category``: a
+few integer codes per row plus a handful of distinct strings. Labels are
+therefore looked up once per dictionary entry and mapped back through the
+codes, never per row.
+
+``LABELS`` holds one label table per column and language; values missing
+from a table fall back to ``FALLBACK`` (or to the value itself).
+"""
+
+import numpy as np
+import pandas as pd
+
+LANGUAGES = ("de", "en")
+
+LABELS = {
+    "mission_type": {
+        "de": {
+            "Rettungsdienst": "Rettungsdienst",
+            "Notfallrettung": "Notfallrettung",
+            "Brand": "Brand",
+            "Technische Hilfeleistung": "Technische Hilfeleistung",
+            "Krankentransport": "Krankentransport"
+        },
+        "en": {
+            "Rettungsdienst": "Emergency Medical Service",
+            "Notfallrettung": "Emergency Rescue",
+            "Brand": "Fire Incident",
+            "Technische Hilfeleistung": "Technical Rescue",
+            "Krankentransport": "Patient Transport"
+        },
+    },
+}
+
+FALLBACK = {
+    "mission_type": {"de": "Sonstige", "en": "Other"},
+}
+
+# The cube and the rollups call the district column just "district".
+ALIASES = {"district": "mission_location_district"}
+
+
+def _table(column, lang):
+    if lang not in LANGUAGES:
+        raise ValueError(f"unknown language {lang!r}, expected one of {LANGUAGES}")
+    column = ALIASES.get(column, column)
+    return LABELS.get(column, {}).get(lang, {}), FALLBACK.get(column, {}).get(lang)
+
+
+def dictionary_labels(dictionary, column, lang="en"):
+    """Labels of the entries of ``dictionary`` (e.g. ``Categorical.categories``)."""
+    table, fallback = _table(column, lang)
+    return np.array([table.get(value, fallback or value) for value in dictionary], dtype=object)
+
+
+def observed(values):
+    """Dictionary entries of a categorical that occur in it, in dictionary order.
+
+    One ``bincount`` over the integer codes instead of a hash of every value.
+    """
+    codes = values.cat.codes.to_numpy()
+    present = np.bincount(codes[codes >= 0], minlength=len(values.cat.categories)) > 0
+    return values.cat.categories[present]
+
+
+def translate(values, column, lang="en"):
+    """``values`` as a categorical of labels, resolved on its dictionary.
+
+    Entries that share a label (e.g. every unknown type becoming "Other")
+    share one category, so results can be grouped on the labels directly.
+    """
+    values = values if isinstance(values.dtype, pd.CategoricalDtype) else values.astype("category")
+    labels = dictionary_labels(values.cat.categories, column, lang)
+    categories, remap = np.unique(labels.astype(str), return_inverse=True)
+
+    codes = values.cat.codes.to_numpy()
+    codes = np.where(codes >= 0, remap[np.maximum(codes, 0)], -1)
+    return pd.Series(pd.Categorical.from_codes(codes, categories), index=values.index, name=values.name)
+
+
+def label_table(values, column, lang="en"):
+    """Reference table of the observed entries of ``values`` and their labels.
+
+    Columns: ``column`` and ``<column>_<lang>``, sorted by the source value.
+    """
+    entries = observed(values if isinstance(values.dtype, pd.CategoricalDtype) else values.astype("category"))
+    table = pd.DataFrame({
+        column: entries.astype(str),
+        f"{column}_{lang}": dictionary_labels(entries, column, lang),
+    })
+    return table.sort_values(column, ignore_index=True)
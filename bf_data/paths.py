@@ -0,0 +1,43 @@
+import os
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+
+# =========================
+# DATA LOCATIONS
+# =========================
+# Override with BF_DATASET_DIR / BF_STORE_DIR when running outside the
+# original workstation (CI, docker, a colleague's laptop).
+DATASET_DIR = Path(
+    os.environ.get(
+        "BF_DATASET_DIR",
+        "/Users/deekshithsathrasalagangadharaiah/BF-Open-Data/Datasets"
+    )
+)
+
+MISSIONS_CSV = DATASET_DIR / "Berlin_Missions_2020_2025.csv"
+REGIONAL_CSV = DATASET_DIR / "Berlin_Regional_2020_2025.csv"
+if not REGIONAL_CSV.exists():
+    # The regional file is small enough to ship with the repo.
+    REGIONAL_CSV = REPO_DIR / "Berlin_Regional_2020_2025.csv"
+
+# LOR area outlines (WGS84 GeoJSON) for the choropleth maps, per level.
+GEOMETRY_FILES = {
+    level: [DATASET_DIR / name, REPO_DIR / "geo" / name]
+    for level, name in {
+        "district_area": "lor_district_areas.geojson",
+        "planning_room": "lor_planning_rooms.geojson",
+    }.items()
+}
+
+STORE_DIR = Path(os.environ.get("BF_STORE_DIR", DATASET_DIR / "store"))
+MISSIONS_DIR = STORE_DIR / "missions"
+CUBE_PATH = STORE_DIR / "cube.parquet"
+REGIONAL_SNAPSHOT = STORE_DIR / "regional.arrow"
+SKETCH_PATH = STORE_DIR / "sketches.parquet"
+COMPLIANCE_SNAPSHOT = STORE_DIR / "compliance.arrow"
+ROLLUP_SNAPSHOT = STORE_DIR / "rollup.arrow"
+FIGURE_DIR = STORE_DIR / "figures"
+PYRAMID_PATH = STORE_DIR / "pyramid.parquet"
+FORECAST_SNAPSHOT = STORE_DIR / "forecast.arrow"
+QUALITY_PATH = STORE_DIR / "quality.json"
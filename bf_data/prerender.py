@@ -0,0 +1,111 @@
+"""Prerender every selectable chart into the figure store.
+
+The selection space of the dashboard is small and finite: districts x years
+(Location Incidents), districts (Time Patterns), hierarchy levels x areas
+(Regional Capacity), years and district areas (Regional Time Goals, Demand
+Landscape) plus a few charts without controls. This command renders all of
+them once, spread over a process pool, and writes one Arrow file per chart
+and data version to ``FIGURE_DIR`` (see :mod:`bf_data.figures`). Pages then
+serve a stored figure instead of building it; stores of older data versions
+are removed.
+
+Run it after ``ingest`` (or as part of the build):
+
+    python -m bf_data prerender [--workers 8] [--charts time_patterns ...]
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import plotly.io as pio
+import pyarrow as pa
+
+from .charts import CHARTS, load_sources
+from .figures import data_version, selection_id, store_path
+from .paths import FIGURE_DIR
+from .shared import write_snapshot
+
+CHUNK_SIZE = 32
+
+
+def render(name, selections):
+    """Figure JSON of chart ``name`` for each of ``selections`` (worker side)."""
+    chart = CHARTS[name]
+    data = load_sources(chart)
+    return [
+        (selection_id(selection), pio.to_json(chart.build(*data, **selection), validate=False).encode())
+        for selection in selections
+    ]
+
+
+def prerender(names=None, workers=None, figure_dir=FIGURE_DIR):
+    """Render ``names`` (default: every chart) and write their figure stores.
+
+    Returns ``{chart: figures written}``.
+    """
+    explicit = names is not None
+    names = list(names or CHARTS)
+    figure_dir = Path(figure_dir)
+
+    # Load (and, if stale, rebuild) every source here first, so workers only
+    # map existing snapshots instead of racing to rebuild them.
+    plans = {}
+    for name in names:
+        try:
+            data = load_sources(CHARTS[name])
+        except FileNotFoundError as exc:
+            # Optional inputs (e.g. the map geometry) only skip their charts.
+            if explicit:
+                raise
+            print(f"Skipping {name}: {exc}")
+            continue
+        plans[name] = (data_version(*data), CHARTS[name].selections(*data))
+
+    specs = {name: [] for name in plans}
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = [
+            (name, pool.submit(render, name, selections[i:i + CHUNK_SIZE]))
+            for name, (_, selections) in plans.items()
+            for i in range(0, len(selections), CHUNK_SIZE)
+        ]
+        for name, future in futures:
+            specs[name].extend(future.result())
+
+    written = {}
+    for name, (version, _) in plans.items():
+        path = store_path(name, version, figure_dir)
+        selection, spec = zip(*specs[name]) if specs[name] else ((), ())
+        write_snapshot(
+            pa.table({"selection": pa.array(selection, pa.string()), "spec": pa.array(spec, pa.binary())}),
+            path,
+        )
+        for old in figure_dir.glob(f"{name}-*.arrow"):
+            if old != path:
+                old.unlink()
+        written[name] = len(spec)
+    return written
+
+
+# =========================
+# CLI
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m bf_data prerender",
+        description="Render every selectable chart into the figure store."
+    )
+    parser.add_argument("--charts", nargs="+", choices=list(CHARTS))
+    parser.add_argument("--workers", type=int, help="worker processes (default: all cores)")
+    parser.add_argument("--out", default=FIGURE_DIR)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    written = prerender(args.charts, args.workers, args.out)
+    elapsed = time.perf_counter() - start
+
+    for name, count in written.items():
+        print(f"{name:<24} {count:>6,} figures")
+    print(f"Wrote {sum(written.values()):,} figures to {args.out} in {elapsed:.1f}s")
@@ -0,0 +1,130 @@
+"""Startup profile of the multipage app.
+
+Measures, each in a fresh interpreter:
+
+* ``imports`` - wall time of importing pandas, pyarrow, plotly.express,
+  streamlit and bf_data on their own (each includes its dependencies)
+* ``warmup`` - per-step time of :func:`bf_data.warmup.warm_up`
+* per page, ``cold`` - the first run in a process nothing has warmed, i.e.
+  what the first visitor paid before the warm-up existed, and ``warm`` -
+  the first run after the warm-up has finished, i.e. what a visitor pays
+  once the app has been up for a few seconds
+
+Page runs reuse the instrumentation of :mod:`bf_data.bench`, so both
+columns split into load / transform / figure / serialize.
+
+    python -m bf_data profile [--pages 1_Overview.py ...] [--out startup.json]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from .bench import PAGES, _git_commit, run_page
+from .paths import REPO_DIR, STORE_DIR
+
+MODULES = ["pandas", "pyarrow", "plotly.express", "streamlit", "bf_data"]
+
+
+def import_time(module):
+    """Seconds a fresh interpreter takes to import ``module``."""
+    code = (
+        "import time; start = time.perf_counter(); "
+        f"import {module}; print(time.perf_counter() - start)"
+    )
+    proc = subprocess.run([sys.executable, "-c", code], cwd=REPO_DIR, capture_output=True, text=True, check=True)
+    return float(proc.stdout.strip().splitlines()[-1])
+
+
+def _worker(page, warm):
+    """One page run in this (fresh) process, after the warm-up if ``warm``."""
+    warmup = None
+    if warm:
+        from .warmup import warm_up
+
+        warmup = warm_up()
+    result = run_page(page, runs=1)
+    return {"page": page, "run": result["cold"], "warmup": warmup, "peak_rss_mb": result["peak_rss_mb"]}
+
+
+def _spawn(page, warm):
+    args = [sys.executable, "-m", "bf_data", "profile", "--worker", page]
+    if warm:
+        args.append("--warm")
+    proc = subprocess.run(args, cwd=REPO_DIR, capture_output=True, text=True)
+    if proc.returncode:
+        return {"page": page, "error": proc.stderr[-2000:]}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def profile(pages=PAGES):
+    report = {
+        "commit": _git_commit(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "imports": {module: import_time(module) for module in MODULES},
+        "warmup": None,
+        "pages": [],
+    }
+    for page in pages:
+        cold, warm = _spawn(page, warm=False), _spawn(page, warm=True)
+        if report["warmup"] is None and warm.get("warmup"):
+            report["warmup"] = warm["warmup"]
+        report["pages"].append({
+            "page": page,
+            "cold": cold.get("run", cold),
+            "warm": warm.get("run", warm),
+        })
+    return report
+
+
+def _print_summary(report):
+    print("imports (fresh interpreter, including dependencies)")
+    for module, seconds in report["imports"].items():
+        print(f"  {module:32s} {seconds:7.3f}s")
+
+    if report["warmup"]:
+        total = sum(step["seconds"] for step in report["warmup"].values())
+        print(f"\nwarm-up {total:.3f}s")
+        for name, step in report["warmup"].items():
+            print(f"  {name:32s} {step['seconds']:7.3f}s  {step.get('error', '')}")
+
+    print("\nfirst page run: cold process vs after warm-up")
+    for page in report["pages"]:
+        cold, warm = page["cold"], page["warm"]
+        if "total_s" not in cold or "total_s" not in warm:
+            print(f"  {page['page']:32s} FAILED")
+            continue
+        print(f"  {page['page']:32s} cold {cold['total_s']:7.3f}s (load {cold['load_s']:.3f})  "
+              f"warm {warm['total_s']:7.3f}s (load {warm['load_s']:.3f})")
+
+
+# =========================
+# CLI
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m bf_data profile",
+        description="Profile app startup: import times and cold vs warmed-up page runs."
+    )
+    parser.add_argument("--pages", nargs="+", default=PAGES)
+    parser.add_argument("--out", default=None, help="JSON file (default: <store>/bench/startup-<commit>.json)")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--warm", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(_worker(args.worker, args.warm)))
+        return 0
+
+    report = profile(args.pages)
+
+    out = Path(args.out) if args.out else STORE_DIR / "bench" / f"startup-{(report['commit'] or 'local')[:12]}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2))
+
+    _print_summary(report)
+    print(f"\nWrote {out}")
+    return 0
@@ -0,0 +1,262 @@
+"""Multi-resolution time series of the mission load per district.
+
+The cube answers "how many missions per year / month / hour of day", but a
+zoomable time axis needs the load per actual hour, day, week, month or year.
+This module keeps that as a pyramid: the hourly base (one row per district
+and hour with the additive cube measures) is stored next to the cube, and
+the shared snapshot holds every level rolled up from it, plus a pre-summed
+all-Berlin run per level (district :data:`BERLIN`), sorted by
+(level, district, bin). :func:`series` picks the finest level that spans the
+requested window in at most ``max_bins`` bins - about one bin per pixel of a
+chart - and slices it out through the offset table plus a binary search, so
+a query touches only the bins it returns, whatever the window or district.
+Hours, days, ... without missions come back as zero-count bins.
+
+    python -m bf_data pyramid [--district MITTE] [--start 2024-01-01] [--end 2024-03-01]
+"""
+
+import argparse
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from .cube import MEASURES, add_stats
+from .paths import MISSIONS_DIR, PYRAMID_PATH
+from .quality import response_times
+from .shared import build_lock, dataset_of, is_stale, open_shared, temp_path, write_snapshot
+from .store import missions_dataset, watermark_path
+from .streaming import store_batches
+
+# level -> approximate bin width, finest first.
+LEVELS = {
+    "hour": pd.Timedelta(hours=1),
+    "day": pd.Timedelta(days=1),
+    "week": pd.Timedelta(weeks=1),
+    "month": pd.Timedelta(days=30.44),
+    "year": pd.Timedelta(days=365.25),
+}
+# pandas frequency of each level's bins, for filling empty ones.
+FREQ = {"hour": "h", "day": "D", "week": "W-MON", "month": "MS", "year": "YS"}
+# District label of the all-Berlin run of each level.
+BERLIN = "BERLIN"
+INDEX_KEYS = ["level", "district"]
+SORT_ORDER = INDEX_KEYS + ["bin"]
+MAX_BINS = 1000
+
+SOURCE_COLUMNS = ["mission_created_date", "mission_location_district", "response_time", "quality"]
+
+
+# =========================
+# BINS
+# =========================
+def truncate(stamps, level):
+    """Start of the ``level`` bin of each ``datetime64`` stamp (weeks start Monday)."""
+    stamps = np.asarray(stamps, dtype="datetime64[ms]")
+    if level == "week":
+        days = stamps.astype("datetime64[D]")
+        # 1970-01-01 was a Thursday.
+        return (days - (days.view("int64") + 3) % 7).astype("datetime64[ms]")
+    unit = {"hour": "h", "day": "D", "month": "M", "year": "Y"}[level]
+    return stamps.astype(f"datetime64[{unit}]").astype("datetime64[ms]")
+
+
+def pick_level(start, end, max_bins=MAX_BINS):
+    """Finest level that covers ``start`` .. ``end`` in at most ``max_bins`` bins."""
+    span = pd.Timestamp(end) - pd.Timestamp(start)
+    for level, width in LEVELS.items():
+        if span / width <= max_bins:
+            return level
+    return "year"
+
+
+# =========================
+# BUILD
+# =========================
+def pyramid_cells(df):
+    """Hourly base cells (district, bin, measures) of raw mission rows."""
+    rt = response_times(df)
+
+    cells = pd.DataFrame({
+        "district": df["mission_location_district"],
+        "bin": truncate(df["mission_created_date"], "hour"),
+        "rt": rt,
+        "rt_sq": rt * rt,
+    })
+    return (
+        cells.groupby(["district", "bin"], dropna=False, observed=True)
+        .agg(
+            count=("rt", "size"),
+            rt_count=("rt", "count"),
+            rt_sum=("rt", "sum"),
+            rt_sumsq=("rt_sq", "sum")
+        )
+        .reset_index()
+    )
+
+
+def fold(parts):
+    """Merge base tables: measures of equal (district, hour) cells add up."""
+    return (
+        pd.concat(parts, ignore_index=True)
+        .astype({"district": object})
+        .groupby(["district", "bin"], dropna=False, observed=True)[MEASURES].sum()
+        .reset_index()
+        .astype({"district": "category"})
+    )
+
+
+def build_pyramid(missions_dir=MISSIONS_DIR, pyramid_path=PYRAMID_PATH, batch_size=1_000_000):
+    """Rebuild the hourly base from the mission store in one streaming pass."""
+    # Stores written before the quality flags existed derive them per batch.
+    names = missions_dataset(missions_dir).schema.names
+    columns = [c for c in SOURCE_COLUMNS if c in names]
+
+    parts = []
+    pending = 0
+    for batch in store_batches(columns, missions_dir, batch_size):
+        cells = pyramid_cells(batch.to_pandas())
+        parts.append(cells)
+        pending += len(cells)
+        if pending > 4 * batch_size:
+            parts = [fold(parts)]
+            pending = len(parts[0])
+
+    base = fold(parts)
+    save_pyramid(base, pyramid_path)
+    return base
+
+
+def save_pyramid(base, pyramid_path=PYRAMID_PATH):
+    pyramid_path = Path(pyramid_path)
+    tmp_path = temp_path(pyramid_path)
+    base = base.sort_values(["district", "bin"], kind="stable", na_position="last", ignore_index=True)
+    base.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, pyramid_path)
+
+
+def roll_up(base):
+    """Every level of :data:`LEVELS` from the hourly ``base``, with a ``level`` column.
+
+    Each level has one run per district and the :data:`BERLIN` run summed
+    over all of them.
+    """
+    levels = []
+    for level in LEVELS:
+        binned = base.assign(bin=truncate(base["bin"], level))
+        rolled = (
+            binned.groupby(["district", "bin"], dropna=False, observed=True)[MEASURES].sum()
+            .reset_index()
+            .astype({"district": object})
+        )
+        berlin = binned.groupby("bin")[MEASURES].sum().reset_index()
+        berlin.insert(0, "district", BERLIN)
+        rolled = pd.concat([rolled, berlin], ignore_index=True)
+        rolled.insert(0, "level", level)
+        levels.append(rolled)
+    pyramid = pd.concat(levels, ignore_index=True)
+    return pyramid.astype({"level": pd.CategoricalDtype(list(LEVELS)), "district": "category"})
+
+
+def _has_berlin(snapshot):
+    return BERLIN in dataset_of(open_shared(snapshot).frame).index(INDEX_KEYS).labels("district")
+
+
+# =========================
+# LOAD
+# =========================
+def load_pyramid(pyramid_path=PYRAMID_PATH, missions_dir=MISSIONS_DIR):
+    """Return the shared pyramid, rebuilding it if the store is newer."""
+    pyramid_path = Path(pyramid_path)
+    source = watermark_path(missions_dir)
+    if not source.exists():
+        source = Path(missions_dir)
+
+    snapshot = pyramid_path.with_suffix(".arrow")
+    with build_lock(pyramid_path):
+        if is_stale(pyramid_path, source):
+            build_pyramid(missions_dir, pyramid_path)
+
+        # Snapshots rolled up before the all-Berlin run existed are redone.
+        if is_stale(snapshot, pyramid_path) or not _has_berlin(snapshot):
+            pyramid = roll_up(pd.read_parquet(pyramid_path))
+            write_snapshot(pa.Table.from_pandas(pyramid, preserve_index=False), snapshot, sort_by=SORT_ORDER)
+
+    return open_shared(snapshot).frame
+
+
+# =========================
+# QUERY
+# =========================
+def bounds(pyramid):
+    """First and last hour with missions, as ``(start, end)`` with ``end`` exclusive."""
+    hours = pyramid.iloc[dataset_of(pyramid).index(INDEX_KEYS).positions(level="hour", district=BERLIN)]["bin"]
+    return hours.iloc[0], hours.iloc[-1] + LEVELS["hour"]
+
+
+def days(pyramid):
+    """First and last day with missions (both inclusive), for date pickers."""
+    first, last = bounds(pyramid)
+    return first.date(), (last - LEVELS["hour"]).date()
+
+
+def districts(pyramid):
+    """Districts of the pyramid, without the all-Berlin run."""
+    labels = dataset_of(pyramid).index(INDEX_KEYS).labels("district")
+    return sorted(d for d in labels if d != BERLIN)
+
+
+def series(pyramid, district=None, start=None, end=None, level=None, max_bins=MAX_BINS):
+    """Load of one district (all of Berlin for ``None``) from ``start`` to ``end``.
+
+    The window defaults to :func:`bounds` and ``level`` to :func:`pick_level`
+    for it; the first bin is the one containing ``start``. Returns
+    ``(level, frame)`` with one row per bin of the window, empty bins
+    included with zero counts: ``bin`` plus the cube measures and
+    ``rt_mean`` / ``rt_std``.
+    """
+    first, last = bounds(pyramid)
+    start = pd.Timestamp(start) if start is not None else first
+    end = pd.Timestamp(end) if end is not None else last
+    level = level or pick_level(start, end, max_bins)
+    lo, hi = truncate([start], level)[0], end.to_datetime64()
+
+    index = dataset_of(pyramid).index(INDEX_KEYS)
+    rows = pyramid.iloc[index.positions(level=level, district=BERLIN if district is None else district)]
+    rows = rows.iloc[slice(*np.searchsorted(rows["bin"].to_numpy(), [lo, hi]))]
+
+    # Only bins with missions are stored; a chart would draw straight over
+    # the gaps, so every bin of the window is filled in.
+    bins = pd.date_range(lo, hi, freq=FREQ[level], inclusive="left", unit="ms", name="bin")
+    rows = rows.set_index("bin")[MEASURES].reindex(bins, fill_value=0).reset_index()
+
+    return level, add_stats(rows)
+
+
+# =========================
+# CLI
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m bf_data pyramid",
+        description="Rebuild the multi-resolution mission load pyramid."
+    )
+    parser.add_argument("--missions", default=MISSIONS_DIR)
+    parser.add_argument("--out", default=PYRAMID_PATH)
+    parser.add_argument("--district")
+    parser.add_argument("--start")
+    parser.add_argument("--end")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    base = build_pyramid(args.missions, args.out)
+    elapsed = time.perf_counter() - start
+    print(f"Wrote {len(base):,} hourly cells to {args.out} in {elapsed:.1f}s")
+
+    pyramid = load_pyramid(args.out, args.missions)
+    level, rows = series(pyramid, args.district, args.start, args.end)
+    print(f"{len(rows):,} {level} bins")
+    print(rows[["bin", "count", "rt_mean"]].to_string(index=False))
@@ -0,0 +1,200 @@
+"""Row quality flags derived once at ingest.
+
+Every mission row is stored with a ``quality`` bitmask next to its values
+instead of being dropped or copied into a cleaned frame:
+
+* ``rt_missing`` / ``rt_not_positive`` - no usable response time
+* ``rt_outlier`` - a response time above :data:`RT_OUTLIER_SECONDS`, which
+  in the open data means a mission closed hours later, not a slow response
+* ``district_missing`` / ``mission_type_missing`` - no grouping key
+
+Aggregations take their response times from :func:`response_times`, so the
+cube, sketches, pyramid and overview all apply the same rule and no page
+filters rows on its own. Per-column counts (nulls and flags) are kept in
+``quality.json`` next to the store and updated by every ingest.
+
+    python -m bf_data quality
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from .paths import MISSIONS_DIR, QUALITY_PATH
+from .shared import build_lock, is_stale, temp_path
+
+QUALITY_COLUMN = "quality"
+
+RT_MISSING = 1
+RT_NOT_POSITIVE = 2
+RT_OUTLIER = 4
+DISTRICT_MISSING = 8
+MISSION_TYPE_MISSING = 16
+
+FLAGS = {
+    "rt_missing": RT_MISSING,
+    "rt_not_positive": RT_NOT_POSITIVE,
+    "rt_outlier": RT_OUTLIER,
+    "district_missing": DISTRICT_MISSING,
+    "mission_type_missing": MISSION_TYPE_MISSING,
+}
+
+# Rows with any of these flags do not count towards response-time statistics.
+RT_EXCLUDED = RT_MISSING | RT_NOT_POSITIVE | RT_OUTLIER
+
+RT_OUTLIER_SECONDS = 3600
+
+
+# =========================
+# FLAGS
+# =========================
+def _isna(column):
+    if isinstance(column, (pa.Array, pa.ChunkedArray)):
+        return column.is_null().to_numpy(zero_copy_only=False)
+    return column.isna().to_numpy()
+
+
+def _floats(column):
+    if isinstance(column, (pa.Array, pa.ChunkedArray)):
+        return column.to_numpy(zero_copy_only=False).astype("float64")
+    return column.to_numpy(dtype="float64", na_value=np.nan)
+
+
+def _rt_flags(rt):
+    with np.errstate(invalid="ignore"):
+        return (
+            np.isnan(rt) * RT_MISSING
+            | (rt <= 0) * RT_NOT_POSITIVE
+            | (rt > RT_OUTLIER_SECONDS) * RT_OUTLIER
+        ).astype("uint8")
+
+
+def _stored_flags(rows):
+    names = rows.schema.names if isinstance(rows, pa.RecordBatch) else rows.columns
+    if QUALITY_COLUMN in names:
+        return np.asarray(rows[QUALITY_COLUMN]).astype("uint8")
+    return None
+
+
+def quality_flags(rows):
+    """``uint8`` quality bitmask of every row of a frame or record batch."""
+    return (
+        _rt_flags(_floats(rows["response_time"]))
+        | _isna(rows["mission_location_district"]) * DISTRICT_MISSING
+        | _isna(rows["mission_type"]) * MISSION_TYPE_MISSING
+    ).astype("uint8")
+
+
+def flags_of(rows):
+    """The stored bitmask, or a derived one for stores written before it."""
+    flags = _stored_flags(rows)
+    return quality_flags(rows) if flags is None else flags
+
+
+def add_quality(df):
+    """``df`` with its ``quality`` column."""
+    return df.assign(**{QUALITY_COLUMN: quality_flags(df)})
+
+
+def response_times(rows):
+    """Response times as ``float64`` with ``NaN`` where a flag excludes them."""
+    rt = _floats(rows["response_time"])
+    flags = _stored_flags(rows)
+    if flags is None:
+        flags = _rt_flags(rt)
+    return np.where(flags & RT_EXCLUDED, np.nan, rt)
+
+
+# =========================
+# COUNTS
+# =========================
+def quality_counts(df):
+    """Rows, flagged rows, per-flag counts and per-column nulls of ``df``."""
+    flags = flags_of(df)
+    return {
+        "rows": len(df),
+        "flagged": int(np.count_nonzero(flags)),
+        "flags": {name: int(np.count_nonzero(flags & bit)) for name, bit in FLAGS.items()},
+        "nulls": {col: int(df[col].isna().sum()) for col in df.columns if col != QUALITY_COLUMN},
+    }
+
+
+def merge_counts(*counts):
+    """Add up count dicts key by key (nested dicts included)."""
+    merged = {}
+    for part in counts:
+        for key, value in part.items():
+            if isinstance(value, dict):
+                merged[key] = merge_counts(merged.get(key, {}), value)
+            else:
+                merged[key] = merged.get(key, 0) + value
+    return merged
+
+
+def save_quality(counts, quality_path=QUALITY_PATH):
+    quality_path = Path(quality_path)
+    tmp_path = temp_path(quality_path)
+    tmp_path.write_text(json.dumps(counts, indent=2))
+    tmp_path.replace(quality_path)
+
+
+def build_quality(missions_dir=MISSIONS_DIR, quality_path=QUALITY_PATH, batch_size=1_000_000):
+    """Recount the store in one streaming pass (CSV rows without a date are not in it)."""
+    from .store import missions_dataset
+
+    dataset = missions_dataset(missions_dir)
+    counts = merge_counts(*(
+        quality_counts(batch.to_pandas()) for batch in dataset.to_batches(batch_size=batch_size)
+    ))
+    save_quality(counts, quality_path)
+    return counts
+
+
+def load_quality(quality_path=QUALITY_PATH, missions_dir=MISSIONS_DIR):
+    """Quality counts of the store, recounted if older than the watermark."""
+    from .store import watermark_path
+
+    with build_lock(quality_path):
+        if is_stale(quality_path, watermark_path(missions_dir)):
+            return build_quality(missions_dir, quality_path)
+        return json.loads(Path(quality_path).read_text())
+
+
+def quality_report(counts):
+    """One row per column: nulls and the response-time checks."""
+    report = pd.DataFrame({"nulls": pd.Series(counts["nulls"], dtype="int64")})
+    report["null_pct"] = 100 * report["nulls"] / max(counts["rows"], 1)
+    for check in ("not_positive", "outlier"):
+        report[check] = 0
+        report.loc["response_time", check] = counts["flags"][f"rt_{check}"]
+    return report
+
+
+# =========================
+# CLI
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m bf_data quality",
+        description="Show per-column quality counts of the mission store."
+    )
+    parser.add_argument("--missions", default=MISSIONS_DIR)
+    parser.add_argument("--out", default=QUALITY_PATH)
+    parser.add_argument("--rebuild", action="store_true", help="recount the store")
+    args = parser.parse_args(argv)
+
+    if args.rebuild:
+        counts = build_quality(args.missions, args.out)
+    else:
+        counts = load_quality(args.out, args.missions)
+
+    print(f"{counts['rows']:,} rows, {counts['flagged']:,} flagged"
+          + (f", {counts['unparseable_dates']:,} CSV rows without a date" if counts.get("unparseable_dates") else ""))
+    for name, n in counts["flags"].items():
+        print(f"  {name:22s} {n:>10,}")
+    print()
+    print(quality_report(counts).to_string(float_format=lambda x: f"{x:,.2f}"))
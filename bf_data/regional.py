@@ -0,0 +1,17 @@
+"""Loader for the regional (district area / planning room) statistics."""
+
+import pandas as pd
+import pyarrow as pa
+
+from .paths import REGIONAL_CSV, REGIONAL_SNAPSHOT
+from .shared import build_lock, is_stale, open_shared, write_snapshot
+
+
+def load_regional(csv_path=REGIONAL_CSV, snapshot=REGIONAL_SNAPSHOT):
+    """Regional statistics as a read-only frame shared across sessions."""
+    with build_lock(snapshot):
+        if is_stale(snapshot, csv_path):
+            df = pd.read_csv(csv_path, low_memory=False)
+            write_snapshot(pa.Table.from_pandas(df, preserve_index=False), snapshot)
+
+    return open_shared(snapshot).frame
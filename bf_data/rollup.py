@@ -0,0 +1,180 @@
+"""Hierarchical roll-up of the regional statistics.
+
+The regional file follows the LOR hierarchy of Berlin: planning room
+(``planning_room_id``, e.g. 1100101) inside district area (11001) inside
+prediction area (110) inside Bezirk (1); each level's id is its child's id
+divided by 100. Mission counts add up along the hierarchy, but the
+``response_time_*_mean`` / ``_std`` columns do not: the mean of a parent is
+the count-weighted mean of its children and its variance is the pooled
+within- plus between-child variance
+
+    var = (sum((n_i - 1) s_i^2 + n_i m_i^2) - N mu^2) / (N - 1)
+
+This module rolls every level up from the planning rooms once, with those
+formulas, and keeps the result as a shared snapshot, so pages pick a level
+instead of summing (or averaging) the raw rows themselves. Medians are not
+poolable and are left out.
+
+    python -m bf_data rollup [--level prediction_area] [--year 2024]
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from .paths import REGIONAL_CSV, ROLLUP_SNAPSHOT
+from .regional import load_regional
+from .shared import build_lock, is_stale, open_shared, write_snapshot
+from .schema import BEZIRKE
+
+# Finest to coarsest; the id of each level is the next finer id // 100.
+HIERARCHY = ["planning_room", "district_area", "prediction_area", "bezirk"]
+
+# response time statistic -> count column its mean / std are taken over.
+# Only statistics whose sample size the file publishes are pooled; the
+# roll-up reproduces the published district-area and prediction-area rows.
+# The CPR, first-pump, first-ladder and technical-rescue times have no exact
+# count (pooling them by the nearest one is off by up to two minutes), so
+# they are left out like the medians.
+STAT_WEIGHTS = {
+    "ems_critical": "mission_count_ems_critical_timegoal_computed",
+    "fire_time_to_full_crew": "mission_count_fire_timegoal_computed",
+}
+
+
+# =========================
+# POOLING
+# =========================
+def pooled_terms(n, mean, std):
+    """Additive terms (n, n * mean, sum of squares) of per-area statistics.
+
+    Areas without a mean contribute nothing; a missing std (single mission)
+    counts as zero spread.
+    """
+    n = np.where(np.isnan(mean), 0.0, n)
+    mean = np.nan_to_num(mean)
+    std = np.nan_to_num(std)
+    return n, n * mean, np.clip(n - 1, 0, None) * std ** 2 + n * mean ** 2
+
+
+def pooled_stats(n, total, sumsq):
+    """Mean and std from summed :func:`pooled_terms`."""
+    n = np.asarray(n, dtype="float64")
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(n > 0, total / n, np.nan)
+        var = np.where(n > 1, (sumsq - n * mean ** 2) / (n - 1), np.nan)
+    return mean, np.sqrt(np.clip(var, 0, None))
+
+
+# =========================
+# BUILD
+# =========================
+def _names(regional):
+    """area id -> published name, per level."""
+    names = {}
+    for level in HIERARCHY[:-1]:
+        rows = regional[[f"{level}_id", f"{level}_name"]].dropna()
+        names[level] = dict(zip(rows[f"{level}_id"].astype("int64"), rows[f"{level}_name"]))
+    names["bezirk"] = BEZIRKE
+    return names
+
+
+def compute_rollup(regional):
+    """One row per (level, area, year) of every :data:`HIERARCHY` level.
+
+    Columns: ``level``, ``area_id``, ``area_name``, ``parent_id`` (the area
+    of the next coarser level), ``year``, every ``mission_count_*`` summed,
+    and per statistic in :data:`STAT_WEIGHTS` the pooled
+    ``response_time_<stat>_mean`` / ``_std`` with their weight ``_n``.
+    """
+    rooms = regional[regional["planning_room_id"].notna()]
+    counts = [c for c in regional.columns if c.startswith("mission_count_")]
+
+    room_id = rooms["planning_room_id"].to_numpy(dtype="int64")
+    base = {"year": rooms["source_year"].to_numpy(dtype="int16")}
+    for depth, level in enumerate(HIERARCHY):
+        base[level] = room_id // 100 ** depth
+    for col in counts:
+        base[col] = rooms[col].to_numpy(dtype="float64")
+    for stat, weight in STAT_WEIGHTS.items():
+        n, total, sumsq = pooled_terms(
+            rooms[weight].to_numpy(dtype="float64"),
+            rooms[f"response_time_{stat}_mean"].to_numpy(dtype="float64"),
+            rooms[f"response_time_{stat}_std"].to_numpy(dtype="float64"),
+        )
+        base.update({f"_{stat}_n": n, f"_{stat}_total": total, f"_{stat}_sumsq": sumsq})
+    base = pd.DataFrame(base)
+
+    names = _names(regional)
+    sums = [c for c in base.columns if c not in HIERARCHY and c != "year"]
+    levels = []
+    for depth, level in enumerate(HIERARCHY):
+        rolled = base.groupby([level, "year"], as_index=False)[sums].sum()
+        out = pd.DataFrame({
+            "level": level,
+            "area_id": rolled[level].astype("int64"),
+            "area_name": rolled[level].map(names[level]),
+            "parent_id": rolled[level] // 100 if depth + 1 < len(HIERARCHY) else pd.NA,
+            "year": rolled["year"].astype("int16"),
+        })
+        for col in counts:
+            out[col] = rolled[col].astype("int64")
+        for stat in STAT_WEIGHTS:
+            mean, std = pooled_stats(
+                rolled[f"_{stat}_n"], rolled[f"_{stat}_total"], rolled[f"_{stat}_sumsq"]
+            )
+            out[f"response_time_{stat}_mean"] = mean
+            out[f"response_time_{stat}_std"] = std
+            out[f"response_time_{stat}_n"] = rolled[f"_{stat}_n"].astype("int64")
+        levels.append(out)
+
+    rollup = pd.concat(levels, ignore_index=True)
+    return rollup.astype({
+        "level": pd.CategoricalDtype(HIERARCHY),
+        "parent_id": "Int64",
+    })
+
+
+def load_rollup(csv_path=REGIONAL_CSV, snapshot=ROLLUP_SNAPSHOT):
+    """Roll-up of every level as a read-only frame shared across sessions.
+
+    Recomputed only when the regional CSV is newer than the snapshot.
+    """
+    with build_lock(snapshot):
+        if is_stale(snapshot, csv_path):
+            table = compute_rollup(load_regional(csv_path))
+            write_snapshot(pa.Table.from_pandas(table, preserve_index=False), snapshot)
+
+    return open_shared(snapshot).frame
+
+
+# =========================
+# QUERY
+# =========================
+def level_rows(rollup, level, year=None):
+    """Rows of one hierarchy ``level``, optionally of one ``year``."""
+    mask = (rollup["level"] == level).to_numpy()
+    if year is not None:
+        mask = mask & (rollup["year"] == year).to_numpy()
+    return rollup[mask]
+
+
+# =========================
+# CLI
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m bf_data rollup",
+        description="Roll the regional statistics up the planning room -> Bezirk hierarchy."
+    )
+    parser.add_argument("--csv", default=REGIONAL_CSV)
+    parser.add_argument("--level", choices=HIERARCHY, default="bezirk")
+    parser.add_argument("--year", type=int)
+    args = parser.parse_args(argv)
+
+    rollup = compute_rollup(pd.read_csv(args.csv, low_memory=False))
+    columns = ["area_name", "year", "mission_count_all",
+               "response_time_ems_critical_mean", "response_time_ems_critical_std"]
+    print(level_rows(rollup, args.level, args.year)[columns].to_string(index=False))
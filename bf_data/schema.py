@@ -0,0 +1,160 @@
+"""Central column schema for the mission data.
+
+Every column gets one compact type that is used both when the Parquet store
+is written and when it is read back:
+
+* low-cardinality text (mission type, district, dispatch codes, unit flags)
+  is dictionary encoded and arrives in pandas as ``category``
+* ``response_time`` is ``float32`` and the partition ``year`` is ``int16``
+* the calendar features added at ingest are ``int8`` / ``bool``
+
+``PAGE_COLUMNS`` records which raw columns each page depends on, and the
+memory report compares that projection against a plain ``read_csv`` load
+(and lists the shared cube the pages actually keep in memory).
+
+    python -m bf_data schema
+"""
+
+import argparse
+
+import pyarrow as pa
+
+DATE_COLUMN = "mission_created_date"
+
+SMALL_CATEGORY = pa.dictionary(pa.int8(), pa.string())
+CATEGORY = pa.dictionary(pa.int16(), pa.string())
+
+MISSION_SCHEMA = {
+    "mission_created_date": pa.timestamp("ms"),
+    "mission_type": SMALL_CATEGORY,
+    "dispatchcode_category": CATEGORY,
+    "dispatchcode_criticality": CATEGORY,
+    "mission_location_district": SMALL_CATEGORY,
+    "response_time": pa.float32(),
+    "units_non_berlin_involed": SMALL_CATEGORY,
+    "units_several_involved": SMALL_CATEGORY,
+    "units_reinforcements_called": SMALL_CATEGORY,
+    "units_organisations": CATEGORY,
+    "firstresponder_alarmed": SMALL_CATEGORY,
+    "firstresponder_indication": SMALL_CATEGORY,
+    "firstresponder_first_arrival": SMALL_CATEGORY,
+    "units_first_type": CATEGORY,
+    "emergency_doctor_involved": SMALL_CATEGORY,
+    # row quality bitmask, see bf_data.quality
+    "quality": pa.uint8(),
+    "year": pa.int16(),
+    # calendar features, see bf_data.calendar_features
+    "month": pa.int8(),
+    "iso_week": pa.int8(),
+    "weekday": pa.int8(),
+    "hour": pa.int8(),
+    "is_weekend": pa.bool_(),
+    "is_holiday": pa.bool_(),
+}
+
+# Bezirk number (the LOR id of the Bezirk) -> its mission_location_district value.
+BEZIRKE = {
+    1: "MITTE",
+    2: "FRIEDRICHSHAIN-KREUZBERG",
+    3: "PANKOW",
+    4: "CHARLOTTENBURG-WILMERSDORF",
+    5: "SPANDAU",
+    6: "STEGLITZ-ZEHLENDORF",
+    7: "TEMPELHOF-SCHÖNEBERG",
+    8: "NEUKÖLLN",
+    9: "TREPTOW-KÖPENICK",
+    10: "MARZAHN-HELLERSDORF",
+    11: "LICHTENBERG",
+    12: "REINICKENDORF",
+}
+
+NUMERIC_COLUMNS = [
+    col for col, type_ in MISSION_SCHEMA.items()
+    if pa.types.is_floating(type_)
+]
+
+# Raw columns each page's charts are derived from.
+PAGE_COLUMNS = {
+    "1_Overview.py": ["year", "mission_type", "mission_location_district", "response_time"],
+    "2_Time_Patterns.py": ["year", "mission_location_district"],
+    "3_Mission_Types.py": ["mission_type", "response_time"],
+    "4_Location_Trends.py": ["weekday", "hour", "response_time"],
+    "5_Location_Incidents.py": ["year", "mission_type", "mission_location_district"],
+}
+
+
+def arrow_type(column):
+    """Storage type for ``column``; unknown columns are kept as plain text."""
+    return MISSION_SCHEMA.get(column, pa.string())
+
+
+def arrow_schema(columns):
+    return pa.schema([pa.field(col, arrow_type(col)) for col in columns])
+
+
+def conform(table):
+    """Cast ``table`` to the schema types, e.g. for stores written before it."""
+    target = arrow_schema(table.column_names)
+    if table.schema.equals(target):
+        return table
+    return table.cast(target)
+
+
+# =========================
+# MEMORY REPORT
+# =========================
+def naive_bytes(csv_path):
+    """Bytes of the frame a plain ``pd.read_csv`` of the raw file produces.
+
+    This is the load the pages used to do: every raw column, pandas' default
+    dtypes, only the date parsed.
+    """
+    import pandas as pd
+
+    naive = pd.read_csv(csv_path, parse_dates=[DATE_COLUMN], low_memory=False)
+    return int(naive.memory_usage(deep=True, index=False).sum())
+
+
+def memory_report(pages=None, csv_path=None):
+    """Per-page bytes for the naive load vs the projected compact load."""
+    import pandas as pd
+
+    from .cube import load_cube
+    from .paths import MISSIONS_CSV
+    from .store import load_missions
+
+    cube_bytes = int(load_cube().memory_usage(deep=True, index=False).sum())
+    full = load_missions()
+    naive = naive_bytes(MISSIONS_CSV if csv_path is None else csv_path)
+    rows = []
+
+    for page, columns in PAGE_COLUMNS.items():
+        if pages and page not in pages:
+            continue
+
+        compact = full[columns]
+        compact_bytes = int(compact.memory_usage(deep=True, index=False).sum())
+
+        rows.append({
+            "page": page,
+            "columns": len(columns),
+            "naive_mb": naive / 1e6,
+            "compact_mb": compact_bytes / 1e6,
+            "saving_pct": 100 * (1 - compact_bytes / naive),
+            "shared_cube_mb": cube_bytes / 1e6,
+        })
+
+    return pd.DataFrame(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m bf_data schema",
+        description="Show per-page memory of the compact projected load."
+    )
+    parser.add_argument("pages", nargs="*")
+    parser.add_argument("--csv", default=None, help="raw mission CSV for the naive baseline")
+    args = parser.parse_args(argv)
+
+    report = memory_report(args.pages, args.csv)
+    print(report.to_string(index=False, float_format=lambda v: f"{v:,.1f}"))
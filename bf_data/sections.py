@@ -0,0 +1,81 @@
+"""Concurrent execution of independent page sections.
+
+A page that computes its KPIs, then its trend, then its mix waits for the
+sum of all three before the last one shows up. Most of that time is spent
+in pandas / NumPy kernels and Arrow reads that release the GIL, so the
+sections can run side by side on a thread pool instead.
+
+Only the computation moves to the pool. Rendering stays on the caller's
+thread (Streamlit elements may only be created by the script thread): the
+page reserves a placeholder per section up front and fills it in as soon
+as that section finishes, in completion order, so the first chart appears
+after the fastest section rather than after all of them.
+
+    for name, value in run_sections({"kpi": load_overview, "mix": lambda: figure("overview_mix")}):
+        ...
+
+or, with a render callback per section, :func:`render_sections`.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+MAX_WORKERS = int(os.environ.get("BF_SECTION_WORKERS", min(8, (os.cpu_count() or 1) + 4)))
+
+_executor = None
+_lock = threading.Lock()
+_timings = {}
+
+
+def executor():
+    """The process-wide section pool, shared by every session."""
+    global _executor
+
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="bf-section")
+        return _executor
+
+
+def _timed(name, compute):
+    start = time.perf_counter()
+    try:
+        return compute()
+    finally:
+        _timings[name] = time.perf_counter() - start
+
+
+def run_sections(sections, pool=None):
+    """Run ``{name: callable}`` concurrently; yield ``(name, result)`` as each finishes.
+
+    A failing section raises from the ``yield`` that would have delivered
+    it. Sections not started yet are cancelled when the caller stops
+    iterating (e.g. a Streamlit rerun interrupts the script).
+    """
+    pool = pool or executor()
+    futures = {pool.submit(_timed, name, compute): name for name, compute in sections.items()}
+    try:
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def render_sections(sections, pool=None):
+    """Run ``{name: (compute, render)}`` and ``render(result)`` each on this thread.
+
+    Returns the names in the order they finished.
+    """
+    order = []
+    for name, result in run_sections({name: compute for name, (compute, _) in sections.items()}, pool):
+        sections[name][1](result)
+        order.append(name)
+    return order
+
+
+def timings():
+    """Seconds the last run of each section took, by section name."""
+    return dict(_timings)
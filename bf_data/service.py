@@ -0,0 +1,378 @@
+"""Local HTTP/JSON query service over the shared aggregates.
+
+The dashboard workers and the analysis notebook each load and roll up the
+same cube, sketches, pyramid and regional tables. This service holds them
+once in one process and answers group-by / filter queries over HTTP:
+
+    POST /query/<source>   JSON parameters -> JSON result
+    GET  /sources          sources and their parameters
+    GET  /stats            cache and coalescing counters
+    GET  /health
+
+Identical queries that arrive while one is being computed wait for that
+computation instead of repeating it, and results are kept, serialized, in
+an LRU keyed by the query and the version of the data it was computed
+from, so an ingest or a rebuilt snapshot never serves a stale answer.
+
+    python -m bf_data serve [--port 8765]
+
+From a notebook (or another process)::
+
+    from bf_data.service import ask
+    ask("cube", by=["year", "mission_type"], filters={"district": "MITTE"})
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import OrderedDict, namedtuple
+from concurrent.futures import Future
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from .compliance import load_compliance
+from .cube import load_cube, query
+from .forecast import load_forecast
+from .pyramid import LEVELS, MAX_BINS, districts, load_pyramid, series
+from .rollup import HIERARCHY, level_rows, load_rollup
+from .shared import dataset_of
+from .sketch import KEYS, QUANTILES, load_sketches, quantiles
+from .streaming import load_overview
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_URL = os.environ.get("BF_QUERY_URL", f"http://{DEFAULT_HOST}:{DEFAULT_PORT}")
+
+DEFAULT_MAX_ENTRIES = 512
+
+
+class QueryError(ValueError):
+    """A query whose parameters failed validation; answered with 400."""
+
+
+# =========================
+# SOURCES
+# =========================
+def _check(value, allowed, what):
+    """Raise :class:`QueryError` unless every ``value`` is in ``allowed``."""
+    values = list(value) if isinstance(value, (list, tuple, dict)) else [value]
+    unknown = [v for v in values if not isinstance(v, str) or v not in allowed]
+    if unknown:
+        raise QueryError(f"unknown {what} {', '.join(map(repr, unknown))}")
+
+
+def _where(frame, filters):
+    """Rows of ``frame`` matching equality / membership ``filters``."""
+    _check(filters or {}, frame.columns, "filter column")
+    mask = np.ones(len(frame), dtype=bool)
+    for col, value in (filters or {}).items():
+        if isinstance(value, list):
+            mask &= frame[col].isin(value).to_numpy()
+        else:
+            mask &= (frame[col] == value).to_numpy()
+    return frame[mask]
+
+
+def _cube(data, by=(), filters=None):
+    by = [by] if isinstance(by, str) else by
+    _check(by, data["cube"].columns, "column")
+    _check(filters or {}, data["cube"].columns, "filter column")
+    return query(data["cube"], list(by), **(filters or {}))
+
+
+def _quantiles(data, by=(), q=QUANTILES, filters=None):
+    by = [by] if isinstance(by, str) else by
+    _check(by, KEYS, "column")
+    _check(filters or {}, KEYS, "filter column")
+    valid = isinstance(q, (list, tuple)) and all(isinstance(v, (int, float)) and 0 <= v <= 1 for v in q)
+    if not valid:
+        raise QueryError(f"quantiles must be numbers in [0, 1], got {q!r}")
+    return quantiles(data["sketches"], list(by), tuple(q), **(filters or {}))
+
+
+def _series(data, district=None, start=None, end=None, level=None, max_bins=MAX_BINS):
+    if district is not None:
+        _check(district, districts(data["pyramid"]), "district")
+    if level is not None:
+        _check(level, LEVELS, "level")
+    try:
+        start, end = (None if t is None else pd.Timestamp(t) for t in (start, end))
+    except (TypeError, ValueError) as exc:
+        raise QueryError(f"bad start / end: {exc}") from None
+    _, rows = series(data["pyramid"], district, start, end, level, max_bins)
+    return rows
+
+
+def _forecast(data, filters=None):
+    return _where(data["forecast"], filters)
+
+
+def _rollup(data, level="district_area", year=None, filters=None):
+    _check(level, HIERARCHY, "level")
+    return _where(level_rows(data["rollup"], level, year), filters)
+
+
+def _compliance(data, filters=None):
+    return _where(data["compliance"], filters)
+
+
+def _overview(data):
+    return data["overview"]
+
+
+Source = namedtuple("Source", ["run", "loaders", "params"])
+
+SOURCES = {
+    "cube": Source(_cube, {"cube": load_cube}, ["by", "filters"]),
+    "quantiles": Source(_quantiles, {"sketches": load_sketches}, ["by", "q", "filters"]),
+    "series": Source(_series, {"pyramid": load_pyramid}, ["district", "start", "end", "level", "max_bins"]),
+    "forecast": Source(_forecast, {"forecast": load_forecast}, ["filters"]),
+    "rollup": Source(_rollup, {"rollup": load_rollup}, ["level", "year", "filters"]),
+    "compliance": Source(_compliance, {"compliance": load_compliance}, ["filters"]),
+    "overview": Source(_overview, {"overview": load_overview}, []),
+}
+
+
+def _version(data):
+    """Version of a loaded source: the snapshot version or a result's ``"version"``."""
+    dataset = dataset_of(data) if hasattr(data, "columns") else None
+    if dataset is not None:
+        return [dataset.path.name, dataset.version]
+    return data.get("version") if isinstance(data, dict) else None
+
+
+def _serialize(source, version, result):
+    reply = {"source": source, "version": version}
+    if isinstance(result, pd.DataFrame):
+        # pandas' own encoder handles NaN / NaT and numpy scalars.
+        frame = result.to_json(orient="split", index=False, date_format="iso", date_unit="ms")
+        reply["dates"] = [col for col in result.columns if result[col].dtype.kind == "M"]
+        reply["frame"] = json.loads(frame)
+    else:
+        reply["value"] = result
+    return json.dumps(reply, default=str).encode()
+
+
+# =========================
+# ENGINE
+# =========================
+class QueryEngine:
+    """Runs source queries with request coalescing and a result LRU.
+
+    :meth:`run` returns the serialized JSON of a result. The key is the
+    source, the canonical JSON of its parameters and the data version, so
+    results are reused across callers until the data behind them changes.
+    """
+
+    def __init__(self, sources=SOURCES, max_entries=DEFAULT_MAX_ENTRIES):
+        self.sources = sources
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.errors = 0
+        self._results = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def run(self, source, params=None):
+        if source not in self.sources:
+            raise QueryError(f"unknown source {source!r}")
+        spec = self.sources[source]
+        params = dict(params or {})
+        unknown = set(params) - set(spec.params)
+        if unknown:
+            raise QueryError(f"unknown parameters for {source!r}: {', '.join(sorted(unknown))}")
+
+        data = {name: load() for name, load in spec.loaders.items()}
+        version = [_version(value) for value in data.values()]
+        key = (source, json.dumps(params, sort_keys=True, default=str), json.dumps(version, default=str))
+
+        with self._lock:
+            body = self._results.get(key)
+            if body is not None:
+                self._results.move_to_end(key)
+                self.hits += 1
+                return body
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            body = _serialize(source, version, spec.run(data, **params))
+        except BaseException as exc:
+            with self._lock:
+                self.errors += 1
+                del self._inflight[key]
+            future.set_exception(exc)
+            raise
+
+        with self._lock:
+            self._results[key] = body
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+            del self._inflight[key]
+        future.set_result(body)
+        return body
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "results": len(self._results),
+                "max_entries": self.max_entries,
+                "inflight": len(self._inflight),
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "errors": self.errors,
+            }
+
+
+# =========================
+# HTTP
+# =========================
+class QueryHandler(BaseHTTPRequestHandler):
+    engine = None
+    server_version = "bf-data-query/1"
+
+    def _send(self, status, body):
+        if not isinstance(body, bytes):
+            body = json.dumps(body, default=str).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(HTTPStatus.OK, {"status": "ok"})
+        elif self.path == "/sources":
+            self._send(HTTPStatus.OK, {name: spec.params for name, spec in self.engine.sources.items()})
+        elif self.path == "/stats":
+            self._send(HTTPStatus.OK, self.engine.stats())
+        else:
+            self._send(HTTPStatus.NOT_FOUND, {"error": f"no route {self.path}"})
+
+    def do_POST(self):
+        prefix = "/query/"
+        if not self.path.startswith(prefix):
+            self._send(HTTPStatus.NOT_FOUND, {"error": f"no route {self.path}"})
+            return
+        source = self.path[len(prefix):]
+        if source not in self.engine.sources:
+            self._send(HTTPStatus.NOT_FOUND, {"error": f"unknown source {source!r}"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            params = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError as exc:
+            self._send(HTTPStatus.BAD_REQUEST, {"error": f"bad request body: {exc}"})
+            return
+        if not isinstance(params, dict):
+            self._send(HTTPStatus.BAD_REQUEST, {"error": "parameters must be a JSON object"})
+            return
+
+        # Only validated parameters are the caller's fault; anything else that
+        # goes wrong while answering is a server error.
+        try:
+            body = self.engine.run(source, params)
+        except QueryError as exc:
+            self._send(HTTPStatus.BAD_REQUEST, {"error": str(exc)})
+        except Exception as exc:
+            self._send(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(exc).__name__}: {exc}"})
+        else:
+            self._send(HTTPStatus.OK, body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def make_server(host=DEFAULT_HOST, port=DEFAULT_PORT, engine=None, verbose=False):
+    """A threading HTTP server answering queries from ``engine``."""
+    handler = type("Handler", (QueryHandler,), {"engine": engine or QueryEngine()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.verbose = verbose
+    return server
+
+
+# =========================
+# CLIENT
+# =========================
+def ask(source, url=DEFAULT_URL, timeout=60, **params):
+    """Run a query against a running service.
+
+    Frame results come back as a ``DataFrame`` (date columns parsed), other
+    results (e.g. ``overview``) as they were returned.
+    """
+    request = urllib.request.Request(
+        f"{url}/query/{source}",
+        data=json.dumps(params, default=str).encode(),
+        headers={"Content-Type": "application/json"},
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            reply = json.loads(response.read())
+    except urllib.error.HTTPError as exc:
+        raise RuntimeError(json.loads(exc.read()).get("error", exc.reason)) from None
+
+    if "frame" not in reply:
+        return reply["value"]
+    frame = pd.DataFrame(reply["frame"]["data"], columns=reply["frame"]["columns"])
+    for col in reply["dates"]:
+        frame[col] = pd.to_datetime(frame[col])
+    return frame
+
+
+# =========================
+# CLI
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m bf_data serve",
+        description="Serve group-by / filter queries over the shared aggregates."
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--max-entries", type=int, default=DEFAULT_MAX_ENTRIES)
+    parser.add_argument("--no-warm", action="store_true", help="load sources on first query instead")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+
+    engine = QueryEngine(max_entries=args.max_entries)
+    if not args.no_warm:
+        start = time.perf_counter()
+        for name, spec in engine.sources.items():
+            for load in spec.loaders.values():
+                load()
+        print(f"Loaded {len(engine.sources)} sources in {time.perf_counter() - start:.1f}s")
+
+    server = make_server(args.host, args.port, engine, args.verbose)
+    print(f"Serving on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
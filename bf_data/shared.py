@@ -0,0 +1,230 @@
+"""Process-wide, read-only, memory-mapped datasets.
+
+``st.cache_data`` pickles the cached DataFrame and hands every caller its own
+unpickled copy, and an uncached page keeps a private copy per session. Here
+each dataset is written once as an uncompressed Arrow IPC file and memory
+mapped; all sessions in the process share one handle, and the numeric
+columns of its DataFrame are zero-copy views of the mapped file.
+
+The shared frame is frozen: assigning through ``.loc`` / ``.iloc``, adding,
+replacing or dropping columns and ``inplace=True`` operations raise
+:class:`ReadOnlyDataError`, and its buffers are flagged read-only so writes
+through ``.to_numpy()`` fail in numpy. Derived frames (filters, groupbys,
+``.copy()``) are ordinary mutable DataFrames.
+
+Snapshots that are written sorted by some keys can be sliced through
+:meth:`SharedDataset.index` (see :mod:`bf_data.index`); the shared frame
+keeps a reference to its handle so helpers can find the index from the frame.
+
+Sessions are threads of one process, so loaders wrap their "stale? then
+rebuild" step in :func:`build_lock`: the first session rebuilds, the others
+wait and then find the artifact fresh.
+"""
+
+import os
+import threading
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.ipc as ipc
+
+from .index import SliceIndex
+
+_handles = {}
+_build_locks = {}
+_lock = threading.Lock()
+
+
+class ReadOnlyDataError(TypeError):
+    """Raised when code tries to mutate a shared dataset in place."""
+
+
+# =========================
+# FROZEN DATAFRAME
+# =========================
+def _refuse(self, *args, **kwargs):
+    raise ReadOnlyDataError(
+        "Shared datasets are read-only; work on a filtered result or .copy() instead."
+    )
+
+
+class _ReadOnlyIndexer:
+    """``.loc`` / ``.iloc`` / ``.at`` / ``.iat`` that only allow reading."""
+
+    def __init__(self, indexer):
+        self._indexer = indexer
+
+    def __getitem__(self, key):
+        return self._indexer[key]
+
+    __setitem__ = _refuse
+
+
+class ReadOnlyFrame(pd.DataFrame):
+    """DataFrame whose columns and values cannot be changed in place."""
+
+    @property
+    def _constructor(self):
+        return pd.DataFrame
+
+    @property
+    def loc(self):
+        return _ReadOnlyIndexer(super().loc)
+
+    @property
+    def iloc(self):
+        return _ReadOnlyIndexer(super().iloc)
+
+    @property
+    def at(self):
+        return _ReadOnlyIndexer(super().at)
+
+    @property
+    def iat(self):
+        return _ReadOnlyIndexer(super().iat)
+
+    __setitem__ = _refuse
+    __delitem__ = _refuse
+    insert = _refuse
+    pop = _refuse
+    update = _refuse
+    _update_inplace = _refuse
+
+    def __setattr__(self, name, value):
+        if name in ("index", "columns") or (
+            not name.startswith("_") and name in getattr(self, "columns", ())
+        ):
+            _refuse(self)
+        super().__setattr__(name, value)
+
+
+def freeze(df):
+    """Wrap ``df`` as a :class:`ReadOnlyFrame` with read-only buffers."""
+    for block in df._mgr.blocks:
+        values = getattr(block.values, "_ndarray", block.values)
+        if hasattr(values, "flags"):
+            values.flags.writeable = False
+
+    return ReadOnlyFrame(df, copy=False)
+
+
+# =========================
+# ARROW SNAPSHOTS
+# =========================
+def sort_table(table, keys):
+    """``table`` ordered by ``keys``; dictionary columns sort by their values."""
+    columns = {
+        key: table[key].cast(table[key].type.value_type)
+        if pa.types.is_dictionary(table[key].type) else table[key]
+        for key in keys
+    }
+    order = pc.sort_indices(
+        pa.table(columns),
+        sort_keys=[(key, "ascending") for key in keys],
+    )
+    return table.take(order)
+
+
+def build_lock(path):
+    """Process-wide lock for checking and rebuilding the artifact at ``path``."""
+    key = Path(path).absolute()
+    with _lock:
+        return _build_locks.setdefault(key, threading.RLock())
+
+
+def temp_path(path):
+    """A sibling of ``path`` to write to before ``os.replace``, unique per thread."""
+    return Path(path).with_suffix(f".{os.getpid()}-{threading.get_ident()}.tmp")
+
+
+def write_snapshot(table, path, sort_by=None):
+    """Write ``table`` as an uncompressed Arrow IPC file, atomically.
+
+    With ``sort_by`` the rows are stored ordered by those columns, so every
+    key value is a contiguous run (see :meth:`SharedDataset.index`).
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = temp_path(path)
+
+    table = table.unify_dictionaries().combine_chunks()
+    if sort_by:
+        table = sort_table(table, sort_by)
+    with ipc.new_file(tmp_path, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp_path, path)
+
+
+def is_stale(path, source):
+    """True when ``path`` is missing or older than the file/dir ``source``."""
+    path = Path(path)
+    if not path.exists():
+        return True
+    return Path(source).exists() and Path(source).stat().st_mtime_ns > path.stat().st_mtime_ns
+
+
+class SharedDataset:
+    """A memory-mapped Arrow file and its frozen pandas view."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.version = self.path.stat().st_mtime_ns
+        self.table = ipc.open_file(pa.memory_map(str(self.path), "r")).read_all()
+        self._derived = {}
+        self._derived_lock = threading.RLock()
+
+    @property
+    def frame(self):
+        """Frozen pandas view of the table, converted on first use."""
+        return self.derived("frame", self._to_frame)
+
+    def _to_frame(self):
+        frame = freeze(self.table.to_pandas(split_blocks=True, self_destruct=False))
+        object.__setattr__(frame, "_dataset", self)
+        return frame
+
+    def derived(self, key, build):
+        """Memoize ``build()`` for the lifetime of this handle (one file version)."""
+        with self._derived_lock:
+            if key not in self._derived:
+                self._derived[key] = build()
+            return self._derived[key]
+
+    def index(self, keys):
+        """:class:`SliceIndex` of the frame over ``keys`` (built once)."""
+        keys = tuple(keys)
+        return self.derived(("index", keys), lambda: SliceIndex(self.frame, keys))
+
+    @property
+    def nbytes(self):
+        return self.table.nbytes
+
+
+def open_shared(path):
+    """Return the process-wide handle for the Arrow file at ``path``.
+
+    The file must exist; loaders create it under :func:`build_lock` first.
+    A handle is reopened when the file on disk has been replaced.
+    """
+    path = Path(path)
+
+    with _lock:
+        version = path.stat().st_mtime_ns
+        handle = _handles.get(path)
+        if handle is None or handle.version != version:
+            handle = SharedDataset(path)
+            _handles[path] = handle
+        return handle
+
+
+def dataset_of(frame):
+    """The :class:`SharedDataset` behind a shared frame, or ``None``."""
+    return frame.__dict__.get("_dataset")
+
+
+def release(path):
+    """Forget the handle for ``path``; live references keep their mapping."""
+    with _lock:
+        _handles.pop(Path(path), None)
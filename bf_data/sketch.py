@@ -0,0 +1,206 @@
+"""Mergeable response-time quantile sketches.
+
+A mean hides the tail that time goals are about, and exact percentiles need
+a sort over the raw rows. Instead every (district, year, mission_type, hour)
+cell keeps a DDSketch-style histogram: response times fall into
+logarithmic buckets ``ceil(log_gamma(rt))`` with ``gamma = (1 + a) / (1 - a)``,
+so any quantile read back from the buckets is within relative accuracy ``a``
+(1 %) of the true value. Bucket counts simply add up, so the sketch of any
+slice - a district, a mission type, all of Berlin - is the sum of its cells'
+buckets and p50 / p90 / p95 come out of a small groupby.
+
+The sketch table is stored like the cube: sorted by (district, year) next to
+it and served from a shared memory-mapped snapshot.
+
+    python -m bf_data sketch
+"""
+
+import argparse
+import os
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from .calendar_features import add_calendar
+from .cube import INDEX_KEYS, select
+from .paths import MISSIONS_DIR, SKETCH_PATH
+from .quality import response_times
+from .shared import build_lock, is_stale, open_shared, temp_path, write_snapshot
+from .store import missions_dataset, watermark_path
+from .streaming import store_batches
+
+RELATIVE_ACCURACY = 0.01
+GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+LOG_GAMMA = np.log(GAMMA)
+
+KEYS = ["district", "year", "mission_type", "hour"]
+SORT_ORDER = INDEX_KEYS + [k for k in KEYS if k not in INDEX_KEYS] + ["bucket"]
+QUANTILES = (0.5, 0.9, 0.95)
+
+SOURCE_COLUMNS = ["year", "hour", "mission_type", "mission_location_district", "response_time", "quality"]
+
+
+# =========================
+# BUCKETS
+# =========================
+def bucket_of(rt):
+    """Log bucket index of positive response times."""
+    return np.ceil(np.log(rt) / LOG_GAMMA).astype("int16")
+
+
+def bucket_value(bucket):
+    """Representative value of a bucket (relative error <= RELATIVE_ACCURACY)."""
+    return 2 * GAMMA ** np.asarray(bucket, dtype="float64") / (GAMMA + 1)
+
+
+# =========================
+# BUILD
+# =========================
+def sketch_cells(df):
+    """Bucket counts per cell for raw mission rows (usable response times only)."""
+    if "hour" not in df.columns:
+        df = add_calendar(df)
+    if "year" not in df.columns:
+        df = df.assign(year=df["mission_created_date"].dt.year)
+
+    rt = response_times(df)
+    valid = ~np.isnan(rt)
+
+    cells = pd.DataFrame({
+        "district": df["mission_location_district"].to_numpy()[valid],
+        "year": df["year"].to_numpy()[valid].astype("int16"),
+        "mission_type": df["mission_type"].to_numpy()[valid],
+        "hour": df["hour"].to_numpy()[valid].astype("int8"),
+        "bucket": bucket_of(rt[valid]),
+    })
+    return (
+        cells.groupby(KEYS + ["bucket"], dropna=False, observed=True)
+        .size()
+        .rename("count")
+        .reset_index()
+    )
+
+
+def fold(parts):
+    """Merge sketch tables: bucket counts of equal cells add up."""
+    return (
+        pd.concat(parts, ignore_index=True)
+        .astype({"district": object, "mission_type": object})
+        .groupby(KEYS + ["bucket"], dropna=False, observed=True)["count"].sum()
+        .reset_index()
+        .astype({"district": "category", "mission_type": "category", "count": "int64"})
+    )
+
+
+def build_sketches(missions_dir=MISSIONS_DIR, sketch_path=SKETCH_PATH, batch_size=1_000_000):
+    """Rebuild the sketch table from the mission store in one streaming pass."""
+    names = missions_dataset(missions_dir).schema.names
+    columns = [c for c in SOURCE_COLUMNS if c in names]
+    if "hour" not in names:
+        columns.append("mission_created_date")
+
+    parts = []
+    pending = 0
+    for batch in store_batches(columns, missions_dir, batch_size):
+        cells = sketch_cells(batch.to_pandas())
+        parts.append(cells)
+        pending += len(cells)
+        if pending > 4 * batch_size:
+            parts = [fold(parts)]
+            pending = len(parts[0])
+
+    sketches = fold(parts)
+    save_sketches(sketches, sketch_path)
+    return sketches
+
+
+def save_sketches(sketches, sketch_path=SKETCH_PATH):
+    sketch_path = Path(sketch_path)
+    tmp_path = temp_path(sketch_path)
+    sketches = sketches.sort_values(SORT_ORDER, kind="stable", na_position="last", ignore_index=True)
+    sketches.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, sketch_path)
+
+
+# =========================
+# LOAD
+# =========================
+def load_sketches(sketch_path=SKETCH_PATH, missions_dir=MISSIONS_DIR):
+    """Return the shared sketch table, rebuilding it if the store is newer."""
+    sketch_path = Path(sketch_path)
+    source = watermark_path(missions_dir)
+    if not source.exists():
+        source = Path(missions_dir)
+
+    snapshot = sketch_path.with_suffix(".arrow")
+    with build_lock(sketch_path):
+        if is_stale(sketch_path, source):
+            build_sketches(missions_dir, sketch_path)
+
+        if is_stale(snapshot, sketch_path):
+            write_snapshot(pq.read_table(sketch_path), snapshot, sort_by=SORT_ORDER)
+
+    return open_shared(snapshot).frame
+
+
+# =========================
+# QUERY
+# =========================
+def quantiles(sketches, by=(), q=QUANTILES, **filters):
+    """Response-time quantiles per ``by`` group after ``filters``.
+
+    Returns one row per group with ``n`` (valid response times) and a
+    ``p50`` / ``p90`` / ... column per requested quantile.
+
+    >>> quantiles(sketches, ["mission_type"], district="MITTE", year=2024)
+    """
+    by = list(by)
+    keys = by or ["_all"]
+    sub = select(sketches, **filters)
+    if not by:
+        sub = sub.assign(_all=0)
+
+    merged = sub.groupby(keys + ["bucket"], observed=True, sort=True)["count"].sum().reset_index()
+    merged = merged[merged["count"] > 0]
+
+    # Groups are contiguous runs sorted by bucket, so one global cumulative
+    # sum plus a searchsorted per quantile finds every group's bucket.
+    counts = merged["count"].to_numpy()
+    cum = np.cumsum(counts)
+    starts = np.flatnonzero(merged[keys].ne(merged[keys].shift()).any(axis=1).to_numpy())
+    n = np.add.reduceat(counts, starts) if len(starts) else np.zeros(0, dtype="int64")
+    before = cum[starts] - counts[starts]
+
+    out = merged.iloc[starts][keys].reset_index(drop=True)
+    out["n"] = n
+    buckets = merged["bucket"].to_numpy()
+    for quantile in q:
+        # DDSketch rank rule: first bucket whose cumulative count exceeds q * (n - 1).
+        hit = np.searchsorted(cum, before + quantile * (n - 1), side="right")
+        out[f"p{round(quantile * 100):g}"] = bucket_value(buckets[hit])
+
+    return out.drop(columns="_all") if not by else out
+
+
+# =========================
+# CLI
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m bf_data sketch",
+        description="Rebuild the response-time quantile sketches."
+    )
+    parser.add_argument("--missions", default=MISSIONS_DIR)
+    parser.add_argument("--out", default=SKETCH_PATH)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    sketches = build_sketches(args.missions, args.out)
+    elapsed = time.perf_counter() - start
+
+    print(f"Wrote {len(sketches):,} buckets for {sketches.groupby(KEYS, observed=True).ngroups:,} cells "
+          f"to {args.out} in {elapsed:.1f}s")
+    print(quantiles(sketches, ["mission_type"]).to_string(index=False))
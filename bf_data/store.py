@@ -0,0 +1,385 @@
+"""Year-partitioned Parquet store for the mission data.
+
+The raw ``Berlin_Missions_2020_2025.csv`` is converted once into
+``<STORE_DIR>/missions/year=YYYY/part-0.parquet``. Pages then read only the
+years and columns they need instead of re-parsing the whole CSV on every run.
+
+    python -m bf_data store [path/to/missions.csv]
+"""
+
+import argparse
+import json
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from .calendar_features import CALENDAR_COLUMNS, add_calendar
+from .paths import MISSIONS_CSV, MISSIONS_DIR, QUALITY_PATH
+from .quality import QUALITY_COLUMN, add_quality, merge_counts, quality_counts, save_quality
+from .schema import DATE_COLUMN, NUMERIC_COLUMNS, arrow_schema, arrow_type, conform
+from .shared import build_lock, dataset_of, is_stale, open_shared, temp_path, write_snapshot
+
+MISSION_INDEX_KEYS = ["mission_location_district", "year"]
+
+PARTITIONING = ds.partitioning(pa.schema([("year", arrow_type("year"))]), flavor="hive")
+
+
+# =========================
+# CSV -> PARQUET
+# =========================
+def _column_names(header):
+    """Stripped CSV header names, ``mission_date`` renamed to the date column.
+
+    Blank names become ``Unnamed: i``; that is the index column pandas wrote
+    the file with, and both readers leave it out.
+    """
+    names = [str(name).strip() for name in header]
+    names = [DATE_COLUMN if name == "mission_date" else name for name in names]
+    return [
+        f"Unnamed: {i}" if not name or name.startswith("Unnamed: ") else name
+        for i, name in enumerate(names)
+    ]
+
+
+def _is_unnamed(name):
+    return name.startswith("Unnamed: ")
+
+
+def _clean_chunk(chunk):
+    chunk.columns = _column_names(chunk.columns)
+    chunk = chunk.drop(columns=[c for c in chunk.columns if _is_unnamed(c)])
+
+    chunk[DATE_COLUMN] = pd.to_datetime(chunk[DATE_COLUMN], errors="coerce")
+    for col in NUMERIC_COLUMNS:
+        if col in chunk.columns:
+            chunk[col] = pd.to_numeric(chunk[col], errors="coerce")
+
+    return chunk
+
+
+def read_csv_chunks(csv_path, chunksize=500_000, stats=None):
+    """Yield cleaned chunks of a mission CSV, skipping rows without a date.
+
+    The number of skipped rows is accumulated in ``stats["dropped"]``.
+    """
+    chunks = pd.read_csv(csv_path, chunksize=chunksize, dtype=str, low_memory=False)
+    for chunk in chunks:
+        chunk = _clean_chunk(chunk)
+        bad = chunk[DATE_COLUMN].isna()
+        if stats is not None:
+            stats["dropped"] = stats.get("dropped", 0) + int(bad.sum())
+        yield chunk[~bad]
+
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _parse_dates(column):
+    """Arrow timestamps of a text column; unparseable values become null.
+
+    The open-data format is parsed vectorized; whatever it misses goes
+    through ``pd.to_datetime`` like the pandas reader.
+    """
+    stamps = pc.strptime(column, format=DATE_FORMAT, unit="ms", error_is_null=True)
+    missed = pc.and_(pc.is_null(stamps), pc.is_valid(column))
+    if not pc.any(missed).as_py():
+        return stamps
+
+    fallback = pd.to_datetime(column.to_pandas(), errors="coerce").astype("datetime64[ms]")
+    return pc.if_else(missed, pa.array(fallback, pa.timestamp("ms")), stamps)
+
+
+def _parse_numbers(column):
+    try:
+        return pc.cast(column, pa.float64())
+    except pa.ArrowInvalid:
+        return pa.array(pd.to_numeric(column.to_pandas(), errors="coerce"), pa.float64())
+
+
+def read_csv_arrow(csv_path, block_size=32 << 20, stats=None, use_threads=True):
+    """Yield cleaned chunks of a mission CSV parsed by Arrow on all cores.
+
+    Drop-in for :func:`read_csv_chunks`: same columns, the same rows and
+    the same ``stats["dropped"]``. Arrow's streaming reader splits the file
+    into ``block_size`` blocks and tokenizes them on its thread pool; dates
+    and numbers are then converted per block in C++ instead of per value in
+    pandas. Dictionary columns of the schema (mission type, district, ...)
+    are dictionary encoded while parsing and arrive as ``category``.
+    """
+    with open(csv_path, encoding="utf-8") as f:
+        names = _column_names(f.readline().rstrip("\r\n").split(","))
+    wanted = [name for name in names if not _is_unnamed(name)]
+
+    reader = pv.open_csv(
+        csv_path,
+        read_options=pv.ReadOptions(
+            column_names=names, skip_rows=1, block_size=block_size, use_threads=use_threads
+        ),
+        convert_options=pv.ConvertOptions(
+            include_columns=wanted,
+            column_types={
+                name: pa.dictionary(pa.int32(), pa.string())
+                if pa.types.is_dictionary(arrow_type(name)) else pa.string()
+                for name in wanted
+            },
+            strings_can_be_null=True,
+        ),
+    )
+    for batch in reader:
+        columns = {name: batch.column(name) for name in wanted}
+        columns[DATE_COLUMN] = _parse_dates(columns[DATE_COLUMN])
+        for col in NUMERIC_COLUMNS:
+            if col in columns:
+                columns[col] = _parse_numbers(columns[col])
+
+        table = pa.table(columns)
+        valid = pc.is_valid(table[DATE_COLUMN])
+        if stats is not None:
+            stats["dropped"] = stats.get("dropped", 0) + len(table) - pc.sum(valid).as_py()
+        yield table.filter(valid).to_pandas()
+
+
+def csv_chunks(csv_path, engine="arrow", chunksize=500_000, stats=None):
+    """Cleaned chunks from the ``"arrow"`` or ``"pandas"`` reader.
+
+    ``chunksize`` (rows) only applies to pandas; Arrow chunks by bytes.
+    """
+    if engine == "pandas":
+        return read_csv_chunks(csv_path, chunksize, stats)
+    if engine == "arrow":
+        return read_csv_arrow(csv_path, stats=stats)
+    raise ValueError(f"unknown CSV engine {engine!r}")
+
+
+def write_partitions(frames, out_dir, part_name="part-0.parquet", quality=None):
+    """Stream cleaned frames into one Parquet file per year under ``out_dir``.
+
+    Calendar features and quality flags are added to frames that do not
+    carry them yet, and the quality counts of the written rows are added
+    into ``quality`` if given. Returns ``{year: rows_written}``.
+    """
+    out_dir = Path(out_dir)
+    writers = {}
+    rows = {}
+    schema = None
+
+    try:
+        for chunk in frames:
+            chunk = chunk.drop(columns=["year"], errors="ignore")
+            if not set(CALENDAR_COLUMNS) <= set(chunk.columns):
+                chunk = add_calendar(chunk)
+            if QUALITY_COLUMN not in chunk.columns:
+                chunk = add_quality(chunk)
+            if quality is not None:
+                quality.update(merge_counts(quality, quality_counts(chunk)))
+            if schema is None:
+                schema = arrow_schema(chunk.columns)
+
+            years = chunk[DATE_COLUMN].dt.year
+            for year, part in chunk.groupby(years):
+                year = int(year)
+                if year not in writers:
+                    path = out_dir / f"year={year}" / part_name
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    writers[year] = pq.ParquetWriter(path, schema)
+                    rows[year] = 0
+
+                table = pa.Table.from_pandas(part, preserve_index=False)
+                writers[year].write_table(table.select(schema.names).cast(schema))
+                rows[year] += len(part)
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    return rows
+
+
+def build_store(csv_path=MISSIONS_CSV, missions_dir=MISSIONS_DIR, chunksize=500_000, engine="arrow",
+                quality_path=QUALITY_PATH):
+    """Convert the mission CSV into the year-partitioned Parquet store.
+
+    The store is written to a temporary directory and swapped in at the end,
+    so a page that loads concurrently never sees a half-written partition.
+    The quality counts of the new store are saved to ``quality_path``.
+    """
+    missions_dir = Path(missions_dir)
+    missions_dir.parent.mkdir(parents=True, exist_ok=True)
+    stats = {}
+    quality = {}
+
+    tmp_dir = Path(tempfile.mkdtemp(prefix=".missions-", dir=missions_dir.parent))
+    try:
+        rows = write_partitions(csv_chunks(csv_path, engine, chunksize, stats), tmp_dir, quality=quality)
+        tmp_dir.chmod(0o755)
+        if missions_dir.exists():
+            shutil.rmtree(missions_dir)
+        tmp_dir.rename(missions_dir)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    write_watermark(missions_dir, max_created_date(missions_dir))
+    save_quality({**quality, "unparseable_dates": stats.get("dropped", 0)}, quality_path)
+
+    if stats.get("dropped"):
+        print(f"Skipped {stats['dropped']:,} rows without a parseable {DATE_COLUMN}")
+
+    return rows
+
+
+# =========================
+# WATERMARK
+# =========================
+def watermark_path(missions_dir=MISSIONS_DIR):
+    return Path(missions_dir).parent / "watermark.json"
+
+
+def max_created_date(missions_dir=MISSIONS_DIR):
+    dataset = ds.dataset(missions_dir, format="parquet", partitioning=PARTITIONING)
+    latest = pc.max(dataset.to_table(columns=[DATE_COLUMN]).column(0)).as_py()
+    return None if latest is None else pd.Timestamp(latest)
+
+
+def read_watermark(missions_dir=MISSIONS_DIR):
+    """Latest ``mission_created_date`` already in the store (or ``None``)."""
+    path = watermark_path(missions_dir)
+    if path.exists():
+        value = json.loads(path.read_text())[DATE_COLUMN]
+        return None if value is None else pd.Timestamp(value)
+
+    if Path(missions_dir).exists():
+        return max_created_date(missions_dir)
+    return None
+
+
+def write_watermark(missions_dir, value):
+    path = watermark_path(missions_dir)
+    tmp_path = temp_path(path)
+    tmp_path.write_text(json.dumps({
+        DATE_COLUMN: None if value is None else value.isoformat(),
+        "updated": pd.Timestamp.now().isoformat(timespec="seconds"),
+    }, indent=2))
+    tmp_path.replace(path)
+
+
+# =========================
+# LOADING
+# =========================
+def missions_dataset(missions_dir=MISSIONS_DIR):
+    """The Parquet dataset of the store at ``missions_dir``.
+
+    Only the default store is built on first use, from ``MISSIONS_CSV``; any
+    other directory has to exist already.
+    """
+    missions_dir = Path(missions_dir)
+
+    if not missions_dir.exists():
+        if missions_dir.absolute() != Path(MISSIONS_DIR).absolute():
+            raise FileNotFoundError(
+                f"No mission store at {missions_dir}. "
+                f"Run `python -m bf_data store <csv> --out {missions_dir}`."
+            )
+        if not Path(MISSIONS_CSV).exists():
+            raise FileNotFoundError(
+                f"No mission store at {missions_dir} and no CSV at {MISSIONS_CSV}. "
+                "Set BF_DATASET_DIR or run `python -m bf_data store <csv>`."
+            )
+        build_store(MISSIONS_CSV, missions_dir)
+
+    return ds.dataset(missions_dir, format="parquet", partitioning=PARTITIONING)
+
+
+def available_years(missions_dir=MISSIONS_DIR):
+    """Years present in the store, read from the partition directory names."""
+    missions_dir = Path(missions_dir)
+    if not missions_dir.exists():
+        missions_dataset(missions_dir)
+
+    return sorted(
+        int(path.name.split("=", 1)[1])
+        for path in missions_dir.glob("year=*")
+        if path.is_dir()
+    )
+
+
+def load_missions(columns=None, years=None, missions_dir=MISSIONS_DIR):
+    """Load mission rows from the Parquet store.
+
+    ``columns`` and ``years`` are pushed down to the reader, so only the
+    requested column chunks of the requested year partitions are read.
+    ``year`` is available as a column from the partition path. Columns come
+    back in their compact schema types (see :mod:`bf_data.schema`).
+    """
+    dataset = missions_dataset(missions_dir)
+
+    filter_ = None
+    if years is not None:
+        filter_ = ds.field("year").isin([int(y) for y in years])
+
+    table = dataset.to_table(columns=columns, filter=filter_)
+    return conform(table).to_pandas()
+
+
+def shared_missions(missions_dir=MISSIONS_DIR):
+    """All mission rows as one read-only frame shared by the whole process.
+
+    Backed by a memory-mapped Arrow snapshot of the store next to
+    ``missions_dir`` that is refreshed whenever the watermark moves. Rows are
+    sorted by (district, year); use :func:`select_missions` to slice them.
+    """
+    missions_dir = Path(missions_dir)
+    snapshot = missions_dir.parent / "missions.arrow"
+    dataset = missions_dataset(missions_dir)
+
+    with build_lock(snapshot):
+        if is_stale(snapshot, watermark_path(missions_dir)):
+            write_snapshot(conform(dataset.to_table()), snapshot, sort_by=MISSION_INDEX_KEYS)
+
+    return open_shared(snapshot).frame
+
+
+def select_missions(district=None, year=None, missions_dir=MISSIONS_DIR):
+    """Mission rows of one district and/or year from :func:`shared_missions`.
+
+    A district, or a district and year, is a zero-copy view of one contiguous
+    run of the sorted snapshot; a year alone gathers one run per district.
+    """
+    frame = shared_missions(missions_dir)
+    keys = {"mission_location_district": district, "year": year}
+    keys = {k: v for k, v in keys.items() if v is not None}
+    if not keys:
+        return frame
+    return dataset_of(frame).index(MISSION_INDEX_KEYS).take(frame, **keys)
+
+
+# =========================
+# CLI
+# =========================
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m bf_data store",
+        description="Build the year-partitioned mission store."
+    )
+    parser.add_argument("csv", nargs="?", default=MISSIONS_CSV)
+    parser.add_argument("--out", default=MISSIONS_DIR)
+    parser.add_argument("--chunksize", type=int, default=500_000)
+    parser.add_argument("--engine", choices=["arrow", "pandas"], default="arrow")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    # The quality counts belong to this store, not to the default one.
+    quality_path = Path(args.out).parent / QUALITY_PATH.name
+    rows = build_store(args.csv, args.out, args.chunksize, args.engine, quality_path)
+    elapsed = time.perf_counter() - start
+
+    for year, n in sorted(rows.items()):
+        print(f"year={year}: {n:,} rows")
+    print(f"Wrote {sum(rows.values()):,} rows to {args.out} in {elapsed:.1f}s")
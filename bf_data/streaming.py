@@ -0,0 +1,203 @@
+"""One-pass, constant-memory reducers over the mission rows.
+
+The overview KPIs (total incidents, districts covered, year range, mean
+response time) plus the yearly trend and the mission-type mix are all
+mergeable counts and sums, so they can be computed batch by batch from the
+Parquet store or straight from the raw CSV without ever holding the full
+frame. Memory is one record batch plus a few small dicts, whatever the file
+size.
+
+    python -m bf_data overview [--csv path/to/missions.csv]
+"""
+
+import argparse
+import json
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
+
+from .paths import MISSIONS_CSV, MISSIONS_DIR
+from .quality import QUALITY_COLUMN, response_times
+from .schema import DATE_COLUMN
+from .store import missions_dataset, watermark_path
+
+OVERVIEW_COLUMNS = ["year", "mission_type", "mission_location_district", "response_time"]
+
+_results = {}
+_lock = threading.Lock()
+
+
+# =========================
+# BATCH SOURCES
+# =========================
+def store_batches(columns, missions_dir=MISSIONS_DIR, batch_size=1_000_000):
+    dataset = missions_dataset(missions_dir)
+    yield from dataset.to_batches(columns=columns, batch_size=batch_size)
+
+
+def overview_batches(missions_dir=MISSIONS_DIR, batch_size=1_000_000):
+    """Overview columns from the store, with the quality flags if it has them."""
+    names = missions_dataset(missions_dir).schema.names
+    columns = [c for c in OVERVIEW_COLUMNS + [QUALITY_COLUMN] if c in names]
+    return store_batches(columns, missions_dir, batch_size)
+
+
+def csv_batches(columns, csv_path=MISSIONS_CSV, block_size=64 << 20):
+    """Stream record batches from the raw CSV; ``year`` is derived per batch."""
+    wanted = [c for c in columns if c != "year"]
+    if "year" in columns and DATE_COLUMN not in wanted:
+        wanted.append(DATE_COLUMN)
+
+    reader = pv.open_csv(
+        csv_path,
+        read_options=pv.ReadOptions(block_size=block_size),
+        convert_options=pv.ConvertOptions(
+            include_columns=wanted,
+            column_types={"response_time": pa.float64(), DATE_COLUMN: pa.timestamp("s")},
+            strings_can_be_null=True,
+        ),
+    )
+    for batch in reader:
+        if "year" in columns:
+            year = pc.year(batch.column(DATE_COLUMN))
+            batch = pa.RecordBatch.from_arrays(
+                [batch.column(c) for c in columns if c != "year"] + [year],
+                names=[c for c in columns if c != "year"] + ["year"],
+            )
+        yield batch
+
+
+# =========================
+# REDUCER
+# =========================
+def _add_counts(target, values):
+    for item in pc.value_counts(values).to_pylist():
+        key = item["values"]
+        target[key] = target.get(key, 0) + item["counts"]
+
+
+class OverviewReducer:
+    """Mergeable accumulator for the overview page."""
+
+    def __init__(self):
+        self.count = 0
+        self.rt_count = 0
+        self.rt_sum = 0.0
+        self.districts = set()
+        self.yearly = {}
+        self.mission_mix = {}
+
+    def update(self, batch):
+        self.count += batch.num_rows
+
+        rt = response_times(batch)
+        valid = ~np.isnan(rt)
+        self.rt_count += int(valid.sum())
+        self.rt_sum += float(rt[valid].sum())
+
+        districts = pc.unique(batch.column("mission_location_district").cast(pa.string()))
+        self.districts.update(d for d in districts.to_pylist() if d is not None)
+
+        _add_counts(self.yearly, batch.column("year"))
+        _add_counts(self.mission_mix, batch.column("mission_type").cast(pa.string()))
+        return self
+
+    def merge(self, other):
+        self.count += other.count
+        self.rt_count += other.rt_count
+        self.rt_sum += other.rt_sum
+        self.districts |= other.districts
+        for key, n in other.yearly.items():
+            self.yearly[key] = self.yearly.get(key, 0) + n
+        for key, n in other.mission_mix.items():
+            self.mission_mix[key] = self.mission_mix.get(key, 0) + n
+        return self
+
+    def result(self):
+        years = [y for y in self.yearly if y is not None]
+        return {
+            "count": self.count,
+            "districts": len(self.districts),
+            "year_min": min(years) if years else None,
+            "year_max": max(years) if years else None,
+            "rt_count": self.rt_count,
+            "rt_mean": self.rt_sum / self.rt_count if self.rt_count else None,
+            "yearly": {int(y): n for y, n in sorted(self.yearly.items()) if y is not None},
+            "mission_mix": dict(sorted(self.mission_mix.items(), key=lambda kv: -kv[1])),
+        }
+
+
+def stream_overview(batches):
+    reducer = OverviewReducer()
+    for batch in batches:
+        reducer.update(batch)
+    return reducer.result()
+
+
+# =========================
+# CACHED ENTRY POINT
+# =========================
+def load_overview(missions_dir=MISSIONS_DIR, csv_path=MISSIONS_CSV):
+    """Overview KPIs, computed by streaming and cached until the data changes.
+
+    Reads the Parquet store when there is one and the raw CSV otherwise. The
+    result is kept per process and in ``overview.json`` next to the store.
+    """
+    missions_dir = Path(missions_dir)
+    use_store = missions_dir.exists()
+    version_file = watermark_path(missions_dir) if use_store else Path(csv_path)
+    if not version_file.exists():
+        version_file = missions_dir
+    version = version_file.stat().st_mtime_ns
+    cache_file = missions_dir.parent / "overview.json"
+
+    with _lock:
+        cached = _results.get(cache_file)
+        if cached and cached["version"] == version:
+            return cached
+
+        if cache_file.exists():
+            cached = json.loads(cache_file.read_text())
+            cached["yearly"] = {int(y): n for y, n in cached["yearly"].items()}
+            if cached.get("version") == version:
+                _results[cache_file] = cached
+                return cached
+
+        if use_store:
+            batches = overview_batches(missions_dir)
+        else:
+            batches = csv_batches(OVERVIEW_COLUMNS, csv_path)
+
+        result = stream_overview(batches)
+        result["version"] = version
+        result["source"] = str(missions_dir if use_store else csv_path)
+
+        if cache_file.parent.exists():
+            cache_file.write_text(json.dumps(result, indent=2))
+        _results[cache_file] = result
+        return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m bf_data overview",
+        description="Compute the overview KPIs in one streaming pass."
+    )
+    parser.add_argument("--csv", help="stream the raw CSV instead of the Parquet store")
+    parser.add_argument("--missions", default=MISSIONS_DIR)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.csv:
+        result = stream_overview(csv_batches(OVERVIEW_COLUMNS, args.csv))
+    else:
+        result = stream_overview(overview_batches(args.missions))
+    elapsed = time.perf_counter() - start
+
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    print(f"Streamed {result['count']:,} rows in {elapsed:.1f}s")
@@ -0,0 +1,195 @@
+"""Synthetic mission rows for load testing.
+
+Rows have the columns the pages and the store use (``mission_created_date``,
+``mission_type``, ``dispatchcode_criticality``, ``mission_location_district``,
+``response_time``) and are calibrated from ``Berlin_Regional_2020_2025.csv``:
+
+* volume per (year, district, mission type) follows the district-area
+  mission counts, rolled up to the twelve Bezirke
+* the EMS / fire / technical-rescue / other mix follows
+  ``mission_count_ems`` / ``_fire`` / ``_technical_rescue``
+* response times are log-normal with the count-weighted mean and pooled std
+  of ``response_time_ems_critical_*``, ``response_time_fire_time_to_first_pump_*``
+  and ``response_time_technical_rescue_*``
+* ``dispatchcode_criticality`` (the priority column of the open data) marks
+  the EMS critical share; the share of missing response times follows the
+  EMS critical time-goal coverage
+
+Rows are produced in fixed-size chunks, so any row count streams out in
+bounded memory:
+
+    python -m bf_data synth 100M --csv /data/missions_100m.csv
+    python -m bf_data synth 20M --store /data/synth/missions
+"""
+
+import argparse
+import calendar
+import time
+
+import numpy as np
+import pandas as pd
+
+from .paths import REGIONAL_CSV
+from .schema import BEZIRKE
+
+# mission type -> (count column, response time column prefix)
+TYPES = {
+    "Rettungsdienst": ("mission_count_ems", "response_time_ems_critical"),
+    "Brand": ("mission_count_fire", "response_time_fire_time_to_first_pump"),
+    "Technische Hilfeleistung": ("mission_count_technical_rescue", "response_time_technical_rescue"),
+    "Sonstiges": ("mission_count_other", "response_time_ems_critical"),
+}
+
+
+# =========================
+# CALIBRATION
+# =========================
+def _pooled(group, prefix, weight):
+    """Count-weighted mean and pooled std of per-area ``<prefix>_mean/_std``."""
+    n = group[weight].astype(float)
+    if n.sum() == 0:
+        n = n + 1.0
+    mean = group[f"{prefix}_mean"]
+    std = group[f"{prefix}_std"]
+    total = n.sum()
+    mu = (n * mean).sum() / total
+    var = (n * (std ** 2 + mean ** 2)).sum() / total - mu ** 2
+    return mu, np.sqrt(max(var, 0.0))
+
+
+def calibrate(regional_csv=REGIONAL_CSV):
+    """One row per (year, district, mission_type) with weight and rt stats."""
+    regional = pd.read_csv(regional_csv, low_memory=False)
+    areas = regional[regional["district_area_id"].notna()].copy()
+    areas["district"] = (areas["district_area_id"] // 10000).astype(int).map(BEZIRKE)
+    areas["mission_count_other"] = (
+        areas["mission_count_all"]
+        - areas["mission_count_ems"]
+        - areas["mission_count_fire"]
+        - areas["mission_count_technical_rescue"]
+    ).clip(lower=0)
+
+    cells = []
+    for (year, district), group in areas.groupby(["source_year", "district"]):
+        critical_share = group["mission_count_ems_critical"].sum() / max(group["mission_count_ems"].sum(), 1)
+        for mission_type, (count_col, rt_prefix) in TYPES.items():
+            mean, std = _pooled(group, rt_prefix, count_col)
+            cells.append({
+                "year": int(year),
+                "district": district,
+                "mission_type": mission_type,
+                "weight": float(group[count_col].sum()),
+                "rt_mean": mean,
+                "rt_std": std,
+                "critical_share": critical_share if mission_type == "Rettungsdienst" else 0.0,
+            })
+
+    cells = pd.DataFrame(cells)
+    cells["p"] = cells["weight"] / cells["weight"].sum()
+
+    missing_rt = 1 - (
+        areas["mission_count_ems_critical_timegoal_computed"].sum()
+        / areas["mission_count_ems_critical"].sum()
+    )
+    return cells, float(missing_rt)
+
+
+# =========================
+# GENERATION
+# =========================
+def generate(rows, seed=0, chunk_rows=1_000_000, calibration=None):
+    """Yield DataFrames of synthetic missions totalling ``rows`` rows."""
+    cells, missing_rt = calibration or calibrate()
+    rng = np.random.default_rng(seed)
+
+    # Log-normal parameters matching each cell's mean and std.
+    sigma2 = np.log1p((cells["rt_std"] / cells["rt_mean"]) ** 2).to_numpy()
+    mu = np.log(cells["rt_mean"].to_numpy()) - sigma2 / 2
+    sigma = np.sqrt(sigma2)
+
+    year = cells["year"].to_numpy()
+    year_start = pd.to_datetime(pd.Series(year).astype(str) + "-01-01").to_numpy("datetime64[s]")
+    year_seconds = np.array([(366 if calendar.isleap(y) else 365) * 86400 for y in year])
+
+    district = pd.Categorical(cells["district"])
+    mission_type = pd.Categorical(cells["mission_type"])
+    critical_share = cells["critical_share"].to_numpy()
+    p = cells["p"].to_numpy()
+
+    remaining = rows
+    while remaining > 0:
+        n = min(chunk_rows, remaining)
+        remaining -= n
+
+        cell = rng.choice(len(p), size=n, p=p)
+        offset = (rng.random(n) * year_seconds[cell]).astype("int64")
+        created = year_start[cell] + offset.astype("timedelta64[s]")
+
+        rt = np.round(rng.lognormal(mu[cell], sigma[cell]))
+        rt[rng.random(n) < missing_rt] = np.nan
+
+        is_ems = critical_share[cell] > 0
+        critical = rng.random(n) < critical_share[cell]
+        criticality = np.where(is_ems, np.where(critical, "critical", "not_critical"), None)
+
+        yield pd.DataFrame({
+            "mission_created_date": created,
+            "mission_type": pd.Categorical.from_codes(mission_type.codes[cell], mission_type.categories),
+            "dispatchcode_criticality": criticality,
+            "mission_location_district": pd.Categorical.from_codes(district.codes[cell], district.categories),
+            "response_time": rt.astype("float32"),
+        })
+
+
+def write_csv(path, rows, seed=0, chunk_rows=1_000_000):
+    """Write a CSV shaped like ``Berlin_Missions_2020_2025.csv``."""
+    start = 0
+    for chunk in generate(rows, seed, chunk_rows):
+        chunk.index = pd.RangeIndex(start, start + len(chunk))
+        chunk.to_csv(path, mode="w" if start == 0 else "a", header=start == 0,
+                     date_format="%Y-%m-%d %H:%M:%S")
+        start += len(chunk)
+    return start
+
+
+def write_store(missions_dir, rows, seed=0, chunk_rows=1_000_000):
+    """Write synthetic rows straight into a year-partitioned store."""
+    from .store import max_created_date, write_partitions, write_watermark
+
+    written = write_partitions(generate(rows, seed, chunk_rows), missions_dir)
+    write_watermark(missions_dir, max_created_date(missions_dir))
+    return written
+
+
+# =========================
+# CLI
+# =========================
+def parse_count(text):
+    """``"100M"`` -> 100_000_000 (K / M / B suffixes)."""
+    text = str(text).strip().upper().replace("_", "")
+    factor = {"K": 10 ** 3, "M": 10 ** 6, "B": 10 ** 9}.get(text[-1:], 1)
+    return int(float(text[:-1] if factor > 1 else text) * factor)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m bf_data synth",
+        description="Generate calibrated synthetic mission rows."
+    )
+    parser.add_argument("rows", type=parse_count, help="e.g. 2600000, 50M, 1B")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--csv", help="write a mission CSV")
+    target.add_argument("--store", help="write a year-partitioned missions directory")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-rows", type=parse_count, default=1_000_000)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.csv:
+        write_csv(args.csv, args.rows, args.seed, args.chunk_rows)
+    else:
+        write_store(args.store, args.rows, args.seed, args.chunk_rows)
+    elapsed = time.perf_counter() - start
+
+    print(f"Wrote {args.rows:,} synthetic missions to {args.csv or args.store} "
+          f"in {elapsed:.1f}s ({args.rows / elapsed:,.0f} rows/s)")
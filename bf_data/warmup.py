@@ -0,0 +1,97 @@
+"""Background warm-up of the shared datasets.
+
+Nothing is loaded until a page script runs, so without a warm-up the first
+visitor of each page pays for the imports, the snapshot rebuilds and the
+pandas conversions. ``app.py`` calls :func:`start_warmup`, which runs
+:data:`STEPS` once per process on a daemon thread; the loaders share their
+results process-wide (see :mod:`bf_data.shared`), so a session arriving
+later finds them ready. Every loader checks and rebuilds its artifact under
+:func:`~bf_data.shared.build_lock`, so a session arriving during the warm-up
+waits for the artifact the warm-up is building instead of building it again.
+
+:func:`status` reports per-step timings; ``python -m bf_data profile``
+measures what the warm-up buys per page (see :mod:`bf_data.profile`).
+"""
+
+import threading
+import time
+from importlib import import_module
+
+from .compliance import load_compliance
+from .cube import cube_index, load_cube
+from .forecast import load_forecast
+from .geometry import map_geometry, map_levels
+from .pyramid import load_pyramid
+from .rollup import load_rollup
+from .sketch import load_sketches
+from .streaming import load_overview
+
+
+def _import_charts():
+    # plotly.express is the slowest import of the page scripts.
+    import_module("bf_data.charts")
+
+
+def _load_maps():
+    # The outlines of every level with a geometry file; none is not an error.
+    if map_levels():
+        map_geometry()
+
+
+# name -> callable, run in this order.
+STEPS = {
+    "imports": _import_charts,
+    "overview": load_overview,
+    "cube": lambda: cube_index(load_cube()),
+    "sketches": load_sketches,
+    "pyramid": load_pyramid,
+    "forecast": load_forecast,
+    "rollup": load_rollup,
+    "compliance": load_compliance,
+    "geometry": _load_maps,
+}
+
+_lock = threading.Lock()
+_thread = None
+_status = {}
+
+
+def warm_up(steps=STEPS):
+    """Run every warm-up step in this thread and return :func:`status`.
+
+    A failing step (e.g. a missing dataset) is recorded and skipped; the page
+    that needs it reports the error when it runs.
+    """
+    for name, step in steps.items():
+        start = time.perf_counter()
+        try:
+            step()
+            _status[name] = {"seconds": time.perf_counter() - start}
+        except Exception as exc:
+            _status[name] = {"seconds": time.perf_counter() - start, "error": f"{type(exc).__name__}: {exc}"}
+    return status()
+
+
+def start_warmup():
+    """Start the warm-up thread unless this process already has one."""
+    global _thread
+
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(target=warm_up, name="bf-data-warmup", daemon=True)
+            _thread.start()
+        return _thread
+
+
+def status():
+    """``{step: {"seconds": ..., ["error": ...]}}`` of the steps finished so far."""
+    return dict(_status)
+
+
+def wait(timeout=None):
+    """Block until the warm-up thread has finished; False on timeout."""
+    thread = _thread
+    if thread is None:
+        return True
+    thread.join(timeout)
+    return not thread.is_alive()
@@ -0,0 +1 @@
+"""Makes ``bf_data`` importable when the tests run as plain ``pytest``."""
@@ -0,0 +1,71 @@
+"""Time-goal compliance: rates, year-over-year deltas and per-year ranks.
+
+    python -m pytest tests/test_compliance.py
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bf_data.compliance import citywide, compute_compliance, ranking
+
+
+def _row(level, area, year, ems, fire=(10, 5)):
+    row = {f"{lvl}_{part}": None for lvl in ("district_area", "planning_room", "prediction_area")
+           for part in ("id", "name")}
+    row.update({
+        f"{level}_id": area, f"{level}_name": f"{level} {area}", "source_year": year,
+        "mission_count_all": 100,
+        "mission_count_ems_critical_timegoal_computed": ems[0],
+        "mission_count_ems_critical_timegoal_reached": ems[1],
+        "mission_count_fire_timegoal_computed": fire[0],
+        "mission_count_fire_timegoal_reached": fire[1],
+    })
+    return row
+
+
+@pytest.fixture
+def compliance():
+    regional = pd.DataFrame([
+        _row("district_area", 1, 2020, (10, 5)),
+        _row("district_area", 1, 2021, (10, 8)),
+        _row("district_area", 1, 2023, (10, 9)),
+        _row("district_area", 2, 2020, (20, 10)),
+        _row("district_area", 2, 2021, (20, 16)),
+        _row("district_area", 3, 2021, (0, 0)),
+        _row("planning_room", 101, 2021, (4, 4)),
+    ])
+    return compute_compliance(regional)
+
+
+def _area(compliance, area_id, year):
+    return compliance[(compliance["area_id"] == area_id) & (compliance["year"] == year)].iloc[0]
+
+
+def test_rates_and_deltas(compliance):
+    assert _area(compliance, 1, 2021)["ems_critical_rate"] == pytest.approx(0.8)
+    assert _area(compliance, 1, 2021)["ems_critical_rate_delta"] == pytest.approx(0.3)
+    assert _area(compliance, 2, 2021)["ems_critical_rate_delta"] == pytest.approx(0.3)
+
+    # No previous year, a gap before 2023, and no computed missions: no delta.
+    assert np.isnan(_area(compliance, 1, 2020)["ems_critical_rate_delta"])
+    assert np.isnan(_area(compliance, 1, 2023)["ems_critical_rate_delta"])
+    assert np.isnan(_area(compliance, 3, 2021)["ems_critical_rate"])
+
+
+def test_ranks_are_per_level_and_year(compliance):
+    ranks = ranking(compliance, 2021)
+    assert ranks["area_id"].tolist() == [1, 2, 3]
+    # Ties share the best rank; areas without a rate have none.
+    assert ranks["ems_critical_rank"].tolist() == [1, 1, pd.NA]
+    assert ranks["fire_rank"].tolist() == [1, 1, 1]
+
+    room = ranking(compliance, 2021, level="planning_room")
+    assert room[["area_id", "ems_critical_rank"]].values.tolist() == [[101, 1]]
+
+
+def test_citywide_pools_counts(compliance):
+    city = citywide(compliance).set_index("year")
+    assert city.loc[2021, "ems_critical_rate"] == pytest.approx(24 / 30)
+    assert city.loc[2021, "ems_critical_rate_delta"] == pytest.approx(24 / 30 - 15 / 30)
+    assert np.isnan(city.loc[2023, "ems_critical_rate_delta"])
@@ -0,0 +1,245 @@
+"""Consistency checks of the derived tables against their reference results.
+
+Each test recomputes something two ways: the batched Holt-Winters fit
+against a scalar recursion, its prediction intervals against simulated
+paths of the same recursion, an incremental ingest against a full rebuild,
+the sketch quantiles against exact percentiles, the pyramid against the
+cube, and the regional roll-up against the rows published in the file.
+Mission data is synthetic (see :mod:`bf_data.synth`); the roll-up uses the
+regional file that ships with the repo.
+
+    python -m pytest tests
+"""
+
+from itertools import product
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bf_data import cube as cube_mod
+from bf_data import forecast, pyramid, quality, sketch, synth
+from bf_data import ingest as ingest_mod
+from bf_data.ingest import ingest
+from bf_data.paths import REGIONAL_CSV
+from bf_data.rollup import STAT_WEIGHTS, compute_rollup
+from bf_data.store import build_store, load_missions
+
+ROWS = 30_000
+
+
+# =========================
+# FIXTURES
+# =========================
+@pytest.fixture(scope="module")
+def missions():
+    return pd.concat(synth.generate(ROWS, seed=7), ignore_index=True)
+
+
+@pytest.fixture(scope="module")
+def store(tmp_path_factory, missions):
+    """A store built from the older 80 % of the rows, then the rest ingested.
+
+    Returns the store directory, with the cube, sketches, pyramid base and
+    quality counts that the ingest added into.
+    """
+    root = tmp_path_factory.mktemp("store")
+    missions_dir = root / "missions"
+    dates = missions["mission_created_date"]
+    cutoff = dates.quantile(0.8)
+    missions[dates < cutoff].to_csv(root / "old.csv", index=False)
+    missions[dates >= cutoff].to_csv(root / "new.csv", index=False)
+
+    build_store(root / "old.csv", missions_dir, quality_path=root / "quality.json")
+    cube_mod.build_cube(missions_dir, root / "cube.parquet")
+    sketch.build_sketches(missions_dir, root / "sketches.parquet")
+    pyramid.build_pyramid(missions_dir, root / "pyramid.parquet")
+
+    summary = ingest(
+        root / "new.csv", missions_dir,
+        cube_path=root / "cube.parquet",
+        sketch_path=root / "sketches.parquet",
+        pyramid_path=root / "pyramid.parquet",
+        quality_path=root / "quality.json",
+    )
+    assert summary["rows_added"] == (dates >= cutoff).sum()
+    return root
+
+
+def _sorted(df, keys):
+    df = df.astype({k: str for k in keys if not pd.api.types.is_numeric_dtype(df[k])})
+    return df.sort_values(keys, ignore_index=True)
+
+
+# =========================
+# FORECAST
+# =========================
+def _scalar_fit(y, season=forecast.SEASON):
+    """Holt-Winters for one series, one parameter set at a time."""
+    best = None
+    for alpha, beta, gamma in product(forecast.ALPHAS, forecast.BETAS, forecast.GAMMAS):
+        first, second = y[:season], y[season:2 * season]
+        level = first.mean()
+        trend = (second.mean() - first.mean()) / season
+        seasonal = list(first - first.mean())
+        sse = 0.0
+        for t, value in enumerate(y):
+            s = seasonal[t % season]
+            if t >= season:
+                sse += (value - (level + trend + s)) ** 2
+            new_level = alpha * (value - s) + (1 - alpha) * (level + trend)
+            trend = beta * (new_level - level) + (1 - beta) * trend
+            seasonal[t % season] = gamma * (value - new_level) + (1 - gamma) * s
+            level = new_level
+        if best is None or sse < best[0]:
+            best = (sse, alpha, beta, gamma, level, trend, np.roll(seasonal, -(len(y) % season)))
+    return best
+
+
+def test_batched_fit_matches_scalar_recursion():
+    rng = np.random.default_rng(0)
+    t = np.arange(50)
+    y = np.stack([
+        1000 + k * 3 * t + 150 * np.sin(2 * np.pi * t / 12 + k) + rng.normal(0, 40, len(t))
+        for k in range(4)
+    ])
+
+    model = forecast.fit(y)
+    for i, row in enumerate(y):
+        sse, alpha, beta, gamma, level, trend, seasonal = _scalar_fit(row)
+        assert (model["alpha"][i], model["beta"][i], model["gamma"][i]) == (alpha, beta, gamma)
+        assert model["level"][i] == pytest.approx(level)
+        assert model["trend"][i] == pytest.approx(trend)
+        np.testing.assert_allclose(model["seasonal"][i], seasonal)
+        assert model["sigma"][i] == pytest.approx(np.sqrt(sse / (len(row) - forecast.SEASON - 3)))
+
+
+def test_interval_matches_simulated_recursion():
+    model = {
+        "level": np.array([100.0]), "trend": np.array([1.0]), "seasonal": np.zeros((1, forecast.SEASON)),
+        "alpha": np.array([0.5]), "beta": np.array([0.1]), "gamma": np.array([0.5]), "sigma": np.array([1.0]),
+    }
+    horizon = 2 * forecast.SEASON + 1
+    _, stderr = forecast.predict(model, horizon)
+
+    # Run the fit's recursion forward on Gaussian one-step errors.
+    rng = np.random.default_rng(0)
+    paths = 200_000
+    level, trend = np.full(paths, 100.0), np.full(paths, 1.0)
+    seasonal = np.zeros((paths, forecast.SEASON))
+    values = np.empty((paths, horizon))
+    for t in range(horizon):
+        s = seasonal[:, t % forecast.SEASON]
+        values[:, t] = level + trend + s + rng.normal(size=paths)
+        new_level = 0.5 * (values[:, t] - s) + 0.5 * (level + trend)
+        trend = 0.1 * (new_level - level) + 0.9 * trend
+        seasonal[:, t % forecast.SEASON] = 0.5 * (values[:, t] - new_level) + 0.5 * s
+        level = new_level
+
+    np.testing.assert_allclose(stderr[0], values.std(axis=0), rtol=0.01)
+
+
+# =========================
+# INGEST
+# =========================
+def test_ingest_matches_full_rebuild(store, tmp_path):
+    missions_dir = store / "missions"
+
+    merged = pd.read_parquet(store / "cube.parquet")
+    rebuilt = cube_mod.build_cube(missions_dir, tmp_path / "cube.parquet")
+    keys = cube_mod.DIMENSIONS
+    merged, rebuilt = _sorted(merged, keys), _sorted(rebuilt, keys)
+    pd.testing.assert_frame_equal(merged[keys], rebuilt[keys], check_dtype=False)
+    np.testing.assert_allclose(merged[cube_mod.MEASURES], rebuilt[cube_mod.MEASURES])
+
+    keys = sketch.KEYS + ["bucket"]
+    merged = _sorted(pd.read_parquet(store / "sketches.parquet"), keys)
+    rebuilt = _sorted(sketch.build_sketches(missions_dir, tmp_path / "sketches.parquet"), keys)
+    pd.testing.assert_frame_equal(merged, rebuilt, check_dtype=False)
+
+    keys = ["district", "bin"]
+    merged = _sorted(pd.read_parquet(store / "pyramid.parquet"), keys)
+    rebuilt = _sorted(pyramid.build_pyramid(missions_dir, tmp_path / "pyramid.parquet"), keys)
+    pd.testing.assert_frame_equal(merged[keys], rebuilt[keys], check_dtype=False)
+    np.testing.assert_allclose(merged[cube_mod.MEASURES], rebuilt[cube_mod.MEASURES])
+
+    merged = quality.load_quality(store / "quality.json", missions_dir)
+    rebuilt = quality.build_quality(missions_dir, tmp_path / "quality.json")
+    assert (merged["rows"], merged["flags"]) == (rebuilt["rows"], rebuilt["flags"])
+
+
+def test_ingest_without_watermark_file_counts_new_year_once(missions, tmp_path):
+    missions_dir = tmp_path / "missions"
+    last_year = missions["mission_created_date"].dt.year.max()
+    old = missions["mission_created_date"].dt.year < last_year
+    missions[old].to_csv(tmp_path / "old.csv", index=False)
+    missions[~old].to_csv(tmp_path / "new.csv", index=False)
+
+    build_store(tmp_path / "old.csv", missions_dir, quality_path=tmp_path / "quality.json")
+    cube_mod.build_cube(missions_dir, tmp_path / "cube.parquet")
+    (tmp_path / "watermark.json").unlink()
+
+    ingest_mod.main([
+        str(tmp_path / "new.csv"), "--missions", str(missions_dir), "--cube", str(tmp_path / "cube.parquet"),
+        "--sketches", str(tmp_path / "sketches.parquet"), "--pyramid", str(tmp_path / "pyramid.parquet"),
+        "--quality", str(tmp_path / "quality.json"),
+    ])
+
+    cube = pd.read_parquet(tmp_path / "cube.parquet")
+    assert cube["count"].sum() == len(missions)
+    assert cube.loc[cube["year"] == last_year, "count"].sum() == (~old).sum()
+
+
+# =========================
+# SKETCHES / PYRAMID
+# =========================
+def test_sketch_quantiles_within_accuracy(missions):
+    sketches = sketch.fold([sketch.sketch_cells(missions)])
+    estimated = sketch.quantiles(sketches, ["district"]).set_index("district")
+    assert sketch.quantiles(sketches, district="NOWHERE").empty
+
+    rt = quality.response_times(missions)
+    valid = ~np.isnan(rt)
+    exact = pd.DataFrame({"district": missions["mission_location_district"][valid], "rt": rt[valid]})
+    for district, group in exact.groupby("district", observed=True):
+        assert estimated.loc[district, "n"] == len(group)
+        for q in sketch.QUANTILES:
+            value = np.percentile(group["rt"], 100 * q, method="lower")
+            assert estimated.loc[district, f"p{round(q * 100):g}"] == pytest.approx(value, rel=sketch.RELATIVE_ACCURACY)
+
+
+def test_pyramid_years_match_cube(store):
+    cube = pd.read_parquet(store / "cube.parquet")
+    levels = pyramid.roll_up(pd.read_parquet(store / "pyramid.parquet"))
+
+    years = levels[(levels["level"] == "year") & (levels["district"] != pyramid.BERLIN)]
+    years = years.assign(year=years["bin"].dt.year).groupby(["district", "year"], observed=True)[cube_mod.MEASURES].sum()
+    totals = cube.groupby(["district", "year"], observed=True)[cube_mod.MEASURES].sum()
+    np.testing.assert_allclose(years.sort_index().to_numpy(), totals.reindex(years.sort_index().index).to_numpy())
+
+    berlin = levels[(levels["level"] == "year") & (levels["district"] == pyramid.BERLIN)]
+    np.testing.assert_array_equal(berlin["count"].to_numpy(), cube.groupby("year")["count"].sum().to_numpy())
+    assert berlin["count"].sum() == len(load_missions(["year"], missions_dir=store / "missions"))
+
+
+# =========================
+# ROLL-UP
+# =========================
+@pytest.mark.parametrize("level", ["district_area", "prediction_area"])
+def test_rollup_reproduces_published_rows(level):
+    regional = pd.read_csv(REGIONAL_CSV, low_memory=False)
+    rollup = compute_rollup(regional)
+
+    others = [c for c in regional.columns if c.endswith("_id") and c != f"{level}_id"]
+    published = regional[regional[f"{level}_id"].notna() & regional[others].isna().all(axis=1)]
+    rolled = rollup[rollup["level"] == level]
+    joined = published.merge(
+        rolled, left_on=[f"{level}_id", "source_year"], right_on=["area_id", "year"], suffixes=("", "_rolled")
+    )
+    assert len(joined) == len(published)
+
+    counts = [c for c in regional.columns if c.startswith("mission_count_")]
+    np.testing.assert_array_equal(joined[counts].to_numpy(), joined[[f"{c}_rolled" for c in counts]].to_numpy())
+    for stat in STAT_WEIGHTS:
+        column = f"response_time_{stat}_mean"
+        np.testing.assert_allclose(joined[f"{column}_rolled"], joined[column], atol=0.01)
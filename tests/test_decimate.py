@@ -0,0 +1,62 @@
+"""Scatter decimation: the point budget and what the points still carry.
+
+    python -m pytest tests/test_decimate.py
+"""
+
+import numpy as np
+import pytest
+
+from bf_data.decimate import GRID, rasterize
+
+ROWS = 200_000
+
+
+@pytest.fixture(scope="module")
+def points():
+    rng = np.random.default_rng(3)
+    x = rng.uniform(0, 1000, ROWS)
+    y = rng.gamma(4, 100, ROWS)
+    codes = rng.integers(-1, 5, ROWS)
+    return x, y, codes
+
+
+@pytest.mark.parametrize("budget", [50, 2_000, 20_000])
+def test_points_stay_within_budget(points, budget):
+    x, y, codes = points
+    raster = rasterize(x, y, codes, (0, 1000), (0, 2000), budget=budget)
+
+    inside = (codes >= 0) & (y <= 2000)
+    assert raster.in_view == inside.sum()
+    assert len(raster.points) <= budget
+    assert raster.points["count"].sum() == raster.in_view
+    for code, group in raster.points.groupby("code"):
+        assert group["count"].sum() == (inside & (codes == code)).sum()
+
+
+def test_points_are_centroids_inside_the_view(points):
+    x, y, codes = points
+    raster = rasterize(x, y, codes, (250, 500), (100, 600), budget=1_000)
+    assert raster.points["x"].between(250, 500).all()
+    assert raster.points["y"].between(100, 600).all()
+
+    weights = raster.points["count"]
+    inside = (codes >= 0) & (x >= 250) & (x <= 500) & (y >= 100) & (y <= 600)
+    assert np.average(raster.points["x"], weights=weights) == pytest.approx(x[inside].mean())
+
+
+def test_zooming_in_bins_finer(points):
+    x, y, codes = points
+    wide = rasterize(x, y, codes, (0, 1000), (0, 2000), budget=5_000)
+    narrow = rasterize(x, y, codes, (0, 250), (0, 2000), budget=5_000)
+    assert wide.grid is not None and narrow.grid is not None
+    # The same budget spread over a quarter of the rows keeps more cells per unit of x.
+    assert narrow.grid[0] / 250 > wide.grid[0] / 1000
+    assert narrow.grid[0] <= GRID[0]
+
+
+def test_small_views_are_sent_raw(points):
+    x, y, codes = points
+    raster = rasterize(x, y, codes, (0, 10), (0, 2000), budget=20_000)
+    assert raster.grid is None
+    assert (raster.points["count"] == 1).all()
+    assert len(raster.points) == raster.in_view
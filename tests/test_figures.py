@@ -0,0 +1,104 @@
+"""Figure cache: byte-bounded LRU eviction, version keys and the prerendered store.
+
+    python -m pytest tests/test_figures.py
+"""
+
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+import pyarrow as pa
+import pytest
+
+from bf_data.figures import (
+    FigureCache,
+    cached_figure,
+    data_version,
+    figure_key,
+    prerendered,
+    selection_id,
+    store_path,
+)
+from bf_data.shared import write_snapshot
+
+
+def test_least_recently_used_figures_are_evicted_first():
+    cache = FigureCache(max_bytes=10)
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    assert cache.get("a") == b"aaaa"
+
+    cache.put("c", b"cccc")
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (b"aaaa", b"cccc")
+    assert cache.stats() == {"figures": 2, "nbytes": 8, "max_bytes": 10, "hits": 3, "misses": 1}
+
+
+def test_replacing_and_oversized_figures_keep_the_byte_count():
+    cache = FigureCache(max_bytes=10)
+    cache.put("a", b"aaaa")
+    cache.put("a", b"aaaaaa")
+    assert cache.nbytes == 6
+
+    cache.put("a", b"x" * 11)
+    assert len(cache) == 0 and cache.nbytes == 0
+
+
+def test_figures_are_built_once_per_selection_and_version():
+    cache = FigureCache()
+    builds = []
+
+    def build():
+        builds.append(1)
+        return go.Figure(go.Bar(x=[1, 2], y=[3, 4]))
+
+    first = cached_figure("page", {"year": 2024}, ("v1",), build, cache)
+    again = cached_figure("page", {"year": 2024}, ("v1",), build, cache)
+    cached_figure("page", {"year": 2024}, ("v2",), build, cache)
+    assert len(builds) == 2
+    assert again.to_dict() == first.to_dict()
+
+
+def test_selection_keys_ignore_order_and_numpy_scalars():
+    assert figure_key("p", {"a": 1, "b": [2]}, ()) == figure_key("p", {"b": (2,), "a": np.int64(1)}, ())
+    assert data_version({"version": 3}) == (3,)
+    with pytest.raises(TypeError):
+        data_version([1, 2])
+
+
+# =========================
+# PRERENDERED STORE
+# =========================
+def _write_store(figure_dir, page, version, figures):
+    """A figure store of ``(selection, figure)`` pairs, as ``prerender`` writes it."""
+    write_snapshot(pa.table({
+        "selection": pa.array([selection_id(sel) for sel, _ in figures], pa.string()),
+        "spec": pa.array([pio.to_json(fig, validate=False).encode() for _, fig in figures], pa.binary()),
+    }), store_path(page, version, figure_dir))
+
+
+def test_prerendered_figures_are_served_without_building(tmp_path):
+    stored = go.Figure(go.Bar(x=["MITTE"], y=[1]))
+    _write_store(tmp_path, "chart", ("v1",), [({"district": "MITTE"}, stored)])
+
+    def build():
+        raise AssertionError("prerendered figure was rebuilt")
+
+    cache = FigureCache()
+    fig = cached_figure("chart", {"district": "MITTE"}, ("v1",), build, cache, tmp_path)
+    assert fig.to_dict() == stored.to_dict()
+    assert len(cache) == 1
+
+
+def test_other_selections_and_versions_miss_the_store(tmp_path):
+    _write_store(tmp_path, "chart", ("v1",), [({"district": "MITTE"}, go.Figure())])
+    assert prerendered("chart", {"district": "PANKOW"}, ("v1",), tmp_path) is None
+    assert prerendered("chart", {"district": "MITTE"}, ("v2",), tmp_path) is None
+
+    builds = []
+
+    def build():
+        builds.append(1)
+        return go.Figure()
+
+    cached_figure("chart", {"district": "PANKOW"}, ("v1",), build, FigureCache(), tmp_path)
+    assert builds == [1]
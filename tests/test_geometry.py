@@ -0,0 +1,120 @@
+"""Topology-preserving simplification of the LOR outlines.
+
+The fixture is a synthetic grid of areas whose shared borders wander like
+real ones; the outer boundary is straight.
+
+    python -m pytest tests/test_geometry.py
+"""
+
+import json
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from bf_data.geometry import PRECISION, ZOOMS, build_topology, read_areas, simplify, to_geojson
+
+NX, NY = 4, 3
+X0, X1, Y0, Y1 = 13.1, 13.7, 52.35, 52.65
+STEPS = 80
+
+
+@pytest.fixture(scope="module")
+def areas(tmp_path_factory):
+    rng = np.random.default_rng(5)
+    xs, ys = np.linspace(X0, X1, NX + 1), np.linspace(Y0, Y1, NY + 1)
+    borders = {}
+
+    def border(a, b):
+        """Points strictly between grid corners ``a`` and ``b``, drawn once per border."""
+        key = min(a, b), max(a, b)
+        if key not in borders:
+            (i0, j0), (i1, j1) = key
+            t = np.linspace(0, 1, STEPS + 1)[1:-1]
+            x = xs[i0] + (xs[i1] - xs[i0]) * t
+            y = ys[j0] + (ys[j1] - ys[j0]) * t
+            wander = np.sin(np.pi * t) * rng.normal(0, 4e-4, len(t)).cumsum()
+            if i0 == i1 and 0 < i0 < NX:
+                x = x + wander
+            if j0 == j1 and 0 < j0 < NY:
+                y = y + wander
+            borders[key] = np.c_[x, y]
+        return borders[key] if key == (a, b) else borders[key][::-1]
+
+    features = []
+    for j in range(NY):
+        for i in range(NX):
+            corners = [(i, j), (i + 1, j), (i + 1, j + 1), (i, j + 1)]
+            ring = []
+            for a, b in zip(corners, corners[1:] + corners[:1]):
+                ring += [[xs[a[0]], ys[a[1]]]] + border(a, b).tolist()
+            features.append({
+                "type": "Feature",
+                "properties": {"BZR_ID": f"{(j + 1) * 100 + i + 1:06d}"},
+                "geometry": {"type": "Polygon", "coordinates": [ring + ring[:1]]},
+            })
+
+    path = tmp_path_factory.mktemp("geo") / "grid.geojson"
+    path.write_text(json.dumps({"type": "FeatureCollection", "features": features}))
+    return read_areas(path, "district_area")
+
+
+def _edges(collection):
+    """Undirected edges of every ring, on the serialized coordinate grid."""
+    edges = Counter()
+    for feature in collection["features"]:
+        for ring in feature["geometry"]["coordinates"]:
+            points = [tuple(p) for p in ring]
+            edges.update(tuple(sorted(pair)) for pair in zip(points, points[1:]))
+    return edges
+
+
+def _on_outline(point):
+    x, y = point
+    return np.isclose(x, [X0, X1]).any() or np.isclose(y, [Y0, Y1]).any()
+
+
+def test_every_border_is_one_shared_arc(areas):
+    arcs, shapes = build_topology(areas)
+
+    # One arc per cell side, the shared ones once rather than once per
+    # neighbour; the two outer sides of each corner cell make a single arc.
+    assert len(arcs) == NX * (NY + 1) + (NX + 1) * NY - 4
+    uses = Counter((arc, backward) for shape in shapes for polygon in shape for ring in polygon
+                   for arc, backward in ring)
+    per_arc = Counter(arc for arc, _ in uses)
+    shared = [arc for arc, n in per_arc.items() if n == 2]
+    assert len(shared) == (NX - 1) * NY + NX * (NY - 1)
+    # Neighbours run along a shared arc in opposite directions.
+    assert all(uses[arc, False] == uses[arc, True] == 1 for arc in shared)
+
+
+@pytest.mark.parametrize("zoom", list(ZOOMS))
+def test_simplified_neighbours_stay_gap_free(areas, zoom):
+    arcs, shapes = build_topology(areas)
+    collection = to_geojson([area_id for area_id, _ in areas], simplify(arcs, shapes, ZOOMS[zoom]))
+
+    assert [f["id"] for f in collection["features"]] == [area_id for area_id, _ in areas]
+    edges = _edges(collection)
+    assert max(edges.values()) == 2
+    # An edge only one area uses lies on the outline of the whole grid.
+    assert all(_on_outline(a) and _on_outline(b) for (a, b), n in edges.items() if n == 1)
+
+
+def test_vertices_drop_at_each_zoom(areas):
+    arcs, shapes = build_topology(areas)
+    counts = [sum(len(ring) + 1 for _, polygons in areas for polygon in polygons for ring in polygon)]
+    for zoom in sorted(ZOOMS, key=ZOOMS.get):
+        collection = to_geojson([area_id for area_id, _ in areas], simplify(arcs, shapes, ZOOMS[zoom]))
+        counts.append(sum(len(ring) for f in collection["features"] for ring in f["geometry"]["coordinates"]))
+
+    # The input, then the finest to the coarsest zoom: each keeps fewer vertices.
+    assert all(finer > coarser for finer, coarser in zip(counts, counts[1:]))
+
+
+def test_serialized_coordinates_are_rounded(areas):
+    arcs, shapes = build_topology(areas)
+    collection = to_geojson([area_id for area_id, _ in areas], simplify(arcs, shapes, ZOOMS["city"]))
+    ring = np.array(collection["features"][0]["geometry"]["coordinates"][0])
+    np.testing.assert_array_equal(ring, np.round(ring, PRECISION))
+    assert (ring[0] == ring[-1]).all()
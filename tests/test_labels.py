@@ -0,0 +1,52 @@
+"""Label translation on the dictionary of categorical columns.
+
+    python -m pytest tests/test_labels.py
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bf_data.labels import label_table, translate
+
+
+@pytest.fixture
+def types():
+    values = ["Brand", None, "Rettungsdienst", "Drohne", "Brand", "Ballon"]
+    return pd.Series(values, index=[10, 11, 12, 13, 14, 15], name="mission_type", dtype="category")
+
+
+def test_translate_matches_per_row_lookup(types):
+    labels = translate(types, "mission_type", "en")
+
+    assert labels.index.equals(types.index)
+    assert labels.name == "mission_type"
+    assert labels.tolist() == ["Fire Incident", np.nan, "Emergency Medical Service", "Other", "Fire Incident", "Other"]
+
+
+def test_unknown_entries_share_one_category(types):
+    labels = translate(types, "mission_type", "de")
+    assert list(labels.cat.categories) == ["Brand", "Rettungsdienst", "Sonstige"]
+    assert labels.value_counts()["Sonstige"] == 2
+
+
+def test_plain_text_and_unlabelled_columns(types):
+    assert translate(types.astype(object), "mission_type").equals(translate(types, "mission_type"))
+
+    districts = pd.Series(["MITTE", "PANKOW"], dtype="category")
+    # No table for districts: the value is its own label.
+    assert translate(districts, "district").tolist() == ["MITTE", "PANKOW"]
+
+
+def test_label_table_lists_observed_entries(types):
+    unused = types.cat.add_categories(["Krankentransport"])
+    table = label_table(unused, "mission_type", "en")
+    assert table.to_dict("list") == {
+        "mission_type": ["Ballon", "Brand", "Drohne", "Rettungsdienst"],
+        "mission_type_en": ["Other", "Fire Incident", "Other", "Emergency Medical Service"],
+    }
+
+
+def test_unknown_language_is_rejected(types):
+    with pytest.raises(ValueError, match="unknown language"):
+        translate(types, "mission_type", "fr")
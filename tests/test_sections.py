@@ -0,0 +1,74 @@
+"""Page sections: concurrency, completion order and cancellation.
+
+    python -m pytest tests/test_sections.py
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from bf_data.sections import render_sections, run_sections, timings
+
+
+@pytest.fixture
+def pool():
+    pool = ThreadPoolExecutor(max_workers=4)
+    yield pool
+    pool.shutdown(wait=True, cancel_futures=True)
+
+
+def test_sections_run_side_by_side(pool):
+    # Each section waits for the other: run one after the other, both time out.
+    barrier = threading.Barrier(2, timeout=10)
+
+    def meet():
+        barrier.wait()
+        return True
+
+    assert dict(run_sections({"a": meet, "b": meet}, pool)) == {"a": True, "b": True}
+    assert set(timings()) >= {"a", "b"}
+
+
+def test_rendered_in_completion_order_on_the_calling_thread(pool):
+    slow_may_finish = threading.Event()
+    rendered = []
+
+    def slow():
+        slow_may_finish.wait(10)
+        return "slow"
+
+    def render(result):
+        rendered.append((result, threading.get_ident()))
+        slow_may_finish.set()
+
+    order = render_sections({"slow": (slow, render), "fast": (lambda: "fast", render)}, pool)
+
+    assert order == ["fast", "slow"]
+    assert rendered == [("fast", threading.get_ident()), ("slow", threading.get_ident())]
+
+
+def test_failing_section_raises_to_the_caller(pool):
+    def boom():
+        raise RuntimeError("section failed")
+
+    with pytest.raises(RuntimeError, match="section failed"):
+        dict(run_sections({"ok": lambda: 1, "boom": boom}, pool))
+
+
+def test_stopping_early_cancels_sections_not_started():
+    pool = ThreadPoolExecutor(max_workers=1)
+    hold = threading.Event()
+    calls = []
+
+    def blocking():
+        calls.append("b")
+        hold.wait(10)
+
+    sections = run_sections({"a": lambda: calls.append("a"), "b": blocking, "c": lambda: calls.append("c")}, pool)
+    assert next(sections)[0] == "a"
+    sections.close()
+    hold.set()
+    pool.shutdown(wait=True)
+
+    assert "c" not in calls
@@ -0,0 +1,130 @@
+"""Query service: coalescing, the result cache and HTTP error mapping.
+
+The engine runs over small in-memory sources, so these tests need no store.
+
+    python -m pytest tests/test_service.py
+"""
+
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bf_data.service import QueryEngine, QueryError, Source, _where, ask, make_server
+
+FRAME = pd.DataFrame({
+    "district": ["MITTE", "PANKOW", "MITTE"],
+    "day": pd.to_datetime(["2024-01-01", "2024-01-02", None]),
+    "rt": [300.0, np.nan, 420.0],
+})
+
+
+def _boom(data):
+    raise KeyError("not a parameter problem")
+
+
+SOURCES = {
+    "frame": Source(lambda data, filters=None: _where(data["frame"], filters), {"frame": lambda: FRAME}, ["filters"]),
+    "value": Source(lambda data: {"rt_mean": None}, {}, []),
+    "boom": Source(_boom, {}, []),
+}
+
+
+@pytest.fixture
+def url():
+    server = make_server(port=0, engine=QueryEngine(SOURCES))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def _post(url, body):
+    request = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status
+    except urllib.error.HTTPError as exc:
+        return exc.code
+
+
+# =========================
+# ENGINE
+# =========================
+def test_identical_queries_are_computed_once():
+    calls = []
+    release = threading.Event()
+
+    def slow(data, filters=None):
+        calls.append(filters)
+        release.wait(10)
+        return FRAME
+
+    engine = QueryEngine({"slow": Source(slow, {}, ["filters"])})
+    bodies = []
+    threads = [
+        threading.Thread(target=lambda: bodies.append(engine.run("slow", {"filters": {"district": "MITTE"}})))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    while engine.stats()["coalesced"] < len(threads) - 1:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len(set(bodies)) == 1
+    engine.run("slow", {"filters": {"district": "MITTE"}})
+    assert engine.stats() == {
+        "results": 1, "max_entries": engine.max_entries, "inflight": 0,
+        "hits": 1, "misses": 1, "coalesced": 7, "errors": 0,
+    }
+
+
+def test_results_are_evicted_least_recently_used_first():
+    engine = QueryEngine(SOURCES, max_entries=2)
+    for district in ("MITTE", "PANKOW", "MITTE", "SPANDAU", "MITTE"):
+        engine.run("frame", {"filters": {"district": district}})
+    # PANKOW was dropped for SPANDAU; MITTE stayed because it was used last.
+    assert engine.stats()["hits"] == 2
+    engine.run("frame", {"filters": {"district": "PANKOW"}})
+    assert engine.stats()["misses"] == 4
+
+
+def test_bad_parameters_raise_query_error():
+    engine = QueryEngine(SOURCES)
+    with pytest.raises(QueryError):
+        engine.run("frame", {"by": ["district"]})
+    with pytest.raises(QueryError):
+        engine.run("frame", {"filters": {"nope": 1}})
+    with pytest.raises(QueryError):
+        engine.run("nope")
+
+
+# =========================
+# HTTP
+# =========================
+def test_frames_round_trip(url):
+    frame = ask("frame", url=url, filters={"district": "MITTE"})
+    expected = FRAME[FRAME["district"] == "MITTE"].reset_index(drop=True)
+    pd.testing.assert_frame_equal(frame, expected, check_dtype=False)
+    assert ask("value", url=url) == {"rt_mean": None}
+
+
+@pytest.mark.parametrize("path, body, status", [
+    ("/query/frame", b'{"filters": {"nope": 1}}', 400),
+    ("/query/frame", b'{"by": ["district"]}', 400),
+    ("/query/frame", b"{not json", 400),
+    ("/query/frame", b"[1, 2]", 400),
+    ("/query/nope", b"{}", 404),
+    ("/query/boom", b"{}", 500),
+])
+def test_errors_map_to_status(url, path, body, status):
+    assert _post(url + path, body) == status
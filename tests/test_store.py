@@ -0,0 +1,25 @@
+"""Store CLI and loader paths.
+
+    python -m pytest tests/test_store.py
+"""
+
+import pytest
+
+from bf_data import store, synth
+from bf_data.paths import QUALITY_PATH
+
+
+def test_cli_writes_quality_next_to_out(tmp_path):
+    synth.write_csv(tmp_path / "missions.csv", 2_000, seed=1)
+    before = QUALITY_PATH.stat().st_mtime_ns if QUALITY_PATH.exists() else None
+
+    store.main([str(tmp_path / "missions.csv"), "--out", str(tmp_path / "store" / "missions")])
+
+    assert (tmp_path / "store" / "quality.json").exists()
+    assert (QUALITY_PATH.stat().st_mtime_ns if QUALITY_PATH.exists() else None) == before
+
+
+def test_only_default_store_is_built_on_demand(tmp_path):
+    with pytest.raises(FileNotFoundError, match="No mission store"):
+        store.missions_dataset(tmp_path / "missions")
+    assert not (tmp_path / "missions").exists()